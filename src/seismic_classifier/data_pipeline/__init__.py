@@ -6,6 +6,7 @@ capabilities for seismic data from USGS and IRIS sources.
 
 from .database import DatabaseError, SeismicDatabase
 from .error_handling import (
+    Bulkhead,
     CircuitBreaker,
     CircuitBreakerOpenError,
     ErrorSeverity,
@@ -26,9 +27,12 @@ from .validators import (
     DataFormatError,
     DataQualityError,
     DataValidator,
+    QualityThresholds,
     ValidationError,
     sanitize_station_code,
+    sanitize_station_codes,
     validate_earthquake_parameters,
+    validate_earthquake_parameters_batch,
 )
 
 __all__ = [
@@ -42,11 +46,14 @@ __all__ = [
     "preprocess_waveform",
     # Validation
     "DataValidator",
+    "QualityThresholds",
     "ValidationError",
     "DataQualityError",
     "DataFormatError",
     "validate_earthquake_parameters",
+    "validate_earthquake_parameters_batch",
     "sanitize_station_code",
+    "sanitize_station_codes",
     # Database
     "SeismicDatabase",
     "DatabaseError",
@@ -58,6 +65,7 @@ __all__ = [
     "ErrorSeverity",
     "RetryPolicy",
     "CircuitBreaker",
+    "Bulkhead",
     "retry",
     "retry_with_policy",
     "error_handler",
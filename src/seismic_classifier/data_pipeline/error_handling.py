@@ -5,17 +5,29 @@ circuit breakers, and resilience patterns for the seismic classifier system.
 """
 
 import asyncio
+import bisect
 import functools
+import random
+import shutil
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Type
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Type
 
 from ..config.settings import Config
 from ..utils.logger import get_logger
 
+try:
+    import psutil
+except ImportError:  # pragma: no cover
+    psutil = None  # type: ignore
+
 logger = get_logger(__name__)
 
+_rand = random.random
+
 
 class ErrorSeverity(Enum):
     """Error severity levels."""
@@ -70,8 +82,16 @@ class CircuitBreakerOpenError(SeismicError):
     pass
 
 
+_DEFAULT_RETRYABLE = (RetryableError, ConnectionError, TimeoutError)
+
+
 class RetryPolicy:
-    """Configuration for retry behavior."""
+    """Configuration for retry behavior.
+
+    ``retryable_exceptions`` is checked through a cached tuple that is rebuilt
+    when the attribute is assigned; assign a new list rather than editing it in
+    place to change which exceptions are retried.
+    """
 
     def __init__(
         self,
@@ -81,17 +101,34 @@ class RetryPolicy:
         exponential_base: float = 2.0,
         jitter: bool = True,
         retryable_exceptions: Optional[List[Type[Exception]]] = None,
+        jitter_mode: Literal["none", "equal", "full"] = "full",
     ):
+        if jitter_mode not in ("none", "equal", "full"):
+            raise ValueError(f"Unknown jitter mode: {jitter_mode}")
+
         self.max_attempts = max_attempts
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.exponential_base = exponential_base
         self.jitter = jitter
-        self.retryable_exceptions = retryable_exceptions or [
-            RetryableError,
-            ConnectionError,
-            TimeoutError,
-        ]
+        self.jitter_mode = jitter_mode if jitter else "none"
+        # The default list is only built if a caller asks for it
+        self._retryable_exceptions: Optional[List[Type[Exception]]] = None
+        self._retryable_types: Tuple[Type[Exception], ...] = _DEFAULT_RETRYABLE
+        if retryable_exceptions:
+            self.retryable_exceptions = retryable_exceptions
+
+    @property
+    def retryable_exceptions(self) -> List[Type[Exception]]:
+        """Exception types that trigger a retry."""
+        if self._retryable_exceptions is None:
+            self._retryable_exceptions = list(self._retryable_types)
+        return self._retryable_exceptions
+
+    @retryable_exceptions.setter
+    def retryable_exceptions(self, exceptions: List[Type[Exception]]) -> None:
+        self._retryable_exceptions = list(exceptions)
+        self._retryable_types = tuple(self._retryable_exceptions)
 
     def should_retry(self, exception: Exception, attempt: int) -> bool:
         """Determine if an exception should trigger a retry."""
@@ -101,28 +138,89 @@ class RetryPolicy:
         if isinstance(exception, NonRetryableError):
             return False
 
-        return any(
-            isinstance(exception, exc_type) for exc_type in self.retryable_exceptions
-        )
+        return isinstance(exception, self._retryable_types)
 
     def calculate_delay(self, attempt: int) -> float:
-        """Calculate delay before next retry attempt."""
+        """Calculate delay before next retry attempt.
+
+        Full jitter (the default) draws uniformly from ``[0, delay]``, which
+        decorrelates concurrent retriers and avoids synchronized retry storms.
+        Equal jitter keeps the legacy ``[delay/2, delay]`` range.
+        """
         delay = self.base_delay * (self.exponential_base**attempt)
         delay = min(delay, self.max_delay)
 
-        if self.jitter:
-            import random
-
-            delay *= 0.5 + random.random() * 0.5  # ±50% jitter
+        if self.jitter_mode == "full":
+            delay = _rand() * delay
+        elif self.jitter_mode == "equal":
+            delay *= 0.5 + _rand() * 0.5
 
         return delay
 
 
+def ttl_cache(seconds: float = 1.0):
+    """Decorator caching a function's result for a short time-to-live.
+
+    Results are keyed by call arguments and stored with a monotonic expiry,
+    so repeated calls inside the TTL window are a dict lookup rather than a
+    fresh (possibly syscall-heavy) evaluation.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache: Dict[Any, Any] = {}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            now = time.monotonic()
+            entry = cache.get(key)
+            if entry is not None and now < entry[1]:
+                return entry[0]
+
+            value = func(*args, **kwargs)
+            cache[key] = (value, now + seconds)
+            return value
+
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+class Bulkhead:
+    """
+    Concurrency limit for calls into a downstream dependency.
+
+    Caps the number of in-flight calls so a slow backend cannot tie up
+    every worker; callers beyond the capacity fail fast instead of queueing.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"Bulkhead capacity must be positive: {capacity}")
+
+        self.capacity = capacity
+        self._sem = threading.BoundedSemaphore(capacity)
+
+    def acquire(self, timeout: Optional[float] = 0) -> bool:
+        """Try to take a slot, waiting at most ``timeout`` seconds."""
+        if not timeout:
+            return self._sem.acquire(blocking=False)
+        return self._sem.acquire(timeout=timeout)
+
+    def release(self) -> None:
+        """Return a slot taken with :meth:`acquire`."""
+        self._sem.release()
+
+
 class CircuitBreaker:
     """
     Circuit breaker implementation for fault tolerance.
 
     Prevents cascading failures by temporarily disabling failing services.
+    An optional bulkhead (``max_concurrent``) additionally limits how many
+    calls may be in flight at once, and while HALF_OPEN only
+    ``half_open_max_calls`` probe calls are let through to the backend.
     """
 
     def __init__(
@@ -130,10 +228,14 @@ class CircuitBreaker:
         failure_threshold: int = 5,
         timeout: float = 60.0,
         expected_exception: Type[Exception] = Exception,
+        max_concurrent: Optional[int] = None,
+        half_open_max_calls: int = 1,
     ):
         self.failure_threshold = failure_threshold
         self.timeout = timeout
         self.expected_exception = expected_exception
+        self._bulkhead = Bulkhead(max_concurrent) if max_concurrent else None
+        self._half_open_sem = threading.BoundedSemaphore(half_open_max_calls)
 
         self.failure_count = 0
         self.last_failure_time: Optional[datetime] = None
@@ -161,6 +263,17 @@ class CircuitBreaker:
             else:
                 raise CircuitBreakerOpenError("Circuit breaker is OPEN")
 
+        bulkhead = self._bulkhead
+        if bulkhead is not None and not bulkhead.acquire(timeout=0):
+            raise CircuitBreakerOpenError("Circuit breaker bulkhead is full")
+
+        # Only a limited number of probes may test a recovering backend
+        probe = self.state == CircuitBreakerState.HALF_OPEN
+        if probe and not self._half_open_sem.acquire(blocking=False):
+            if bulkhead is not None:
+                bulkhead.release()
+            raise CircuitBreakerOpenError("Circuit breaker is HALF_OPEN")
+
         try:
             result = func(*args, **kwargs)
             self._on_success()
@@ -168,6 +281,11 @@ class CircuitBreaker:
         except self.expected_exception:
             self._on_failure()
             raise
+        finally:
+            if probe:
+                self._half_open_sem.release()
+            if bulkhead is not None:
+                bulkhead.release()
 
     def _should_attempt_reset(self) -> bool:
         """Check if circuit breaker should attempt to reset."""
@@ -288,6 +406,28 @@ async def async_retry_with_policy(policy: RetryPolicy):
     return decorator
 
 
+class LRUCounter(OrderedDict):
+    """
+    Counter with bounded cardinality.
+
+    Keys are kept in recency order; once ``maxsize`` distinct keys are
+    tracked, incrementing a new key evicts the least recently updated one.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def increment(self, key: str, amount: int = 1) -> int:
+        """Add ``amount`` to the count for ``key`` and return the new count."""
+        count = self.get(key, 0) + amount
+        self[key] = count
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+        return count
+
+
 class ErrorHandler:
     """
     Centralized error handling and reporting system.
@@ -295,9 +435,18 @@ class ErrorHandler:
 
     def __init__(self, config: Optional[Config] = None):
         self.config = config or Config()
-        self.error_counts: Dict[str, int] = {}
+        self.error_counts = LRUCounter(maxsize=1024)
         self.error_history: List[Dict[str, Any]] = []
         self.max_history = 1000
+        # Monotonic timestamps parallel to error_history, always sorted. A list,
+        # not a deque, so the bisect in get_error_summary indexes in O(1).
+        self._error_ts: List[float] = []
+        self._log_dispatch = {
+            ErrorSeverity.CRITICAL: (logger.critical, "CRITICAL ERROR"),
+            ErrorSeverity.HIGH: (logger.error, "HIGH SEVERITY"),
+            ErrorSeverity.MEDIUM: (logger.warning, "MEDIUM SEVERITY"),
+            ErrorSeverity.LOW: (logger.info, "LOW SEVERITY"),
+        }
 
         logger.info("Error handler initialized")
 
@@ -325,32 +474,24 @@ class ErrorHandler:
 
         # Add to history
         self.error_history.append(error_info)
+        self._error_ts.append(time.monotonic())
         if len(self.error_history) > self.max_history:
             self.error_history.pop(0)
+            self._error_ts.pop(0)
 
         # Update error counts
         error_key = f"{type(error).__name__}:{severity.value}"
-        self.error_counts[error_key] = self.error_counts.get(error_key, 0) + 1
+        self.error_counts.increment(error_key)
 
         # Log based on severity
-        if severity == ErrorSeverity.CRITICAL:
-            logger.critical(f"CRITICAL ERROR: {error}", extra={"context": context})
-        elif severity == ErrorSeverity.HIGH:
-            logger.error(f"HIGH SEVERITY: {error}", extra={"context": context})
-        elif severity == ErrorSeverity.MEDIUM:
-            logger.warning(f"MEDIUM SEVERITY: {error}", extra={"context": context})
-        else:
-            logger.info(f"LOW SEVERITY: {error}", extra={"context": context})
+        log_fn, prefix = self._log_dispatch[severity]
+        log_fn(f"{prefix}: {error}", extra={"context": context})
 
     def get_error_summary(self) -> Dict[str, Any]:
         """Get summary of error statistics."""
         total_errors = len(self.error_history)
-        recent_errors = [
-            e
-            for e in self.error_history
-            if datetime.fromisoformat(e["timestamp"])
-            > datetime.now() - timedelta(hours=1)
-        ]
+        cutoff = time.monotonic() - 3600.0
+        recent_count = len(self._error_ts) - bisect.bisect_right(self._error_ts, cutoff)
 
         severity_counts = {}
         for error in self.error_history:
@@ -359,8 +500,8 @@ class ErrorHandler:
 
         return {
             "total_errors": total_errors,
-            "recent_errors_1h": len(recent_errors),
-            "error_counts_by_type": self.error_counts.copy(),
+            "recent_errors_1h": recent_count,
+            "error_counts_by_type": dict(self.error_counts),
             "severity_distribution": severity_counts,
             "most_recent_errors": (
                 self.error_history[-10:] if self.error_history else []
@@ -377,6 +518,8 @@ class HealthChecker:
         self.config = config or Config()
         self.checks: Dict[str, Callable] = {}
         self.last_check_results: Dict[str, Dict[str, Any]] = {}
+        self._status_counts = {"healthy": 0, "warning": 0, "error": 0}
+        self.check_cache_ttl = 1.0  # seconds
 
         # Register default health checks
         self._register_default_checks()
@@ -391,10 +534,9 @@ class HealthChecker:
     def _register_default_checks(self) -> None:
         """Register default system health checks."""
 
+        @ttl_cache(seconds=self.check_cache_ttl)
         def check_disk_space() -> Dict[str, Any]:
             """Check available disk space."""
-            import shutil
-
             try:
                 total, used, free = shutil.disk_usage(self.config.data_dir)
                 free_percent = (free / total) * 100
@@ -408,9 +550,11 @@ class HealthChecker:
             except Exception as e:
                 return {"status": "error", "message": f"Disk check failed: {e}"}
 
+        @ttl_cache(seconds=self.check_cache_ttl)
         def check_memory_usage() -> Dict[str, Any]:
             """Check memory usage."""
-            import psutil
+            if psutil is None:
+                return {"status": "error", "message": "psutil is not installed"}
 
             try:
                 memory = psutil.virtual_memory()
@@ -432,7 +576,7 @@ class HealthChecker:
 
         for name, check_func in self.checks.items():
             try:
-                result = check_func()
+                result = dict(check_func())  # cached checks share their dict
                 result["timestamp"] = datetime.now().isoformat()
                 results[name] = result
 
@@ -454,7 +598,15 @@ class HealthChecker:
                 }
                 logger.error(f"Health check {name} failed: {e}")
 
+        # Tally statuses once so get_overall_health is O(1)
+        counts = {"healthy": 0, "warning": 0, "error": 0}
+        for result in results.values():
+            status = result.get("status")
+            if status in counts:
+                counts[status] += 1
+
         self.last_check_results = results
+        self._status_counts = counts
         return results
 
     def get_overall_health(self) -> Dict[str, Any]:
@@ -462,15 +614,10 @@ class HealthChecker:
         if not self.last_check_results:
             self.run_checks()
 
-        healthy_count = sum(
-            1 for r in self.last_check_results.values() if r.get("status") == "healthy"
-        )
-        warning_count = sum(
-            1 for r in self.last_check_results.values() if r.get("status") == "warning"
-        )
-        error_count = sum(
-            1 for r in self.last_check_results.values() if r.get("status") == "error"
-        )
+        counts = self._status_counts
+        healthy_count = counts["healthy"]
+        warning_count = counts["warning"]
+        error_count = counts["error"]
 
         total_checks = len(self.last_check_results)
 
@@ -2,23 +2,124 @@
 
 This module provides a client for accessing seismic waveform data from IRIS
 Data Management Center using ObsPy with error handling and data validation.
+
+ObsPy core is imported eagerly (the rest of the data pipeline needs it), but
+the FDSN web-service client, SciPy signal filters and aiohttp are imported
+where they are first used, so importing this module stays cheap.
 """
 
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import os
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property, lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import List, Optional, Union
-
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TYPE_CHECKING,
+    Tuple,
+    Union,
+)
+
+import numpy as np
 import obspy
-from obspy import Stream, UTCDateTime
-from obspy.clients.fdsn import Client as FDSNClient
+from obspy import Stream, Trace, UTCDateTime
 from obspy.core.event import Catalog, Event
+from obspy.core.inventory import Response
 
 from ..config.settings import Config
 from ..utils.logger import get_logger
+from ..utils.preprocess_kernels import BATCH_DETREND_TYPES, preprocess_batched
+
+if TYPE_CHECKING:  # pragma: no cover
+    import aiohttp
+    from asyncio_throttle import Throttler
+    from obspy.clients.fdsn import Client as FDSNClient
 
 logger = get_logger(__name__)
 
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.19
+MSEED_RECORD_LENGTH = 4096
+
+
+def _haversine_km(
+    lat: float, lon: float, lats: np.ndarray, lons: np.ndarray
+) -> np.ndarray:
+    """Great-circle distances in km from (lat, lon) to arrays of points."""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (
+        np.sin((lat2 - lat1) / 2.0) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a failed request may succeed if repeated."""
+    from obspy.clients.fdsn.header import (
+        FDSNBadGatewayException,
+        FDSNException,
+        FDSNInternalServerException,
+        FDSNServiceUnavailableException,
+        FDSNTimeoutException,
+        FDSNTooManyRequestsException,
+    )
+
+    # Rate limiting, server faults and timeouts
+    retryable = (
+        FDSNTooManyRequestsException,
+        FDSNInternalServerException,
+        FDSNBadGatewayException,
+        FDSNServiceUnavailableException,
+        FDSNTimeoutException,
+    )
+    if isinstance(error, retryable):
+        return True
+    # ObsPy raises the bare base class when no HTTP response was received
+    if type(error) is FDSNException:
+        return True
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def _retry_after_seconds(headers: Any) -> Optional[float]:
+    """Parse a numeric Retry-After header, if present."""
+    try:
+        return max(float(headers["Retry-After"]), 0.0)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _parse_utc(value: str) -> UTCDateTime:
+    """Parse a time string, caching results for repeated request windows."""
+    return UTCDateTime(value)
+
+
+def _to_utc(value: Union[str, datetime, UTCDateTime]) -> UTCDateTime:
+    """Convert a request time to UTCDateTime, reusing parsed strings."""
+    if isinstance(value, UTCDateTime):
+        return value
+    if isinstance(value, str):
+        return _parse_utc(value)
+    return UTCDateTime(value)
+
 
 class IRISClientError(Exception):
     """Base exception for IRIS client related errors."""
@@ -58,43 +159,104 @@ class IRISClient:
         self.timeout = self.config.api.timeout
         self.max_retries = self.config.api.max_retries
 
-        # Initialize FDSN clients for different services
-        try:
-            self.waveform_client = FDSNClient("IRIS", timeout=self.timeout)
-            self.event_client = FDSNClient("IRIS", timeout=self.timeout)
-            self.station_client = FDSNClient("IRIS", timeout=self.timeout)
-            logger.info("Initialized IRIS FDSN clients successfully")
-        except Exception as e:
-            raise IRISClientError(f"Failed to initialize IRIS clients: {e}")
+        # One FDSN client serves all three services; it is created on first
+        # use so instances that never touch IRIS skip service discovery
+        self._fdsn_client: Optional[FDSNClient] = None
+        self._fdsn_lock = threading.Lock()
 
         # Cache directory for waveform data
         self.cache_dir = self.config.cache_dir / "iris"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_max_bytes = 2 * 1024**3  # evict least recently used beyond this
+        self.cache_check_interval = 32  # writes between cache size checks
+        self._cache_writes = 0
+
+        # Instrument responses by SEED id: [(start_date, end_date, response)]
+        self._response_cache: Dict[
+            str, List[Tuple[UTCDateTime, Optional[UTCDateTime], Response]]
+        ] = {}
 
         # Rate limiting (IRIS has more lenient limits than USGS)
-        self.rate_limit = 0.5  # 2 requests per second
-        self.last_request_time = 0.0
+        self.rate_limit = 0.5  # 2 requests per second sustained
+        self.burst = 4  # requests allowed back-to-back after idling
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._bucket_lock = threading.Lock()
 
         logger.info("IRIS client initialized with ObsPy integration")
 
+    @property
+    def fdsn_client(self) -> FDSNClient:
+        """Shared FDSN client, created thread-safely on first access."""
+        if self._fdsn_client is None:
+            with self._fdsn_lock:
+                if self._fdsn_client is None:
+                    from obspy.clients.fdsn import Client as FDSNClient
+
+                    try:
+                        self._fdsn_client = FDSNClient(
+                            "IRIS", timeout=self.timeout, use_gzip=True
+                        )
+                        logger.info("Initialized IRIS FDSN clients successfully")
+                    except Exception as e:
+                        raise IRISClientError(
+                            f"Failed to initialize IRIS clients: {e}"
+                        )
+        return self._fdsn_client
+
+    @cached_property
+    def waveform_client(self) -> FDSNClient:
+        """FDSN client used for dataselect requests; assignable to override."""
+        return self.fdsn_client
+
+    @cached_property
+    def event_client(self) -> FDSNClient:
+        """FDSN client used for event requests; assignable to override."""
+        return self.fdsn_client
+
+    @cached_property
+    def station_client(self) -> FDSNClient:
+        """FDSN client used for station requests; assignable to override."""
+        return self.fdsn_client
+
     def _enforce_rate_limit(self) -> None:
-        """Enforce rate limiting between API calls."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """
+        Enforce rate limiting between API calls with a token bucket.
 
-        if time_since_last < self.rate_limit:
-            sleep_time = self.rate_limit - time_since_last
+        Tokens refill at one per ``rate_limit`` seconds up to ``burst``. A
+        caller that finds the bucket empty takes a token on credit and
+        sleeps off the debt outside the lock, so concurrent callers queue
+        up behind each other without serializing on the lock itself.
+        """
+        if self.rate_limit <= 0:
+            return
+
+        refill_rate = 1.0 / self.rate_limit
+        with self._bucket_lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst),
+                self._tokens + (now - self._last_refill) * refill_rate,
+            )
+            self._last_refill = now
+            self._tokens -= 1.0
+            sleep_time = -self._tokens / refill_rate if self._tokens < 0 else 0.0
+
+        if sleep_time > 0:
             logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
             time.sleep(sleep_time)
 
-        self.last_request_time = time.time()
-
-    def _validate_waveform_data(self, stream: Stream) -> bool:
+    def _validate_waveform_data(self, stream: Stream, check_gaps: bool = False) -> bool:
         """
         Validate waveform data quality.
 
+        Per-trace stats are gathered into arrays once and checked together;
+        only offending traces are visited again to log them.
+
         Args:
             stream: ObsPy Stream object
+            check_gaps: Whether to scan the stream for gaps (a full pass
+                over every trace)
 
         Returns:
             True if data passes quality checks
@@ -103,25 +265,31 @@ class IRISClient:
             logger.warning("Empty stream received")
             return False
 
-        for trace in stream:
-            # Check for gaps
-            if len(trace.get_gaps()) > 0:
-                logger.warning(f"Gaps found in trace {trace.id}")
-
-            # Check sampling rate consistency
-            expected_sr = self.config.data.sampling_rate
-            if abs(trace.stats.sampling_rate - expected_sr) > 0.1:
-                logger.warning(
-                    f"Sampling rate mismatch: expected {expected_sr}, "
-                    f"got {trace.stats.sampling_rate} for {trace.id}"
-                )
+        # Check for gaps (gap detection is a Stream-level operation)
+        if check_gaps:
+            for trace_id in sorted({".".join(gap[:4]) for gap in stream.get_gaps()}):
+                logger.warning(f"Gaps found in trace {trace_id}")
 
-            # Check for minimum data length
-            min_length = self.config.data.window_length
-            if trace.stats.npts < min_length * trace.stats.sampling_rate:
-                logger.warning(
-                    f"Trace {trace.id} too short: {trace.stats.npts} samples"
-                )
+        n_traces = len(stream)
+        sampling_rates = np.fromiter(
+            (t.stats.sampling_rate for t in stream), dtype=np.float64, count=n_traces
+        )
+        npts = np.fromiter(
+            (t.stats.npts for t in stream), dtype=np.int64, count=n_traces
+        )
+
+        # Check sampling rate consistency
+        expected_sr = self.config.data.sampling_rate
+        for i in np.flatnonzero(np.abs(sampling_rates - expected_sr) > 0.1):
+            logger.warning(
+                f"Sampling rate mismatch: expected {expected_sr}, "
+                f"got {sampling_rates[i]} for {stream[i].id}"
+            )
+
+        # Check for minimum data length
+        min_length = self.config.data.window_length
+        for i in np.flatnonzero(npts < min_length * sampling_rates):
+            logger.warning(f"Trace {stream[i].id} too short: {npts[i]} samples")
 
         return True
 
@@ -143,7 +311,9 @@ class IRISClient:
             network: Network code (e.g., 'IU', 'US')
             station: Station code (e.g., 'ANMO', 'COLA')
             location: Location code (default '*')
-            channel: Channel code (e.g., 'BHZ', 'HHZ', default '*')
+            channel: Channel code or FDSN comma-separated list
+                (e.g., 'BHZ' or 'BHZ,HHZ', default '*'); prefer one request
+                with a list over one request per channel
             start_time: Start time for data request
             end_time: End time for data request
             attach_response: Whether to attach instrument response
@@ -157,10 +327,20 @@ class IRISClient:
             IRISDataError: For data-related errors
         """
         # Convert time parameters to UTCDateTime
-        if not isinstance(start_time, UTCDateTime):
-            start_time = UTCDateTime(start_time)
-        if not isinstance(end_time, UTCDateTime):
-            end_time = UTCDateTime(end_time)
+        start_time = _to_utc(start_time)
+        end_time = _to_utc(end_time)
+
+        remove = remove_response and attach_response
+        cache_path = self._waveform_cache_path(
+            network, station, location, channel, start_time, end_time, remove
+        )
+        cached = self._load_cached_waveforms(cache_path)
+        if cached is not None:
+            if attach_response and not remove:
+                self._attach_response(
+                    cached, network, station, location, channel, start_time, end_time
+                )
+            return cached
 
         # Enforce rate limiting
         self._enforce_rate_limit()
@@ -170,36 +350,261 @@ class IRISClient:
             f"from {start_time} to {end_time}"
         )
 
-        # Attempt to fetch data with retries
-        last_exception = None
-        for attempt in range(self.max_retries + 1):
+        stream = self._request_with_retries(
+            self.waveform_client.get_waveforms,
+            network=network,
+            station=station,
+            location=location,
+            channel=channel,
+            starttime=start_time,
+            endtime=end_time,
+            attach_response=False,
+        )
+
+        # Attach responses from the per-channel cache where possible
+        if attach_response:
+            self._attach_response(
+                stream, network, station, location, channel, start_time, end_time
+            )
+
+        # Validate data quality
+        if not self._validate_waveform_data(stream):
+            logger.warning("Waveform data failed quality validation")
+
+        # Remove instrument response if requested
+        if remove:
+            try:
+                stream.remove_response(output="VEL")
+                logger.info("Instrument response removed successfully")
+            except Exception as e:
+                logger.warning(f"Failed to remove response: {e}")
+                cache_path = None
+
+        if cache_path is not None:
+            self._save_cached_waveforms(cache_path, stream)
+
+        logger.info(f"Successfully fetched {len(stream)} traces")
+        return stream
+
+    def _waveform_cache_path(
+        self,
+        network: str,
+        station: str,
+        location: str,
+        channel: str,
+        start_time: UTCDateTime,
+        end_time: UTCDateTime,
+        remove_response: bool,
+    ) -> Path:
+        """Get the cache file path for a waveform request signature."""
+        signature = (
+            f"{network}.{station}.{location}.{channel}|"
+            f"{start_time.timestamp}|{end_time.timestamp}|{remove_response}"
+        )
+        key = hashlib.blake2b(signature.encode(), digest_size=16).hexdigest()
+        return self.cache_dir / f"{key}.mseed"
+
+    def _load_cached_waveforms(self, cache_path: Path) -> Optional[Stream]:
+        """Load cached waveforms, marking the entry as recently used."""
+        if not cache_path.exists():
+            return None
+
+        try:
+            stream = obspy.read(str(cache_path), format="MSEED")
+            os.utime(cache_path)
+            logger.debug(f"Loaded waveforms from cache: {cache_path.name}")
+            return stream
+        except Exception as e:
+            logger.warning(f"Failed to load cached waveforms {cache_path.name}: {e}")
+            return None
+
+    def _save_cached_waveforms(self, cache_path: Path, stream: Stream) -> None:
+        """Write waveforms to the cache and periodically enforce its size."""
+        if not stream:
+            return
+
+        try:
+            _write_mseed(stream, cache_path)
+            logger.debug(f"Saved waveforms to cache: {cache_path.name}")
+        except Exception as e:
+            logger.warning(f"Failed to cache waveforms {cache_path.name}: {e}")
+            return
+
+        self._cache_writes += 1
+        if self._cache_writes % self.cache_check_interval == 0:
+            self._evict_waveform_cache()
+
+    def _evict_waveform_cache(self) -> None:
+        """Delete least recently used cache files beyond ``cache_max_bytes``."""
+        entries = []
+        for path in self.cache_dir.glob("*.mseed"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.cache_max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError as e:
+                logger.debug(f"Failed to evict {path.name}: {e}")
+
+    def _attach_response(
+        self,
+        stream: Stream,
+        network: str,
+        station: str,
+        location: str,
+        channel: str,
+        start_time: UTCDateTime,
+        end_time: UTCDateTime,
+    ) -> None:
+        """
+        Attach instrument responses, fetching only channels not yet cached.
+
+        Responses are cached per SEED id with their channel epochs, so
+        repeated requests for the same channels reuse the parsed objects
+        instead of downloading and parsing StationXML again.
+        """
+        if any(self._cached_response(trace) is None for trace in stream):
+            self._enforce_rate_limit()
             try:
-                stream = self.waveform_client.get_waveforms(
+                inventory = self._request_with_retries(
+                    self.station_client.get_stations,
                     network=network,
                     station=station,
                     location=location,
                     channel=channel,
                     starttime=start_time,
                     endtime=end_time,
-                    attach_response=attach_response,
+                    level="response",
                 )
+            except IRISClientError as e:
+                logger.warning(f"Failed to fetch instrument responses: {e}")
+                inventory = []
+
+            for net in inventory:
+                for sta in net:
+                    for cha in sta:
+                        seed_id = ".".join(
+                            (net.code, sta.code, cha.location_code, cha.code)
+                        )
+                        epochs = self._response_cache.setdefault(seed_id, [])
+                        if all(epoch[0] != cha.start_date for epoch in epochs):
+                            epochs.append((cha.start_date, cha.end_date, cha.response))
 
-                # Validate data quality
-                if not self._validate_waveform_data(stream):
-                    logger.warning("Waveform data failed quality validation")
+        for trace in stream:
+            response = self._cached_response(trace)
+            if response is not None:
+                trace.stats.response = response
+            else:
+                logger.warning(f"No instrument response found for {trace.id}")
+
+    def _cached_response(self, trace: Trace) -> Optional[Response]:
+        """Look up a cached response whose epoch covers the trace start."""
+        starttime = trace.stats.starttime
+        for start_date, end_date, response in self._response_cache.get(trace.id, ()):
+            if (start_date is None or start_date <= starttime) and (
+                end_date is None or starttime <= end_date
+            ):
+                return response
+        return None
+
+    def get_waveforms_bulk(
+        self,
+        bulk: Sequence[Tuple[str, str, str, str, UTCDateTime, UTCDateTime]],
+        attach_response: bool = True,
+    ) -> Stream:
+        """
+        Fetch waveforms for many channels with a single FDSN bulk request.
 
-                # Remove instrument response if requested
-                if remove_response and attach_response:
-                    try:
-                        stream.remove_response(output="VEL")
-                        logger.info("Instrument response removed successfully")
-                    except Exception as e:
-                        logger.warning(f"Failed to remove response: {e}")
+        Args:
+            bulk: Sequence of (network, station, location, channel,
+                start_time, end_time) tuples
+            attach_response: Whether to attach instrument response
+
+        Returns:
+            ObsPy Stream object containing waveform data
+
+        Raises:
+            IRISNetworkError: If the request fails after all retries
+            IRISClientError: For non-retryable failures (e.g. HTTP 4xx)
+        """
+        self._enforce_rate_limit()
+
+        logger.info(f"Fetching waveforms in bulk for {len(bulk)} requests")
+
+        stream = self._request_with_retries(
+            self.waveform_client.get_waveforms_bulk,
+            list(bulk),
+            attach_response=attach_response,
+        )
+
+        if not self._validate_waveform_data(stream):
+            logger.warning("Waveform data failed quality validation")
+
+        logger.info(f"Successfully fetched {len(stream)} traces in bulk")
+        return stream
+
+    def get_waveforms_bulk_stations(
+        self,
+        stations: Sequence[Tuple[str, str]],
+        channels: Sequence[str],
+        start_time: Union[str, datetime, UTCDateTime],
+        end_time: Union[str, datetime, UTCDateTime],
+        attach_response: bool = True,
+    ) -> Stream:
+        """
+        Fetch several channels from many stations with one bulk request.
 
-                logger.info(f"Successfully fetched {len(stream)} traces")
-                return stream
+        Args:
+            stations: Sequence of (network, station) pairs
+            channels: Channel codes to fetch from every station
+            start_time: Start time for data request
+            end_time: End time for data request
+            attach_response: Whether to attach instrument response
+
+        Returns:
+            ObsPy Stream object containing waveform data
+        """
+        start_time = _to_utc(start_time)
+        end_time = _to_utc(end_time)
+        bulk = [
+            (net, sta, "*", cha, start_time, end_time)
+            for net, sta in stations
+            for cha in channels
+        ]
+        return self.get_waveforms_bulk(bulk, attach_response=attach_response)
+
+    def _request_with_retries(self, request: Callable, *args, **kwargs) -> Any:
+        """
+        Call an FDSN request function with exponential-backoff retries.
+
+        Only transient failures (timeouts, connection errors, HTTP 429 and
+        5xx) are retried; anything else fails on the first attempt.
+
+        Raises:
+            IRISDataError: If the server has no data for the request
+            IRISNetworkError: If a transient failure persists after all retries
+            IRISClientError: For non-retryable failures such as bad requests
+        """
+        last_exception = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                return request(*args, **kwargs)
 
             except Exception as e:
+                from obspy.clients.fdsn.header import FDSNNoDataException
+
+                if isinstance(e, FDSNNoDataException):
+                    raise IRISDataError(f"No data available: {e}") from e
+                if not _is_retryable(e):
+                    raise IRISClientError(f"Request failed: {e}") from e
                 last_exception = IRISNetworkError(f"Request failed: {e}")
 
                 if attempt < self.max_retries:
@@ -245,10 +650,8 @@ class IRISClient:
             IRISClientError: For client-related errors
         """
         # Convert time parameters
-        if not isinstance(start_time, UTCDateTime):
-            start_time = UTCDateTime(start_time)
-        if not isinstance(end_time, UTCDateTime):
-            end_time = UTCDateTime(end_time)
+        start_time = _to_utc(start_time)
+        end_time = _to_utc(end_time)
 
         # Enforce rate limiting
         self._enforce_rate_limit()
@@ -286,6 +689,8 @@ class IRISClient:
         max_latitude: Optional[float] = None,
         min_longitude: Optional[float] = None,
         max_longitude: Optional[float] = None,
+        level: str = "channel",
+        format_type: str = "xml",
     ) -> obspy.Inventory:
         """
         Fetch station metadata from IRIS.
@@ -301,6 +706,10 @@ class IRISClient:
             max_latitude: Maximum latitude
             min_longitude: Minimum longitude
             max_longitude: Maximum longitude
+            level: Detail level ('network', 'station', 'channel', 'response');
+                only request 'response' when instrument responses are needed
+            format_type: Payload format ('xml' or the much smaller 'text',
+                which supports levels up to 'channel')
 
         Returns:
             ObsPy Inventory object containing station metadata
@@ -309,10 +718,10 @@ class IRISClient:
             IRISClientError: For client-related errors
         """
         # Convert time parameters if provided
-        if start_time and not isinstance(start_time, UTCDateTime):
-            start_time = UTCDateTime(start_time)
-        if end_time and not isinstance(end_time, UTCDateTime):
-            end_time = UTCDateTime(end_time)
+        if start_time:
+            start_time = _to_utc(start_time)
+        if end_time:
+            end_time = _to_utc(end_time)
 
         # Enforce rate limiting
         self._enforce_rate_limit()
@@ -331,7 +740,8 @@ class IRISClient:
                 maxlatitude=max_latitude,
                 minlongitude=min_longitude,
                 maxlongitude=max_longitude,
-                level="response",
+                level=level,
+                format=format_type,
             )
 
             logger.info("Successfully fetched station metadata")
@@ -348,10 +758,15 @@ class IRISClient:
         time_before: float = 60.0,
         time_after: float = 300.0,
         max_distance_km: float = 1000.0,
+        max_workers: int = 8,
+        stations: Optional[List[Tuple[str, str]]] = None,
     ) -> Stream:
         """
         Fetch waveforms for a specific earthquake event.
 
+        Collects everything yielded by :meth:`iter_waveforms_for_event` into
+        one Stream.
+
         Args:
             event: ObsPy Event object
             networks: List of network codes to search
@@ -359,6 +774,10 @@ class IRISClient:
             time_before: Seconds before event origin time
             time_after: Seconds after event origin time
             max_distance_km: Maximum station distance from event
+            max_workers: Maximum concurrent per-station requests in the
+                fallback path
+            stations: Precomputed (network, station) pairs to fetch instead
+                of querying station metadata
 
         Returns:
             ObsPy Stream object with waveforms
@@ -366,6 +785,152 @@ class IRISClient:
         Raises:
             IRISClientError: For client-related errors
         """
+        combined_stream = Stream(
+            list(
+                chain.from_iterable(
+                    self.iter_waveforms_for_event(
+                        event,
+                        networks=networks,
+                        channels=channels,
+                        time_before=time_before,
+                        time_after=time_after,
+                        max_distance_km=max_distance_km,
+                        max_workers=max_workers,
+                        stations=stations,
+                    )
+                )
+            )
+        )
+
+        logger.info(f"Collected {len(combined_stream)} traces for event")
+        return combined_stream
+
+    def iter_waveforms_for_event(
+        self,
+        event: Event,
+        networks: List[str] = ["IU", "US", "N4"],
+        channels: List[str] = ["BHZ", "HHZ"],
+        time_before: float = 60.0,
+        time_after: float = 300.0,
+        max_distance_km: float = 1000.0,
+        max_workers: int = 8,
+        stations: Optional[List[Tuple[str, str]]] = None,
+    ) -> Iterator[Stream]:
+        """
+        Yield an event's waveforms one station at a time.
+
+        All stations are requested in one FDSN bulk request; if that fails,
+        stations are fetched individually on a thread pool with at most
+        ``max_workers`` requests ahead of the consumer, so downstream
+        processing overlaps with the remaining downloads.
+
+        Args:
+            event: ObsPy Event object
+            networks: List of network codes to search
+            channels: List of channel codes to fetch
+            time_before: Seconds before event origin time
+            time_after: Seconds after event origin time
+            max_distance_km: Maximum station distance from event
+            max_workers: Maximum concurrent per-station requests in the
+                fallback path
+            stations: Precomputed (network, station) pairs to fetch instead
+                of querying station metadata
+
+        Yields:
+            ObsPy Stream with one station's waveforms, in station order
+
+        Raises:
+            IRISClientError: For client-related errors
+        """
+        start_time, end_time, stations = self._get_event_stations(
+            event,
+            networks,
+            channels,
+            time_before,
+            time_after,
+            max_distance_km,
+            stations,
+        )
+
+        if not stations:
+            logger.info("No stations found for event")
+            return
+
+        # Fetch all stations with one bulk request
+        try:
+            bulk_stream = self.get_waveforms_bulk_stations(
+                stations, channels, start_time, end_time
+            )
+        except IRISDataError as e:
+            logger.info(f"No waveforms available for event: {e}")
+            return
+        except IRISClientError as e:
+            logger.warning(f"Bulk waveform request failed, fetching per station: {e}")
+        else:
+            for net, sta in stations:
+                station_stream = bulk_stream.select(network=net, station=sta)
+                if station_stream:
+                    yield station_stream
+            return
+
+        # Fall back to fetching waveforms station by station, one request
+        # per station for all channels. Requests run on a thread pool
+        # (socket I/O releases the GIL) and still pass through the shared
+        # token-bucket rate limiter.
+        channel = ",".join(channels)
+        workers = max(1, min(max_workers, len(stations)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending: Deque = deque()
+            remaining = iter(stations)
+
+            def submit_next() -> None:
+                for net, sta in remaining:
+                    future = pool.submit(
+                        self.get_waveforms,
+                        network=net,
+                        station=sta,
+                        location="*",
+                        channel=channel,
+                        start_time=start_time,
+                        end_time=end_time,
+                        attach_response=True,
+                    )
+                    pending.append((future, net, sta))
+                    return
+
+            for _ in range(workers):
+                submit_next()
+
+            # Yield in submission order so the station order is stable
+            while pending:
+                future, net, sta = pending.popleft()
+                submit_next()
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.debug(f"Failed to get waveforms for {net}.{sta}: {e}")
+
+    def _get_event_stations(
+        self,
+        event: Event,
+        networks: List[str],
+        channels: List[str],
+        time_before: float,
+        time_after: float,
+        max_distance_km: float,
+        stations: Optional[List[Tuple[str, str]]] = None,
+    ) -> Tuple[UTCDateTime, UTCDateTime, List[Tuple[str, str]]]:
+        """
+        Resolve an event's time window and the stations around it.
+
+        The station query uses a bounding box sized to ``max_distance_km``;
+        stations inside the box but beyond the great-circle distance are
+        dropped before any waveform is requested. Passing ``stations``
+        (e.g. from :meth:`get_stations_for_events`) skips the query.
+
+        Returns:
+            Tuple of (start_time, end_time, [(network, station), ...])
+        """
         origin = event.preferred_origin() or event.origins[0]
         origin_time = origin.time
 
@@ -377,44 +942,251 @@ class IRISClient:
             f"({origin.latitude}, {origin.longitude})"
         )
 
-        # Get nearby stations
+        if stations is not None:
+            return start_time, end_time, stations
+
+        codes, coords = self._fetch_station_coordinates(
+            networks,
+            channels,
+            start_time,
+            end_time,
+            _search_box([origin.latitude], [origin.longitude], max_distance_km),
+        )
+        stations = _stations_within(
+            codes, coords, origin.latitude, origin.longitude, max_distance_km
+        )
+        logger.debug(
+            f"{len(stations)} of {len(codes)} stations within {max_distance_km} km"
+        )
+
+        return start_time, end_time, stations
+
+    def get_stations_for_events(
+        self,
+        events: Sequence[Event],
+        networks: List[str] = ["IU", "US", "N4"],
+        channels: List[str] = ["BHZ", "HHZ"],
+        time_before: float = 60.0,
+        time_after: float = 300.0,
+        max_distance_km: float = 1000.0,
+    ) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Find the stations around many events with one metadata request.
+
+        The search box and time window cover every event; stations are then
+        assigned to each event by great-circle distance. The results can be
+        passed to :meth:`get_waveforms_for_event` via ``stations``.
+
+        Args:
+            events: ObsPy Event objects
+            networks: List of network codes to search
+            channels: List of channel codes to search
+            time_before: Seconds before each event origin time
+            time_after: Seconds after each event origin time
+            max_distance_km: Maximum station distance from each event
+
+        Returns:
+            Dictionary mapping event resource id to [(network, station), ...]
+        """
+        origins = [event.preferred_origin() or event.origins[0] for event in events]
+        if not origins:
+            return {}
+
+        codes, coords = self._fetch_station_coordinates(
+            networks,
+            channels,
+            min(origin.time for origin in origins) - time_before,
+            max(origin.time for origin in origins) + time_after,
+            _search_box(
+                [origin.latitude for origin in origins],
+                [origin.longitude for origin in origins],
+                max_distance_km,
+            ),
+        )
+
+        return {
+            str(event.resource_id): _stations_within(
+                codes, coords, origin.latitude, origin.longitude, max_distance_km
+            )
+            for event, origin in zip(events, origins)
+        }
+
+    def _fetch_station_coordinates(
+        self,
+        networks: List[str],
+        channels: List[str],
+        start_time: UTCDateTime,
+        end_time: UTCDateTime,
+        box: Tuple[float, float, Optional[float], Optional[float]],
+    ) -> Tuple[List[Tuple[str, str]], np.ndarray]:
+        """Query station codes and an (n, 2) lat/lon array inside a box."""
+        min_lat, max_lat, min_lon, max_lon = box
         inventory = self.get_stations(
             network=",".join(networks),
             channel=",".join(channels),
             start_time=start_time,
             end_time=end_time,
-            min_latitude=origin.latitude - 10,
-            max_latitude=origin.latitude + 10,
-            min_longitude=origin.longitude - 10,
-            max_longitude=origin.longitude + 10,
+            min_latitude=min_lat,
+            max_latitude=max_lat,
+            min_longitude=min_lon,
+            max_longitude=max_lon,
+            level="station",
+            format_type="text",
         )
 
-        # Fetch waveforms from available stations
-        combined_stream = Stream()
+        codes = [(net.code, sta.code) for net in inventory for sta in net]
+        coords = np.array(
+            [(sta.latitude, sta.longitude) for net in inventory for sta in net],
+            dtype=float,
+        ).reshape(-1, 2)
+        return codes, coords
 
-        for network in inventory:
-            for station in network:
-                try:
-                    stream = self.get_waveforms(
-                        network=network.code,
-                        station=station.code,
-                        location="*",
-                        channel=",".join(channels),
-                        start_time=start_time,
-                        end_time=end_time,
-                        attach_response=True,
-                    )
-                    combined_stream += stream
+    async def aget_waveforms_for_event(
+        self,
+        event: Event,
+        networks: List[str] = ["IU", "US", "N4"],
+        channels: List[str] = ["BHZ", "HHZ"],
+        time_before: float = 60.0,
+        time_after: float = 300.0,
+        max_distance_km: float = 1000.0,
+        max_concurrency: int = 64,
+        stations: Optional[List[Tuple[str, str]]] = None,
+    ) -> Stream:
+        """
+        Fetch waveforms for an event with concurrent per-station requests.
 
-                except Exception as e:
-                    logger.debug(
-                        f"Failed to get waveforms for {network.code}.{station.code}: {e}"
+        Station requests are issued as asyncio tasks against the FDSN
+        dataselect endpoint, bounded by ``max_concurrency`` and throttled to
+        the client's request rate. Instrument responses are not attached.
+
+        Args:
+            event: ObsPy Event object
+            networks: List of network codes to search
+            channels: List of channel codes to fetch
+            time_before: Seconds before event origin time
+            time_after: Seconds after event origin time
+            max_distance_km: Maximum station distance from event
+            max_concurrency: Maximum number of requests in flight
+            stations: Precomputed (network, station) pairs to fetch instead
+                of querying station metadata
+
+        Returns:
+            ObsPy Stream object with waveforms
+        """
+        import aiohttp
+        from asyncio_throttle import Throttler
+
+        loop = asyncio.get_running_loop()
+        start_time, end_time, stations = await loop.run_in_executor(
+            None,
+            self._get_event_stations,
+            event,
+            networks,
+            channels,
+            time_before,
+            time_after,
+            max_distance_km,
+            stations,
+        )
+
+        rate = int(1.0 / self.rate_limit) if self.rate_limit > 0 else max_concurrency
+        semaphore = asyncio.Semaphore(max_concurrency)
+        throttler = Throttler(rate_limit=max(rate, 1), period=1.0)
+        channel = ",".join(channels)
+
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": "seismic-classifier/1.0.0 (Research/Educational)"},
+        ) as session:
+            results = await asyncio.gather(
+                *(
+                    self._async_get_waveforms(
+                        session,
+                        semaphore,
+                        throttler,
+                        net,
+                        sta,
+                        "*",
+                        channel,
+                        start_time,
+                        end_time,
                     )
-                    continue
+                    for net, sta in stations
+                ),
+                return_exceptions=True,
+            )
+
+        combined_stream = Stream()
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug(f"Failed to get waveforms: {result}")
+                continue
+            combined_stream += result
 
         logger.info(f"Collected {len(combined_stream)} traces for event")
         return combined_stream
 
+    def get_waveforms_for_event_concurrent(self, event: Event, **kwargs) -> Stream:
+        """Synchronous wrapper around :meth:`aget_waveforms_for_event`."""
+        return asyncio.run(self.aget_waveforms_for_event(event, **kwargs))
+
+    async def _async_get_waveforms(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        throttler: Throttler,
+        network: str,
+        station: str,
+        location: str,
+        channel: str,
+        start_time: UTCDateTime,
+        end_time: UTCDateTime,
+    ) -> Stream:
+        """Fetch one station's waveforms from the raw FDSN dataselect query."""
+        import aiohttp
+
+        params = {
+            "net": network,
+            "sta": station,
+            "loc": location,
+            "cha": channel,
+            "starttime": start_time.format_iris_web_service(),
+            "endtime": end_time.format_iris_web_service(),
+        }
+
+        last_exception: Exception = IRISNetworkError(
+            f"Request failed for {network}.{station}"
+        )
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with semaphore, throttler:
+                    async with session.get(
+                        self.config.api.iris_base_url, params=params
+                    ) as response:
+                        if response.status == 204:
+                            return Stream()
+                        if response.status == 429:
+                            retry_after = _retry_after_seconds(response.headers)
+                        if response.status == 429 or response.status >= 500:
+                            raise IRISNetworkError(f"HTTP {response.status}")
+                        response.raise_for_status()
+                        data = await response.read()
+
+                return obspy.read(io.BytesIO(data), format="MSEED")
+
+            except aiohttp.ClientResponseError as e:
+                raise IRISNetworkError(f"Request failed: {e}")
+            except (aiohttp.ClientError, asyncio.TimeoutError, IRISNetworkError) as e:
+                last_exception = IRISNetworkError(f"Request failed: {e}")
+
+                if attempt < self.max_retries:
+                    await asyncio.sleep(
+                        retry_after if retry_after is not None else 2**attempt
+                    )
+
+        raise last_exception
+
     def save_waveforms(
         self, stream: Stream, filepath: Union[str, Path], format_type: str = "MSEED"
     ) -> None:
@@ -430,7 +1202,10 @@ class IRISClient:
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            stream.write(str(filepath), format=format_type)
+            if format_type.upper() == "MSEED":
+                _write_mseed(stream, filepath)
+            else:
+                stream.write(str(filepath), format=format_type)
             logger.info(f"Saved {len(stream)} traces to {filepath}")
         except Exception as e:
             raise IRISDataError(f"Failed to save waveforms: {e}")
@@ -461,6 +1236,75 @@ class IRISClient:
             raise IRISDataError(f"Failed to load waveforms: {e}")
 
 
+def _search_box(
+    latitudes: Sequence[float], longitudes: Sequence[float], max_distance_km: float
+) -> Tuple[float, float, Optional[float], Optional[float]]:
+    """
+    Bounding box enclosing a search radius around one or more points.
+
+    Returns:
+        Tuple of (min_lat, max_lat, min_lon, max_lon); the longitude bounds
+        are None near a pole or across the antimeridian
+    """
+    lat_pad = max_distance_km / KM_PER_DEGREE
+    min_lat = max(min(latitudes) - lat_pad, -90.0)
+    max_lat = min(max(latitudes) + lat_pad, 90.0)
+    cos_lat = np.cos(np.radians(max(abs(min_lat), abs(max_lat))))
+    lon_pad = lat_pad / cos_lat if cos_lat > 1e-6 else 180.0
+    min_lon = min(longitudes) - lon_pad
+    max_lon = max(longitudes) + lon_pad
+    if lon_pad >= 180.0 or min_lon < -180.0 or max_lon > 180.0:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def _stations_within(
+    codes: List[Tuple[str, str]],
+    coords: np.ndarray,
+    latitude: float,
+    longitude: float,
+    max_distance_km: float,
+) -> List[Tuple[str, str]]:
+    """Select station codes within a great-circle distance of a point."""
+    if not codes:
+        return []
+    distances = _haversine_km(latitude, longitude, coords[:, 0], coords[:, 1])
+    return [code for code, keep in zip(codes, distances <= max_distance_km) if keep]
+
+
+def _mseed_encoding(stream: Stream) -> Optional[str]:
+    """
+    Pick a MiniSEED encoding that stores every trace without loss.
+
+    Integer data compresses with STEIM2; float data keeps its precision
+    (FLOAT32 or FLOAT64). Returns None for mixed or unsupported dtypes so
+    ObsPy chooses per trace.
+    """
+    dtypes = {trace.data.dtype for trace in stream}
+    if len(dtypes) != 1:
+        return None
+
+    dtype = dtypes.pop()
+    if dtype == np.int32:
+        return "STEIM2"
+    if dtype == np.float32:
+        return "FLOAT32"
+    if dtype == np.float64:
+        return "FLOAT64"
+    return None
+
+
+def _write_mseed(stream: Stream, filepath: Path) -> None:
+    """Write a stream as MiniSEED with 4 KiB records through a buffered file."""
+    options = {"reclen": MSEED_RECORD_LENGTH}
+    encoding = _mseed_encoding(stream)
+    if encoding is not None:
+        options["encoding"] = encoding
+
+    with open(filepath, "wb", buffering=1 << 20) as f:
+        stream.write(f, format="MSEED", **options)
+
+
 def preprocess_waveform(
     stream: Stream,
     filter_type: str = "bandpass",
@@ -468,10 +1312,17 @@ def preprocess_waveform(
     freqmax: float = 50.0,
     detrend_type: str = "linear",
     taper_percentage: float = 0.05,
+    inplace: bool = False,
+    dtype: type = np.float32,
 ) -> Stream:
     """
     Apply basic preprocessing to waveform data.
 
+    Samples are processed in ``dtype``; single precision halves memory
+    traffic through the filters and is ample for seismic features.
+    Traces with NaN or infinite samples always go through ObsPy's per-trace
+    methods, so they fail or propagate exactly as with ObsPy alone.
+
     Args:
         stream: Input ObsPy Stream
         filter_type: Filter type ('bandpass', 'highpass', 'lowpass')
@@ -479,27 +1330,54 @@ def preprocess_waveform(
         freqmax: Maximum frequency for bandpass filter
         detrend_type: Detrending method ('linear', 'constant', 'polynomial')
         taper_percentage: Taper percentage (0.0 to 1.0)
+        inplace: Process the input stream directly instead of a copy
+        dtype: Floating-point dtype of the processed samples
 
     Returns:
         Preprocessed ObsPy Stream
     """
-    # Make a copy to avoid modifying original
-    processed_stream = stream.copy()
+    batched = detrend_type in BATCH_DETREND_TYPES
+
+    if inplace:
+        processed_stream = stream
+    else:
+        # New traces with their own stats; the batched path stacks samples
+        # into fresh arrays, so data is only copied for ObsPy's in-place ops
+        processed_stream = Stream(
+            [
+                Trace(
+                    data=trace.data if batched else np.array(trace.data, dtype=dtype),
+                    header=trace.stats.copy(),
+                )
+                for trace in stream
+            ]
+        )
 
     try:
-        # Remove mean and trend
-        processed_stream.detrend(type=detrend_type)
-
-        # Apply taper
-        processed_stream.taper(max_percentage=taper_percentage)
-
-        # Apply filter
-        if filter_type == "bandpass":
-            processed_stream.filter("bandpass", freqmin=freqmin, freqmax=freqmax)
-        elif filter_type == "highpass":
-            processed_stream.filter("highpass", freq=freqmin)
-        elif filter_type == "lowpass":
-            processed_stream.filter("lowpass", freq=freqmax)
+        if batched:
+            # Traces with NaN or infinite samples come back for ObsPy
+            unbatched = preprocess_batched(
+                processed_stream,
+                taper_percentage,
+                linear=detrend_type == "linear",
+                filter_type=filter_type,
+                freqmin=freqmin,
+                freqmax=freqmax,
+                dtype=dtype,
+            )
+        else:
+            unbatched = list(processed_stream)
+
+        if unbatched:
+            _preprocess_obspy(
+                Stream(unbatched),
+                filter_type,
+                freqmin,
+                freqmax,
+                detrend_type,
+                taper_percentage,
+                dtype,
+            )
 
         logger.info(
             f"Applied {filter_type} preprocessing to {len(processed_stream)} traces"
@@ -509,3 +1387,32 @@ def preprocess_waveform(
     except Exception as e:
         logger.error(f"Preprocessing failed: {e}")
         raise IRISDataError(f"Waveform preprocessing failed: {e}")
+
+
+def _preprocess_obspy(
+    stream: Stream,
+    filter_type: str,
+    freqmin: float,
+    freqmax: float,
+    detrend_type: str,
+    taper_percentage: float,
+    dtype: type,
+) -> None:
+    """Detrend, taper and filter a stream in place with ObsPy, trace by trace."""
+    # Remove mean and trend
+    stream.detrend(type=detrend_type)
+
+    # Apply taper
+    stream.taper(max_percentage=taper_percentage)
+
+    # Apply filter
+    if filter_type == "bandpass":
+        stream.filter("bandpass", freqmin=freqmin, freqmax=freqmax)
+    elif filter_type == "highpass":
+        stream.filter("highpass", freq=freqmin)
+    elif filter_type == "lowpass":
+        stream.filter("lowpass", freq=freqmax)
+
+    for trace in stream:
+        trace.data = trace.data.astype(dtype, copy=False)
+
@@ -4,22 +4,223 @@ This module provides a comprehensive client for interacting with the USGS
 Earthquake Hazards Program API with rate limiting, caching, and error handling.
 """
 
+import asyncio
+import hashlib
+import importlib.util
+import inspect
+import io
 import json
+import os
+import queue
+import tempfile
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlsplit
 
 import aiohttp
 import requests
 from asyncio_throttle import Throttler
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ..config.settings import Config
 from ..utils.logger import get_logger
 
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None  # type: ignore
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    from blake3 import blake3
+except ImportError:  # pragma: no cover
+    blake3 = None  # type: ignore
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
+
 logger = get_logger(__name__)
 
 
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    Stable cache key for a request, identical across processes.
+
+    Parameters are serialized canonically (sorted keys) and hashed with
+    BLAKE3 when available, otherwise BLAKE2b, to a 16-byte hex digest.
+    """
+    if orjson is not None:
+        canonical = orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+    else:
+        canonical = json.dumps(params, sort_keys=True, separators=(",", ":")).encode()
+
+    if blake3 is not None:
+        digest = blake3(canonical).hexdigest(16)
+    else:
+        digest = hashlib.blake2b(canonical, digest_size=16).hexdigest()
+    return f"{endpoint.strip('/').replace('/', '_')}_{digest}"
+
+
+def _cache_suffix() -> str:
+    """File suffix for cached response bodies, ``.zst`` when compressed."""
+    return ".body" + (".zst" if zstandard is not None else "")
+
+
+def _encode_cache(body: bytes) -> bytes:
+    """Encode a raw response body for the disk cache (zstd if available)."""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return body
+
+
+def _decode_cache(raw: bytes) -> bytes:
+    """Recover the response body written by :func:`_encode_cache`."""
+    if zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(raw)
+    return raw
+
+
+def _http2_available() -> bool:
+    """Whether httpx and its optional h2 backend are installed."""
+    return httpx is not None and importlib.util.find_spec("h2") is not None
+
+
+def _iso(ts: float) -> str:
+    """Format a Unix timestamp as the UTC ``YYYY-MM-DDTHH:MM:SS`` USGS expects."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ts))
+
+
+def _header_seconds(headers: Any, name: str) -> Optional[float]:
+    """Parse a delay header given either in seconds or as an HTTP date."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _time_param(value: Union[str, datetime]) -> Optional[str]:
+    """Render a time bound as ISO 8601, treating empty strings as unset."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value or None
+
+
+# (API parameter, _event_params argument, converter or None), in query order
+_PARAM_SPEC = (
+    ("format", "format_type", None),
+    ("orderby", "order_by", None),
+    ("limit", "limit", None),
+    ("starttime", "start_time", _time_param),
+    ("endtime", "end_time", _time_param),
+    ("minmagnitude", "min_magnitude", None),
+    ("maxmagnitude", "max_magnitude", None),
+    ("mindepth", "min_depth", None),
+    ("maxdepth", "max_depth", None),
+    ("latitude", "latitude", None),
+    ("longitude", "longitude", None),
+    ("maxradiuskm", "max_radius_km", None),
+)
+
+
+def _event_params(
+    start_time: Optional[Union[str, datetime]] = None,
+    end_time: Optional[Union[str, datetime]] = None,
+    min_magnitude: Optional[float] = None,
+    max_magnitude: Optional[float] = None,
+    min_depth: Optional[float] = None,
+    max_depth: Optional[float] = None,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    max_radius_km: Optional[float] = None,
+    limit: int = 20000,
+    order_by: str = "time",
+    format_type: str = "geojson",
+) -> Dict[str, Any]:
+    """
+    Build event query parameters; see :meth:`USGSClient.get_events`.
+
+    Raises:
+        ValueError: For invalid parameter combinations
+    """
+    args = locals()
+
+    # A radius alone is meaningless; lat/lon must come as a pair
+    if (latitude is None or longitude is None) and any(
+        x is not None for x in (latitude, longitude, max_radius_km)
+    ):
+        raise ValueError(
+            "Geographic search requires latitude, longitude, and optionally max_radius_km"
+        )
+
+    # Walk the static spec once, dropping unset values
+    params = {}
+    for api_key, arg_key, convert in _PARAM_SPEC:
+        value = args[arg_key]
+        if value is not None and convert is not None:
+            value = convert(value)
+        if value is not None:
+            params[api_key] = value
+    return params
+
+
+_EVENT_PARAM_NAMES = frozenset(inspect.signature(_event_params).parameters)
+
+
+def _read_event_table(text: str) -> "pd.DataFrame":
+    """Parse a USGS CSV event listing, using the pyarrow engine if available."""
+    import pandas as pd
+
+    engine = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+    return pd.read_csv(io.BytesIO(text.encode("utf-8")), engine=engine)
+
+
 class USGSAPIError(Exception):
     """Base exception for USGS API related errors."""
 
@@ -38,7 +239,325 @@ class USGSDataError(USGSAPIError):
     pass
 
 
-class USGSClient:
+def _parse_body(body: bytes, csv: bool = False) -> Dict[str, Any]:
+    """
+    Parse a response body into the structure the clients return.
+
+    Args:
+        body: Raw response body
+        csv: Whether the body is a CSV listing rather than JSON
+
+    Returns:
+        Parsed JSON object, or ``{"csv": text}`` for CSV bodies
+
+    Raises:
+        USGSDataError: If a JSON body is malformed or not an object
+    """
+    if csv:
+        return {"csv": body.decode("utf-8")}
+
+    try:
+        data = _json_loads(body)
+    except ValueError as e:
+        raise USGSDataError(f"Invalid JSON response: {e}")
+
+    if not isinstance(data, dict):
+        raise USGSDataError("Response is not a valid JSON object")
+    return data
+
+
+class _BucketState:
+    """Token-bucket state shared by every sync client of one host."""
+
+    __slots__ = ("tokens", "last_refill", "lock", "server_rate_limit", "server_burst")
+
+    def __init__(self, tokens: float) -> None:
+        self.tokens = tokens
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+        # Tighter limits advertised by the server's RateLimit-* headers
+        self.server_rate_limit = 0.0
+        self.server_burst: Optional[int] = None
+
+
+_BUCKETS: Dict[str, _BucketState] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def _shared_bucket(url: str, burst: int) -> _BucketState:
+    """Get the process-wide token bucket for the host serving ``url``."""
+    host = urlsplit(url).netloc
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(host)
+        if bucket is None:
+            bucket = _BUCKETS[host] = _BucketState(float(burst))
+        return bucket
+
+
+class _Flight:
+    """Outcome of a request shared by threads asking for the same query."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class _CacheMixin:
+    """
+    Response caching shared by the sync and async USGS clients.
+
+    A bounded in-process LRU sits in front of an on-disk cache; both expire
+    entries after ``cache_duration``. Keys come from :func:`_cache_key`, so
+    both clients hit the same entries for the same query. The disk holds
+    raw response bodies, so nothing is re-serialized. Disk writes are
+    queued to a background thread; :meth:`flush_cache` (or closing the
+    client) waits for them to land.
+    """
+
+    def _init_cache(self, config: Config) -> None:
+        """Set up the memory and disk caches under ``config.cache_dir``."""
+        self.cache_dir = config.cache_dir / "usgs"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_duration = timedelta(minutes=5)  # Cache for 5 minutes
+        self.cache_max_age = timedelta(days=30)  # delete files untouched this long
+        self.cache_gc_interval = timedelta(days=1)  # between sweeps for old files
+        self.cache_suffix = _cache_suffix()
+        self._shards: Set[str] = set()  # shard directories known to exist
+
+        # In-process LRU in front of the disk cache: key -> (monotonic ts, data)
+        self._mem_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._mem_lock = threading.Lock()
+        self.max_mem_entries = 128
+
+        # Disk writes happen on a background thread that exits when idle
+        self._write_queue: "queue.Queue[Tuple[str, bytes, Optional[bytes]]]" = (
+            queue.Queue()
+        )
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._writer_idle_timeout = 1.0
+
+        self._collect_garbage()
+
+    def _shard_dir(self, cache_key: str) -> Path:
+        """Get (creating once) the subdirectory a cache key is sharded into."""
+        shard = cache_key[-2:]
+        path = self.cache_dir / shard
+        if shard not in self._shards:
+            path.mkdir(exist_ok=True)
+            self._shards.add(shard)
+        return path
+
+    def _get_cache_path(self, cache_key: str) -> Path:
+        """Get cache file path for a given cache key."""
+        return self._shard_dir(cache_key) / f"{cache_key}{self.cache_suffix}"
+
+    def _collect_garbage(self) -> None:
+        """
+        Delete cache files not modified within ``cache_max_age``.
+
+        Walking the cache stats every file, so the sweep runs at most once per
+        ``cache_gc_interval``; the mtime of a marker file in the cache
+        directory records the last one, across clients and processes.
+        """
+        marker = self.cache_dir / "last_gc"
+        now = time.time()
+        try:
+            if now - marker.stat().st_mtime < self.cache_gc_interval.total_seconds():
+                return
+        except OSError:
+            pass  # never swept
+        # Touch the marker first so concurrent clients skip this sweep
+        try:
+            marker.touch()
+        except OSError:
+            return
+
+        cutoff = now - self.cache_max_age.total_seconds()
+        removed = 0
+        for path in self.cache_dir.rglob("*"):
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info(f"Removed {removed} expired USGS cache files")
+
+    def _is_cache_valid(self, cache_path: Path) -> bool:
+        """Check if cached data is still valid."""
+        if not cache_path.exists():
+            return False
+
+        file_time = datetime.fromtimestamp(cache_path.stat().st_mtime)
+        return datetime.now() - file_time < self.cache_duration
+
+    def _get_from_memory(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh in-memory entry, dropping it if it has expired."""
+        with self._mem_lock:
+            entry = self._mem_cache.get(cache_key)
+            if entry is None:
+                return None
+
+            stored_at, data = entry
+            if time.monotonic() - stored_at >= self.cache_duration.total_seconds():
+                del self._mem_cache[cache_key]
+                return None
+
+            self._mem_cache.move_to_end(cache_key)
+            return data
+
+    def _store_in_memory(
+        self, cache_key: str, data: Dict[str, Any], age: float = 0.0
+    ) -> None:
+        """Remember data in the in-memory LRU, evicting the oldest entries."""
+        with self._mem_lock:
+            self._mem_cache[cache_key] = (time.monotonic() - age, data)
+            self._mem_cache.move_to_end(cache_key)
+            while len(self._mem_cache) > self.max_mem_entries:
+                self._mem_cache.popitem(last=False)
+
+    def _get_meta_path(self, cache_key: str) -> Path:
+        """Get the sidecar path holding a cache entry's HTTP validators."""
+        return self._shard_dir(cache_key) / f"{cache_key}.meta.json"
+
+    def _conditional_headers(self, cache_key: str) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers for a cached entry."""
+        if not self._get_cache_path(cache_key).exists():
+            return {}
+        try:
+            meta = _json_loads(self._get_meta_path(cache_key).read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def _revalidate_cache(
+        self, cache_key: str, csv: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Mark a stale entry fresh again after a 304 and load it."""
+        try:
+            os.utime(self._get_cache_path(cache_key))
+        except OSError:
+            return None
+        return self._load_from_cache(cache_key, csv)
+
+    def _save_to_cache(
+        self, cache_key: str, body: bytes, headers: Optional[Any] = None
+    ) -> None:
+        """
+        Queue a raw response body for writing to the disk cache.
+
+        Args:
+            cache_key: Cache key of the request
+            body: Raw response body
+            headers: Response headers; ETag/Last-Modified are kept alongside
+                the body for conditional revalidation
+        """
+        try:
+            payload = _encode_cache(body)
+        except Exception as e:
+            logger.warning(f"Failed to encode cache {cache_key}: {e}")
+            return
+
+        meta = None
+        if headers is not None:
+            validators = {
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+            }
+            if any(validators.values()):
+                meta = json.dumps(validators).encode()
+
+        with self._writer_lock:
+            self._write_queue.put((cache_key, payload, meta))
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="usgs-cache-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _writer_loop(self) -> None:
+        """Drain the write queue, exiting once it has been idle for a while."""
+        while True:
+            try:
+                cache_key, payload, meta = self._write_queue.get(
+                    timeout=self._writer_idle_timeout
+                )
+            except queue.Empty:
+                with self._writer_lock:
+                    if self._write_queue.empty():
+                        self._writer = None
+                        return
+                continue
+
+            try:
+                # Validators must never describe a body other than the cached one
+                meta_path = self._get_meta_path(cache_key)
+                if self._write_cache_file(self._get_cache_path(cache_key), payload):
+                    if meta is not None:
+                        self._write_cache_file(meta_path, meta)
+                    elif meta_path.exists():
+                        meta_path.unlink()
+            except OSError as e:
+                logger.warning(f"Failed to update cache metadata {cache_key}: {e}")
+            finally:
+                self._write_queue.task_done()
+
+    def _write_cache_file(self, cache_path: Path, payload: bytes) -> bool:
+        """Write a cache file, atomically replacing any previous one."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            logger.debug(f"Saved cache file: {cache_path.name}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save cache file {cache_path.name}: {e}")
+            return False
+
+    def flush_cache(self) -> None:
+        """Block until all queued cache writes have reached disk."""
+        self._write_queue.join()
+
+    def _load_from_cache(
+        self, cache_key: str, csv: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Load and parse a cached response body if valid."""
+        cache_path = self._get_cache_path(cache_key)
+
+        if not self._is_cache_valid(cache_path):
+            return None
+
+        try:
+            data = _parse_body(_decode_cache(cache_path.read_bytes()), csv)
+            logger.debug(f"Loaded data from cache: {cache_key}")
+            # Keep the entry's remaining lifetime in sync with the file's age
+            age = max(0.0, time.time() - cache_path.stat().st_mtime)
+            self._store_in_memory(cache_key, data, age)
+            return data
+        except Exception as e:
+            logger.warning(f"Failed to load cache {cache_key}: {e}")
+            return None
+
+
+class USGSClient(_CacheMixin):
     """
     USGS Earthquake API Client with rate limiting and caching.
 
@@ -56,159 +575,240 @@ class USGSClient:
         """
         self.config = config or Config()
         self.base_url = self.config.api.usgs_base_url
+        self._base = self.base_url.rstrip("/") + "/"
         self.timeout = self.config.api.timeout
         self.max_retries = self.config.api.max_retries
 
         # Rate limiting (USGS allows ~600 requests per 10 minutes)
-        self.rate_limit = 1.0  # 1 request per second
-        self.last_request_time = 0.0
+        self.rate_limit = 1.0  # 1 request per second sustained
+        self.burst = 5  # requests allowed back-to-back after idling
+        # Shared by all clients of this host, so several instances cannot
+        # multiply the request rate
+        self._bucket = _shared_bucket(self.base_url, self.burst)
 
         # Caching
-        self.cache_dir = self.config.cache_dir / "usgs"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_duration = timedelta(minutes=5)  # Cache for 5 minutes
+        self._init_cache(self.config)
 
-        # Session for connection pooling
+        # In-flight requests by cache key, shared by threads asking concurrently
+        self._inflight: Dict[str, _Flight] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Session for connection pooling; transient failures (including 429
+        # and 503 with Retry-After) are retried inside urllib3
         self.session = requests.Session()
         self.session.headers.update(
             {"User-Agent": "seismic-classifier/1.0.0 (Research/Educational)"}
         )
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
         logger.info(f"Initialized USGS client with base URL: {self.base_url}")
 
     def _enforce_rate_limit(self) -> None:
-        """Enforce rate limiting between API calls."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """
+        Enforce rate limiting between API calls with a token bucket.
 
-        if time_since_last < self.rate_limit:
-            sleep_time = self.rate_limit - time_since_last
+        Tokens refill at one per ``rate_limit`` seconds up to ``burst``, so
+        short bursts after an idle period go out without waiting. A caller
+        that finds the bucket empty takes a token on credit and sleeps off
+        the debt outside the lock.
+        """
+        if self.rate_limit <= 0:
+            return
+
+        bucket = self._bucket
+        with bucket.lock:
+            refill_rate = 1.0 / max(self.rate_limit, bucket.server_rate_limit)
+            burst = min(self.burst, bucket.server_burst or self.burst)
+            now = time.monotonic()
+            bucket.tokens = min(
+                float(burst),
+                bucket.tokens + (now - bucket.last_refill) * refill_rate,
+            )
+            bucket.last_refill = now
+            bucket.tokens -= 1.0
+            sleep_time = -bucket.tokens / refill_rate if bucket.tokens < 0 else 0.0
+
+        if sleep_time > 0:
             logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
             time.sleep(sleep_time)
 
-        self.last_request_time = time.time()
-
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get cache file path for a given cache key."""
-        return self.cache_dir / f"{cache_key}.json"
+    def _update_rate_limit(self, headers: Any) -> None:
+        """
+        Adapt the token bucket to rate-limit headers sent by the server.
 
-    def _is_cache_valid(self, cache_path: Path) -> bool:
-        """Check if cached data is still valid."""
-        if not cache_path.exists():
-            return False
+        ``RateLimit-Remaining``/``RateLimit-Reset`` spread the remaining quota
+        over the reset window and cap the burst at that quota; the limits relax
+        again as the server reports more headroom. A ``Retry-After`` left on
+        the final response (or an exhausted quota) empties the bucket so the
+        next request waits out the indicated delay.
 
-        file_time = datetime.fromtimestamp(cache_path.stat().st_mtime)
-        return datetime.now() - file_time < self.cache_duration
+        Args:
+            headers: Response headers
+        """
+        if self.rate_limit <= 0:
+            return
 
-    def _save_to_cache(self, cache_key: str, data: Dict[str, Any]) -> None:
-        """Save data to cache."""
-        cache_path = self._get_cache_path(cache_key)
+        retry_after = _header_seconds(headers, "Retry-After")
+        reset = _header_seconds(headers, "RateLimit-Reset")
         try:
-            with open(cache_path, "w") as f:
-                json.dump(data, f, indent=2)
-            logger.debug(f"Saved data to cache: {cache_key}")
-        except Exception as e:
-            logger.warning(f"Failed to save cache {cache_key}: {e}")
-
-    def _load_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Load data from cache if valid."""
-        cache_path = self._get_cache_path(cache_key)
+            remaining: Optional[int] = int(headers["RateLimit-Remaining"])
+        except (KeyError, TypeError, ValueError):
+            remaining = None
+
+        bucket = self._bucket
+        with bucket.lock:
+            if remaining is not None and reset is not None:
+                bucket.server_rate_limit = reset / max(remaining, 1)
+                bucket.server_burst = max(remaining, 1)
+                if remaining <= 0 and retry_after is None:
+                    retry_after = reset
+
+            if retry_after is not None:
+                interval = max(self.rate_limit, bucket.server_rate_limit)
+                bucket.tokens = min(bucket.tokens, 1.0 - retry_after / interval)
+                bucket.last_refill = time.monotonic()
+                logger.warning(f"Server requested a {retry_after:.1f}s back-off")
+
+    def _send(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """Issue one rate-limited GET, translating transport failures."""
+        # Enforce rate limiting
+        self._enforce_rate_limit()
 
-        if not self._is_cache_valid(cache_path):
-            return None
+        logger.debug(f"Making request to {url}")
 
         try:
-            with open(cache_path, "r") as f:
-                data = json.load(f)
-            logger.debug(f"Loaded data from cache: {cache_key}")
-            return data
-        except Exception as e:
-            logger.warning(f"Failed to load cache {cache_key}: {e}")
-            return None
+            response = self.session.get(
+                url, params=params, headers=headers, timeout=self.timeout, stream=stream
+            )
+        except requests.exceptions.Timeout:
+            raise USGSAPIError(f"Request timeout after {self.timeout}s")
+        except requests.exceptions.ConnectionError:
+            raise USGSAPIError("Connection error")
+        except requests.exceptions.RequestException as e:
+            raise USGSAPIError(f"Unexpected error: {e}")
+
+        self._update_rate_limit(response.headers)
+        return response
+
+    @staticmethod
+    def _check_status(response: requests.Response) -> None:
+        """Raise the client error matching a failed response's status."""
+        # Check for rate limiting (still limited after all retries)
+        if response.status_code == 429:
+            raise USGSRateLimitError("API rate limit exceeded")
+
+        # Check for other HTTP errors
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            raise USGSAPIError(f"HTTP error: {e}")
 
     def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Make HTTP request to USGS API with error handling and retries.
+        Make HTTP request to USGS API with error handling.
+
+        Retries are handled by the session's urllib3 retry policy; this
+        method only translates the final outcome into client errors. Stale
+        cache entries with an ETag or Last-Modified are revalidated with a
+        conditional request, so an unchanged result costs only a 304.
+        Concurrent calls for the same query from several threads share a
+        single request.
 
         Args:
             endpoint: API endpoint path
             params: Query parameters
 
         Returns:
-            API response data
+            API response data (shared with the in-memory cache; do not mutate).
+            CSV responses are returned as ``{"csv": text}``.
 
         Raises:
             USGSAPIError: For API-related errors
             USGSRateLimitError: For rate limit violations
             USGSDataError: For invalid response data
         """
-        url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+        url = self._base + endpoint.lstrip("/")
 
         # Generate cache key
-        cache_key = f"{endpoint}_{hash(str(sorted(params.items())))}"
+        cache_key = _cache_key(endpoint, params)
+        csv = params.get("format") == "csv"
 
-        # Try cache first
-        cached_data = self._load_from_cache(cache_key)
+        # Try the in-memory cache, then the disk cache
+        cached_data = self._get_from_memory(cache_key)
+        if cached_data is None:
+            cached_data = self._load_from_cache(cache_key, csv)
         if cached_data:
             return cached_data
 
-        # Enforce rate limiting
-        self._enforce_rate_limit()
+        # Threads asking for the same query wait for one shared request
+        with self._inflight_lock:
+            flight = self._inflight.get(cache_key)
+            is_leader = flight is None
+            if flight is None:
+                flight = self._inflight[cache_key] = _Flight()
 
-        # Make request with retries
-        last_exception = None
-        for attempt in range(self.max_retries + 1):
-            try:
-                logger.debug(f"Making request to {url} (attempt {attempt + 1})")
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
 
-                response = self.session.get(url, params=params, timeout=self.timeout)
+        try:
+            flight.result = self._fetch(url, endpoint, params, cache_key, csv)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+            flight.done.set()
+
+    def _fetch(
+        self,
+        url: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        cache_key: str,
+        csv: bool,
+    ) -> Dict[str, Any]:
+        """Fetch, validate and cache a query the caches could not serve."""
+        # A stale entry with validators costs only a 304 if unchanged
+        response = self._send(url, params, self._conditional_headers(cache_key))
+        if response.status_code == 304:
+            cached_data = self._revalidate_cache(cache_key, csv)
+            if cached_data is not None:
+                logger.debug(f"Revalidated cached data: {cache_key}")
+                return cached_data
+            response = self._send(url, params)
 
-                # Check for rate limiting
-                if response.status_code == 429:
-                    raise USGSRateLimitError("API rate limit exceeded")
+        self._check_status(response)
 
-                # Check for other HTTP errors
-                response.raise_for_status()
+        # Parse and validate once; the disk cache keeps the body verbatim
+        data = _parse_body(response.content, csv)
 
-                # Parse JSON response
-                try:
-                    data = response.json()
-                except json.JSONDecodeError as e:
-                    raise USGSDataError(f"Invalid JSON response: {e}")
-
-                # Validate response structure
-                if not isinstance(data, dict):
-                    raise USGSDataError("Response is not a valid JSON object")
-
-                # Cache successful response
-                self._save_to_cache(cache_key, data)
-
-                logger.info(f"Successfully fetched data from {endpoint}")
-                return data
-
-            except requests.exceptions.Timeout:
-                last_exception = USGSAPIError(f"Request timeout after {self.timeout}s")
-            except requests.exceptions.ConnectionError:
-                last_exception = USGSAPIError("Connection error")
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:
-                    last_exception = USGSRateLimitError("Rate limit exceeded")
-                else:
-                    last_exception = USGSAPIError(f"HTTP error: {e}")
-            except (USGSRateLimitError, USGSDataError):
-                raise  # Don't retry these
-            except Exception as e:
-                last_exception = USGSAPIError(f"Unexpected error: {e}")
-
-            if attempt < self.max_retries:
-                wait_time = 2**attempt  # Exponential backoff
-                logger.warning(
-                    f"Request failed, retrying in {wait_time}s: {last_exception}"
-                )
-                time.sleep(wait_time)
+        # Cache successful response
+        self._store_in_memory(cache_key, data)
+        self._save_to_cache(cache_key, response.content, response.headers)
 
-        # All retries failed
-        raise last_exception
+        logger.info(f"Successfully fetched data from {endpoint}")
+        return data
 
     def get_events(
         self,
@@ -224,10 +824,17 @@ class USGSClient:
         limit: int = 20000,
         order_by: str = "time",
         format_type: str = "geojson",
-    ) -> Dict[str, Any]:
+        tabular: bool = False,
+    ) -> Union[Dict[str, Any], "pd.DataFrame"]:
         """
         Fetch earthquake events from USGS API.
 
+        With ``tabular=True`` events are requested as CSV, which is several
+        times smaller than GeoJSON for bulk pulls, and parsed into a
+        DataFrame (with the pyarrow CSV engine when installed). Only the
+        flat CSV columns are available in that mode, not GeoJSON
+        ``features``.
+
         Args:
             start_time: Start time for search (ISO format or datetime)
             end_time: End time for search (ISO format or datetime)
@@ -241,57 +848,84 @@ class USGSClient:
             limit: Maximum number of events to return
             order_by: Order results by 'time', 'magnitude', etc.
             format_type: Response format ('geojson', 'csv', 'xml')
+            tabular: Fetch CSV and return a DataFrame; overrides format_type
 
         Returns:
-            Dictionary containing earthquake event data
+            Dictionary containing earthquake event data, or a DataFrame with
+            one row per event if ``tabular`` is True
 
         Raises:
             USGSAPIError: For API-related errors
             ValueError: For invalid parameter combinations
         """
-        # Build query parameters
-        params = {"format": format_type, "orderby": order_by, "limit": limit}
-
-        # Time parameters
-        if start_time:
-            if isinstance(start_time, datetime):
-                start_time = start_time.isoformat()
-            params["starttime"] = start_time
-
-        if end_time:
-            if isinstance(end_time, datetime):
-                end_time = end_time.isoformat()
-            params["endtime"] = end_time
-
-        # Magnitude parameters
-        if min_magnitude is not None:
-            params["minmagnitude"] = min_magnitude
-        if max_magnitude is not None:
-            params["maxmagnitude"] = max_magnitude
-
-        # Depth parameters
-        if min_depth is not None:
-            params["mindepth"] = min_depth
-        if max_depth is not None:
-            params["maxdepth"] = max_depth
-
-        # Geographic parameters
-        if latitude is not None and longitude is not None:
-            params["latitude"] = latitude
-            params["longitude"] = longitude
-            if max_radius_km is not None:
-                params["maxradiuskm"] = max_radius_km
-        elif any(x is not None for x in [latitude, longitude, max_radius_km]):
-            raise ValueError(
-                "Geographic search requires latitude, longitude, and optionally max_radius_km"
-            )
+        if tabular:
+            format_type = "csv"
 
-        # Remove None values
-        params = {k: v for k, v in params.items() if v is not None}
+        params = _event_params(
+            start_time=start_time,
+            end_time=end_time,
+            min_magnitude=min_magnitude,
+            max_magnitude=max_magnitude,
+            min_depth=min_depth,
+            max_depth=max_depth,
+            latitude=latitude,
+            longitude=longitude,
+            max_radius_km=max_radius_km,
+            limit=limit,
+            order_by=order_by,
+            format_type=format_type,
+        )
 
         logger.info(f"Fetching events with parameters: {params}")
 
-        return self._make_request("query", params)
+        data = self._make_request("query", params)
+        if tabular:
+            return _read_event_table(data["csv"])
+        return data
+
+    def iter_events(self, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Yield GeoJSON event features one at a time.
+
+        With ijson installed, the response is streamed and parsed
+        incrementally, so a bulk pull is never held in memory at once and
+        processing starts before the download finishes. Streamed responses
+        are not cached, but a query that is already cached is served from
+        the cache. Without ijson this falls back to :meth:`get_events`.
+
+        Args:
+            **kwargs: Same parameters as get_events(), except format_type
+                and tabular
+
+        Yields:
+            GeoJSON feature dictionaries
+
+        Raises:
+            USGSAPIError: For API-related errors
+            USGSDataError: For malformed response data
+        """
+        if ijson is None:
+            yield from self.get_events(**kwargs).get("features", [])
+            return
+
+        params = _event_params(**kwargs)
+        cache_key = _cache_key("query", params)
+        cached_data = self._get_from_memory(cache_key)
+        if cached_data is None:
+            cached_data = self._load_from_cache(cache_key)
+        if cached_data:
+            yield from cached_data.get("features", [])
+            return
+
+        response = self._send(self._base + "query", params, stream=True)
+        try:
+            self._check_status(response)
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, "features.item", use_float=True)
+        except ijson.JSONError as e:
+            raise USGSDataError(f"Invalid JSON response: {e}")
+        finally:
+            response.close()
 
     def get_recent_events(
         self, hours: int = 24, min_magnitude: float = 2.5
@@ -306,8 +940,9 @@ class USGSClient:
         Returns:
             Dictionary containing recent earthquake events
         """
-        end_time = datetime.utcnow()
-        start_time = end_time - timedelta(hours=hours)
+        now = time.time()
+        start_time = _iso(now - hours * 3600)
+        end_time = _iso(now)
 
         return self.get_events(
             start_time=start_time,
@@ -329,8 +964,9 @@ class USGSClient:
         Returns:
             Dictionary containing significant earthquake events
         """
-        end_time = datetime.utcnow()
-        start_time = end_time - timedelta(days=days)
+        now = time.time()
+        start_time = _iso(now - days * 86400)
+        end_time = _iso(now)
 
         return self.get_events(
             start_time=start_time,
@@ -340,7 +976,8 @@ class USGSClient:
         )
 
     def close(self) -> None:
-        """Close the HTTP session."""
+        """Flush pending cache writes and close the HTTP session."""
+        self.flush_cache()
         self.session.close()
         logger.info("USGS client session closed")
 
@@ -353,48 +990,90 @@ class USGSClient:
         self.close()
 
 
-class AsyncUSGSClient:
+class AsyncUSGSClient(_CacheMixin):
     """
     Async version of USGS API client for high-performance applications.
+
+    When httpx is installed with HTTP/2 support, requests go through an
+    ``httpx.AsyncClient`` that multiplexes concurrent queries over a single
+    connection; otherwise a pooled aiohttp session is used.
     """
 
+    _shared_throttler = Throttler(rate_limit=1, period=1)  # 1 req/sec
+
     def __init__(self, config: Optional[Config] = None):
         """Initialize async USGS client."""
         self.config = config or Config()
         self.base_url = self.config.api.usgs_base_url
+        self._query_url = self.base_url.rstrip("/") + "/query"
         self.timeout = self.config.api.timeout
         self.max_retries = self.config.api.max_retries
 
-        # Rate limiting
-        self.throttler = Throttler(rate_limit=1, period=1)  # 1 req/sec
+        # Rate limiting, shared by every instance so they cannot multiply it
+        self.throttler = AsyncUSGSClient._shared_throttler
 
-        # Caching
-        self.cache_dir = self.config.cache_dir / "usgs"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_duration = timedelta(minutes=5)
+        # Caching (shared with USGSClient)
+        self._init_cache(self.config)
 
-        self.session: Optional[aiohttp.ClientSession] = None
+        # Connection pooling and in-flight request bound for fan-out queries
+        self.max_connections = 256
+        self.max_connections_per_host = 64
+        self.max_concurrency = 64
+        self.http2 = _http2_available()
+
+        self.session: Optional[Union[aiohttp.ClientSession, "httpx.AsyncClient"]] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # In-flight queries by cache key, so duplicates share one request
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
 
         logger.info("Initialized async USGS client")
 
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout),
-            headers={"User-Agent": "seismic-classifier/1.0.0 (Research/Educational)"},
-        )
+        headers = {"User-Agent": "seismic-classifier/1.0.0 (Research/Educational)"}
+        if self.http2:
+            self.session = httpx.AsyncClient(
+                http2=True,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections_per_host,
+                    keepalive_expiry=75,
+                ),
+                headers=headers,
+            )
+        else:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=headers,
+            )
+        # Created here so it binds to the running event loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
+        if self.http2 and self.session:
+            await self.session.aclose()
+        elif self.session:
             await self.session.close()
+        await asyncio.get_running_loop().run_in_executor(None, self.flush_cache)
         logger.info("Async USGS client session closed")
 
     async def get_events_async(self, **kwargs) -> Dict[str, Any]:
         """
         Async version of get_events.
 
+        Concurrent calls with identical parameters share a single request.
+
         Args:
             **kwargs: Same parameters as USGSClient.get_events()
 
@@ -406,37 +1085,91 @@ class AsyncUSGSClient:
 
         # Build parameters (same logic as sync version)
         params = self._build_params(**kwargs)
+        cache_key = _cache_key("query", params)
 
-        # Rate limiting
-        async with self.throttler:
-            # Make async request
-            url = f"{self.base_url.rstrip('/')}/query"
+        cached_data = self._get_from_memory(cache_key)
+        if cached_data is not None:
+            return cached_data
 
-            try:
-                async with self.session.get(url, params=params) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_events(params, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+
+        # Shield the shared request from cancellation of any single caller
+        return await asyncio.shield(task)
+
+    async def get_events_many_async(
+        self, param_list: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Fetch several event queries concurrently.
+
+        Requests are dispatched together and paced only by the throttler and
+        the connection pool; duplicate queries collapse into one request.
+
+        Args:
+            param_list: Keyword arguments for each get_events_async() call
 
-                    logger.info(
-                        f"Successfully fetched {len(data.get('features', []))} events"
-                    )
-                    return data
+        Returns:
+            Results in the order of ``param_list``; failed queries yield the
+            raised exception instead of a result
+        """
+        return await asyncio.gather(
+            *(self.get_events_async(**params) for params in param_list),
+            return_exceptions=True,
+        )
 
-            except aiohttp.ClientError as e:
+    async def _fetch_events(
+        self, params: Dict[str, Any], cache_key: str
+    ) -> Dict[str, Any]:
+        """Serve an event query from the disk cache or one rate-limited request."""
+        # Disk I/O runs in the default executor to keep the event loop free
+        loop = asyncio.get_running_loop()
+        csv = params.get("format") == "csv"
+        cached_data = await loop.run_in_executor(
+            None, self._load_from_cache, cache_key, csv
+        )
+        if cached_data:
+            return cached_data
+
+        # Bound in-flight requests, then rate limit
+        async with self._semaphore, self.throttler:
+            body, headers = await self._get(params)
+
+        data = _parse_body(body, csv)
+        logger.info(f"Successfully fetched {len(data.get('features', []))} events")
+
+        self._store_in_memory(cache_key, data)
+        self._save_to_cache(cache_key, body, headers)
+        return data
+
+    async def _get(self, params: Dict[str, Any]) -> Tuple[bytes, Any]:
+        """Fetch a query's body and headers with whichever transport is open."""
+        if self.http2:
+            try:
+                response = await self.session.get(self._query_url, params=params)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
                 raise USGSAPIError(f"Async request failed: {e}")
+            return response.content, response.headers
+
+        try:
+            async with self.session.get(self._query_url, params=params) as response:
+                response.raise_for_status()
+                return await response.read(), response.headers
+        except aiohttp.ClientError as e:
+            raise USGSAPIError(f"Async request failed: {e}")
 
     def _build_params(self, **kwargs) -> Dict[str, Any]:
-        """Build query parameters from keyword arguments."""
-        # Implementation similar to sync version
-        params = {
-            "format": kwargs.get("format_type", "geojson"),
-            "orderby": kwargs.get("order_by", "time"),
-            "limit": kwargs.get("limit", 20000),
-        }
-
-        # Add other parameters as needed
-        for key, value in kwargs.items():
-            if value is not None and key not in ["format_type", "order_by", "limit"]:
-                params[key] = value
-
-        return {k: v for k, v in params.items() if v is not None}
+        """
+        Build query parameters exactly as USGSClient.get_events() does.
+
+        Keyword arguments get_events() does not accept are passed through as
+        raw USGS query parameters.
+        """
+        known = {k: kwargs.pop(k) for k in list(kwargs) if k in _EVENT_PARAM_NAMES}
+        params = _event_params(**known)
+        params.update((k, v) for k, v in kwargs.items() if v is not None)
+        return params
@@ -4,19 +4,54 @@ This module provides comprehensive validation and quality control for
 seismic data from USGS and IRIS sources.
 """
 
+import hashlib
 import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
 
 import numpy as np
+import pandas as pd
 from obspy import Stream, Trace
 
 from ..config.settings import Config
 from ..utils.logger import get_logger
+from ..utils.quality_kernels import trace_stats, warm_up
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover
+    xxhash = None  # type: ignore
 
 logger = get_logger(__name__)
 
+# Station codes: ASCII letters/digits with optional wildcards, and at least
+# one letter or digit. Applied after strip().upper(); length is checked first.
+_STATION_CODE_RE = re.compile(r"\A[A-Z0-9*?]*[A-Z0-9][A-Z0-9*?]*\Z")
+
 
 class ValidationError(Exception):
     """Base exception for data validation errors."""
@@ -36,6 +71,258 @@ class DataFormatError(ValidationError):
     pass
 
 
+# Clock skew allowed before a USGS event time counts as in the future
+_FUTURE_TOLERANCE_MS = 60_000
+
+
+def _future_cutoff_ms() -> int:
+    """Return the latest event time (epoch milliseconds) not in the future."""
+    return int(time.time() * 1000) + _FUTURE_TOLERANCE_MS
+
+
+# Bounds of _validate_usgs_event for (longitude, latitude, depth, magnitude)
+_EVENT_LOW = np.array([-180.0, -90.0, -10.0, -2.0])
+_EVENT_HIGH = np.array([180.0, 90.0, 1000.0, 10.0])
+
+
+def _usgs_invalid_mask(
+    features: List[Any], cutoff_ms: Optional[int] = None
+) -> Optional[np.ndarray]:
+    """
+    Flag USGS features failing the range checks of ``_validate_usgs_event``.
+
+    Coordinates, magnitudes and times are gathered into arrays in one pass
+    and checked with vectorized comparisons.
+
+    Args:
+        features: GeoJSON features from a USGS response
+        cutoff_ms: Latest valid event time in epoch milliseconds; defaults
+            to now plus the clock-skew tolerance
+
+    Returns:
+        Boolean mask of invalid features, or None if the batch is irregular
+        (missing keys, short or non-numeric fields) and must be checked
+        event by event
+    """
+    if cutoff_ms is None:
+        cutoff_ms = _future_cutoff_ms()
+    n = len(features)
+    try:
+        props = [f.get("properties") or {} for f in features]
+        coords = np.array(
+            [f["geometry"]["coordinates"][:3] for f in features], dtype=np.float64
+        )
+        mags = np.array([p.get("mag") for p in props], dtype=np.float64)
+        times = np.array([p.get("time") or np.nan for p in props], dtype=np.float64)
+        is_feature = np.fromiter(
+            (f.get("type") == "Feature" for f in features), dtype=bool, count=n
+        )
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+    if coords.shape != (n, 3):
+        return None
+
+    values = np.column_stack((coords, mags))
+    in_range = (values >= _EVENT_LOW) & (values <= _EVENT_HIGH)
+    # NaN magnitudes/times are absent values and pass, as in the scalar check;
+    # NaN coordinates fail every comparison and are flagged
+    in_range[:, 3] |= np.isnan(mags)
+    return ~is_feature | ~in_range.all(axis=1) | (times > cutoff_ms)
+
+
+def _data_digest(data: np.ndarray) -> int:
+    """Hash a sample buffer, with xxhash when installed."""
+    buffer = np.ascontiguousarray(data).view(np.uint8)
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(buffer)
+    return int.from_bytes(hashlib.blake2b(buffer, digest_size=8).digest(), "little")
+
+
+def _trace_signature(trace: Trace) -> Optional[Tuple[Hashable, ...]]:
+    """
+    Build a cache key identifying a trace by metadata and sample content.
+
+    Returns:
+        Hashable signature, or None if the trace is malformed and must not
+        be cached
+    """
+    try:
+        stats = trace.stats
+        return (
+            "trace",
+            trace.id,
+            float(stats.starttime),
+            int(stats.npts),
+            float(stats.sampling_rate),
+            str(trace.data.dtype),
+            _data_digest(trace.data),
+        )
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _event_signature(event: Any) -> Optional[Tuple[Hashable, ...]]:
+    """
+    Build a cache key for a USGS event from its id and update time.
+
+    Events stamped in the future are not cached, since their verdict
+    changes as the clock moves.
+
+    Returns:
+        Hashable signature, or None if a field is missing or malformed
+    """
+    if not isinstance(event, dict) or not isinstance(event.get("properties"), dict):
+        return None
+    event_id = event.get("id")
+    updated = event["properties"].get("updated")
+    event_time = event["properties"].get("time", 0)
+    if not isinstance(event_id, str) or not isinstance(updated, (int, float)):
+        return None
+    if not isinstance(event_time, (int, float)) or event_time > _future_cutoff_ms():
+        return None
+    return ("event", event_id, updated)
+
+
+def _write_report(report: Dict[str, Any], output_path: Path) -> None:
+    """Write a report as indented JSON, using orjson when available."""
+    if orjson is not None:
+        payload = orjson.dumps(
+            report,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+            default=str,
+        )
+        with open(output_path, "wb") as f:
+            f.write(payload)
+        return
+
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+
+
+# Cached verdict: None if the item passed, else the error type and message
+_Verdict = Optional[Tuple[Type[ValidationError], str]]
+
+
+def _usgs_event_verdict(event: Any, cutoff_ms: Optional[int] = None) -> _Verdict:
+    """
+    Check a single USGS event without raising.
+
+    Args:
+        event: GeoJSON feature
+        cutoff_ms: Latest valid event time in epoch milliseconds; defaults
+            to now plus the clock-skew tolerance
+
+    Returns:
+        None if the event is valid, else the error type and message
+        ``_validate_usgs_event`` raises for it
+    """
+    # Check event structure
+    if not isinstance(event, dict):
+        return DataFormatError, "Event must be a dictionary"
+
+    if event.get("type") != "Feature":
+        return DataFormatError, "Event type must be 'Feature'"
+
+    # Check geometry
+    geometry = event.get("geometry")
+    if not geometry:
+        return DataFormatError, "Missing geometry"
+
+    coordinates = geometry.get("coordinates")
+    if not coordinates or len(coordinates) < 3:
+        return DataFormatError, "Invalid coordinates"
+
+    longitude, latitude, depth = coordinates[:3]
+
+    # Validate coordinate ranges
+    if not (-180 <= longitude <= 180):
+        return DataQualityError, f"Invalid longitude: {longitude}"
+
+    if not (-90 <= latitude <= 90):
+        return DataQualityError, f"Invalid latitude: {latitude}"
+
+    if depth < -10 or depth > 1000:  # km
+        return DataQualityError, f"Suspicious depth: {depth} km"
+
+    # Check properties
+    properties = event.get("properties", {})
+
+    # Validate magnitude
+    magnitude = properties.get("mag")
+    if magnitude is not None:
+        if not (-2 <= magnitude <= 10):
+            return DataQualityError, f"Suspicious magnitude: {magnitude}"
+
+    # Validate time
+    event_time = properties.get("time")
+    if event_time:
+        # Event times are epoch milliseconds
+        if not isinstance(event_time, (int, float)) or not math.isfinite(event_time):
+            return DataFormatError, "Invalid event time format"
+        # Check if event is too far in the future
+        if cutoff_ms is None:
+            cutoff_ms = _future_cutoff_ms()
+        if event_time > cutoff_ms:
+            return DataQualityError, "Event time in the future"
+
+    return None
+
+
+# Marks a signature with no cached verdict (None means "passed")
+_UNKNOWN = object()
+
+# Up to this many new events, plain per-event checks beat building arrays
+_SMALL_RESPONSE = 16
+
+# Below this many traces a thread pool costs more than it saves
+_PARALLEL_MIN_TRACES = 8
+
+
+class _StreamSummary(NamedTuple):
+    """Per-trace metadata of a stream as arrays, plus its gaps."""
+
+    ids: List[str]
+    sampling_rate: np.ndarray
+    npts: np.ndarray
+    span: np.ndarray  # endtime - starttime, seconds
+    gaps: List[List[Any]]
+
+
+def _summarize_stream(stream: Stream) -> _StreamSummary:
+    """Collect the metadata the stream-level checks need in one pass."""
+    n = len(stream)
+    ids = []
+    sampling_rate = np.empty(n, dtype=np.float64)
+    npts = np.empty(n, dtype=np.int64)
+    span = np.empty(n, dtype=np.float64)
+    for i, trace in enumerate(stream):
+        stats = trace.stats
+        ids.append(trace.id)
+        sampling_rate[i] = stats.sampling_rate
+        npts[i] = stats.npts
+        span[i] = stats.endtime - stats.starttime
+
+    # Gaps lie between traces of the same channel, so ObsPy reports them
+    # for the stream as a whole
+    return _StreamSummary(ids, sampling_rate, npts, span, stream.get_gaps())
+
+
+class QualityThresholds(NamedTuple):
+    """
+    Waveform quality limits used by :class:`DataValidator`.
+
+    Immutable; change a limit with ``_replace``, e.g.
+    ``validator.quality_thresholds._replace(min_snr=5.0)``.
+    """
+
+    min_sampling_rate: float = 1.0
+    max_sampling_rate: float = 1000.0
+    min_duration: float = 10.0  # seconds
+    max_gap_ratio: float = 0.1  # 10% gaps allowed
+    min_snr: float = 3.0  # Signal-to-noise ratio
+    max_std_ratio: float = 5.0  # Standard deviation ratio
+
+
 class DataValidator:
     """
     Comprehensive data validation and quality control system.
@@ -44,17 +331,35 @@ class DataValidator:
     sources and ensure data integrity and quality standards.
     """
 
-    def __init__(self, config: Optional[Config] = None):
-        """Initialize data validator."""
+    def __init__(
+        self, config: Optional[Config] = None, max_cached_verdicts: int = 512
+    ):
+        """
+        Initialize data validator.
+
+        Args:
+            config: Configuration, defaults to ``Config()``
+            max_cached_verdicts: Number of trace and event verdicts kept in
+                the LRU cache
+        """
         self.config = config or Config()
-        self.quality_thresholds = {
-            "min_sampling_rate": 1.0,
-            "max_sampling_rate": 1000.0,
-            "min_duration": 10.0,  # seconds
-            "max_gap_ratio": 0.1,  # 10% gaps allowed
-            "min_snr": 3.0,  # Signal-to-noise ratio
-            "max_std_ratio": 5.0,  # Standard deviation ratio
-        }
+        self.quality_thresholds = QualityThresholds()
+
+        # LRU of validation verdicts, so a report validating the same trace
+        # several times only checks it once, and USGS events repeated across
+        # overlapping queries are not re-checked
+        self._verdicts: "OrderedDict[Tuple[Hashable, ...], _Verdict]" = (
+            OrderedDict()
+        )
+        self.max_cached_verdicts = max_cached_verdicts
+        self._verdicts_lock = threading.Lock()
+
+        # Worker threads for per-trace checks; the statistics kernel
+        # releases the GIL, so traces are checked concurrently
+        self.max_workers = min(32, os.cpu_count() or 1)
+
+        # Compile the statistics kernel before the first trace arrives
+        warm_up()
 
         logger.info("Data validator initialized")
 
@@ -92,13 +397,51 @@ class DataValidator:
         if not isinstance(features, list):
             raise DataFormatError("Features must be a list")
 
-        # Validate individual events
-        valid_events = 0
+        cutoff_ms = _future_cutoff_ms()
+
+        # Events seen before keep their verdict; failures are replayed below
+        # so they are logged again
+        keys = []
+        pending = []
+        suspects = []
         for i, feature in enumerate(features):
+            signature = _event_signature(feature)
+            key = None if signature is None else self._verdict_key(signature)
+            keys.append(key)
+            verdict = _UNKNOWN if key is None else self._recall(key)
+            if verdict is _UNKNOWN:
+                pending.append(i)
+            elif verdict is not None:
+                suspects.append(i)
+
+        # Validate new events at once; irregular batches go event by event.
+        # Small batches (real-time polling) are checked without raising, so
+        # only bad events pay for an exception below.
+        if len(pending) <= _SMALL_RESPONSE:
+            for i in pending:
+                verdict = _usgs_event_verdict(features[i], cutoff_ms)
+                if keys[i] is not None:
+                    self._remember(keys[i], verdict)
+                if verdict is not None:
+                    suspects.append(i)
+        else:
+            invalid = _usgs_invalid_mask([features[i] for i in pending], cutoff_ms)
+            if invalid is None:
+                suspects.extend(pending)
+            else:
+                for i, bad in zip(pending, invalid.tolist()):
+                    if bad:
+                        suspects.append(i)
+                    elif keys[i] is not None:
+                        self._remember(keys[i], None)
+        suspects.sort()
+
+        valid_events = len(features)
+        for i in suspects:
             try:
-                self._validate_usgs_event(feature)
-                valid_events += 1
+                self._validate_usgs_event(features[i])
             except ValidationError as e:
+                valid_events -= 1
                 logger.warning(f"Event {i} validation failed: {e}")
 
         # Check if we have enough valid events
@@ -111,57 +454,82 @@ class DataValidator:
         )
         return True
 
-    def _validate_usgs_event(self, event: Dict[str, Any]) -> bool:
-        """Validate individual USGS event."""
-        # Check event structure
-        if not isinstance(event, dict):
-            raise DataFormatError("Event must be a dictionary")
-
-        if event.get("type") != "Feature":
-            raise DataFormatError("Event type must be 'Feature'")
-
-        # Check geometry
-        geometry = event.get("geometry")
-        if not geometry:
-            raise DataFormatError("Missing geometry")
-
-        coordinates = geometry.get("coordinates")
-        if not coordinates or len(coordinates) < 3:
-            raise DataFormatError("Invalid coordinates")
-
-        longitude, latitude, depth = coordinates[:3]
+    def _cached_check(
+        self,
+        key: Optional[Tuple[Hashable, ...]],
+        check: Callable[[Any], bool],
+        item: Any,
+    ) -> bool:
+        """
+        Run ``check(item)`` once per signature and replay its verdict.
 
-        # Validate coordinate ranges
-        if not (-180 <= longitude <= 180):
-            raise DataQualityError(f"Invalid longitude: {longitude}")
+        Items without a usable signature are always checked afresh.
 
-        if not (-90 <= latitude <= 90):
-            raise DataQualityError(f"Invalid latitude: {latitude}")
+        Raises:
+            ValidationError: The error ``check`` raised, or a fresh copy of it
+        """
+        if key is None:
+            return check(item)
 
-        if depth < -10 or depth > 1000:  # km
-            raise DataQualityError(f"Suspicious depth: {depth} km")
+        key = self._verdict_key(key)
+        verdict = self._recall(key)
+        if verdict is not _UNKNOWN:
+            if verdict is None:
+                return True
+            error_type, message = verdict
+            raise error_type(message)
 
-        # Check properties
-        properties = event.get("properties", {})
+        try:
+            check(item)
+            verdict = None
+        except ValidationError as e:
+            verdict = (type(e), str(e))
+            raise
+        finally:
+            self._remember(key, verdict)
+        return True
 
-        # Validate magnitude
-        magnitude = properties.get("mag")
-        if magnitude is not None:
-            if not (-2 <= magnitude <= 10):
-                raise DataQualityError(f"Suspicious magnitude: {magnitude}")
+    def _verdict_key(self, signature: Tuple[Hashable, ...]) -> Tuple[Hashable, ...]:
+        """Extend a signature with the thresholds its verdict depends on."""
+        return signature + self.quality_thresholds
+
+    def _recall(self, key: Tuple[Hashable, ...]) -> Any:
+        """Return the cached verdict for ``key``, or ``_UNKNOWN``."""
+        with self._verdicts_lock:
+            verdict = self._verdicts.get(key, _UNKNOWN)
+            if verdict is not _UNKNOWN:
+                self._verdicts.move_to_end(key)
+        return verdict
+
+    def _remember(self, key: Tuple[Hashable, ...], verdict: _Verdict) -> None:
+        """Cache a verdict, evicting the least recently used beyond the limit."""
+        with self._verdicts_lock:
+            self._verdicts[key] = verdict
+            self._verdicts.move_to_end(key)
+            while len(self._verdicts) > self.max_cached_verdicts:
+                self._verdicts.popitem(last=False)
+
+    def _map_traces(self, func: Callable[[Trace], Any], stream: Stream) -> List[Any]:
+        """Apply ``func`` to every trace, on worker threads for larger streams."""
+        if self.max_workers <= 1 or len(stream) < _PARALLEL_MIN_TRACES:
+            return [func(trace) for trace in stream]
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(stream))
+        ) as pool:
+            return list(pool.map(func, stream))
 
-        # Validate time
-        event_time = properties.get("time")
-        if event_time:
-            try:
-                # Convert from milliseconds to datetime
-                dt = datetime.fromtimestamp(event_time / 1000.0)
-                # Check if event is too far in the future
-                if dt > datetime.now():
-                    raise DataQualityError("Event time in the future")
-            except (ValueError, TypeError):
-                raise DataFormatError("Invalid event time format")
+    def _validate_usgs_event(self, event: Dict[str, Any]) -> bool:
+        """Validate individual USGS event, reusing earlier verdicts."""
+        return self._cached_check(
+            _event_signature(event), self._check_usgs_event, event
+        )
 
+    def _check_usgs_event(self, event: Dict[str, Any]) -> bool:
+        """Validate individual USGS event."""
+        verdict = _usgs_event_verdict(event)
+        if verdict is not None:
+            error_type, message = verdict
+            raise error_type(message)
         return True
 
     def validate_waveform_stream(self, stream: Stream) -> bool:
@@ -186,13 +554,7 @@ class DataValidator:
         if len(stream) == 0:
             raise DataFormatError("Stream is empty")
 
-        valid_traces = 0
-        for trace in stream:
-            try:
-                self._validate_trace(trace)
-                valid_traces += 1
-            except ValidationError as e:
-                logger.warning(f"Trace {trace.id} validation failed: {e}")
+        valid_traces = sum(self._map_traces(self._trace_passes, stream))
 
         # Check if we have enough valid traces
         valid_ratio = valid_traces / len(stream)
@@ -204,7 +566,26 @@ class DataValidator:
         )
         return True
 
+    def _trace_passes(self, trace: Trace) -> bool:
+        """Validate a trace, logging rather than raising a failure."""
+        try:
+            return self._validate_trace(trace)
+        except ValidationError as e:
+            logger.warning(f"Trace {trace.id} validation failed: {e}")
+            return False
+
+    def _is_valid(self, trace: Trace) -> bool:
+        """Return whether a trace passes validation, without logging."""
+        try:
+            return self._validate_trace(trace)
+        except ValidationError:
+            return False
+
     def _validate_trace(self, trace: Trace) -> bool:
+        """Validate individual trace, reusing earlier verdicts."""
+        return self._cached_check(_trace_signature(trace), self._check_trace, trace)
+
+    def _check_trace(self, trace: Trace) -> bool:
         """Validate individual trace."""
         stats = trace.stats
         data = trace.data
@@ -212,83 +593,95 @@ class DataValidator:
         # Check sampling rate
         sr = stats.sampling_rate
         if not (
-            self.quality_thresholds["min_sampling_rate"]
+            self.quality_thresholds.min_sampling_rate
             <= sr
-            <= self.quality_thresholds["max_sampling_rate"]
+            <= self.quality_thresholds.max_sampling_rate
         ):
             raise DataQualityError(f"Invalid sampling rate: {sr} Hz")
 
         # Check duration
         duration = stats.npts / sr
-        if duration < self.quality_thresholds["min_duration"]:
+        if duration < self.quality_thresholds.min_duration:
             raise DataQualityError(f"Trace too short: {duration:.1f}s")
 
         # Check for data availability
         if len(data) == 0:
             raise DataFormatError("Trace has no data")
 
+        # All sample statistics come from a single pass over the data
+        finite, dmin, dmax, _, signal_power, noise_estimate = trace_stats(data)
+
         # Check for NaN or infinite values
-        if np.any(np.isnan(data)) or np.any(np.isinf(data)):
+        if not finite:
             raise DataQualityError("Trace contains NaN or infinite values")
 
-        # Check for constant data (likely sensor failure)
-        if np.std(data) == 0:
+        # Check for constant data (likely sensor failure); a zero
+        # peak-to-peak range is the same condition as a zero deviation
+        if dmax == dmin:
             raise DataQualityError("Trace has constant values")
 
-        # Check for extreme values (possible clipping)
-        data_range = np.ptp(data)  # peak-to-peak
-        if data_range == 0:
-            raise DataQualityError("No signal variation detected")
-
-        # Check signal-to-noise ratio (simplified)
-        signal_power = np.var(data)
-        noise_estimate = np.var(data[: int(0.1 * len(data))])  # First 10%
+        # Check signal-to-noise ratio (simplified), noise from the first 10%
         if noise_estimate > 0:
             snr = signal_power / noise_estimate
-            if snr < self.quality_thresholds["min_snr"]:
+            if snr < self.quality_thresholds.min_snr:
                 raise DataQualityError(f"Low SNR: {snr:.2f}")
 
         return True
 
-    def check_data_gaps(self, stream: Stream) -> Dict[str, Any]:
+    def check_data_gaps(self, stream: Stream, as_frame: bool = False) -> Dict[str, Any]:
         """
         Check for gaps in waveform data.
 
         Args:
             stream: ObsPy Stream to check
+            as_frame: Return the gap details as a DataFrame with one row per
+                gap (UTC timestamps) instead of a list of dicts
 
         Returns:
             Dictionary with gap information
         """
+        return self._check_data_gaps(_summarize_stream(stream), as_frame)
+
+    def _check_data_gaps(
+        self, summary: _StreamSummary, as_frame: bool = False
+    ) -> Dict[str, Any]:
+        """Gap analysis of an already summarized stream."""
         gap_info = {"total_gaps": 0, "gap_ratio": 0.0, "gap_details": []}
 
-        total_expected_samples = 0
-        total_actual_samples = 0
-
-        for trace in stream:
-            gaps = trace.get_gaps()
-            gap_info["total_gaps"] += len(gaps)
-
-            # Calculate expected vs actual samples
-            start_time = trace.stats.starttime
-            end_time = trace.stats.endtime
-            expected_duration = end_time - start_time
-            expected_samples = int(expected_duration * trace.stats.sampling_rate)
-            actual_samples = trace.stats.npts
-
-            total_expected_samples += expected_samples
-            total_actual_samples += actual_samples
-
-            for gap in gaps:
-                gap_info["gap_details"].append(
-                    {
-                        "trace_id": trace.id,
-                        "start_time": str(gap[4]),
-                        "end_time": str(gap[5]),
-                        "duration": gap[6],
-                        "samples": gap[7],
-                    }
-                )
+        # Each gap starts with its channel's network, station, location and
+        # channel codes
+        gaps = summary.gaps
+        gap_info["total_gaps"] = len(gaps)
+        if as_frame:
+            gap_info["gap_details"] = pd.DataFrame(
+                {
+                    "trace_id": [".".join(gap[:4]) for gap in gaps],
+                    "start_time": pd.to_datetime(
+                        [float(gap[4]) for gap in gaps], unit="s", utc=True
+                    ),
+                    "end_time": pd.to_datetime(
+                        [float(gap[5]) for gap in gaps], unit="s", utc=True
+                    ),
+                    "duration": np.array([gap[6] for gap in gaps], dtype=np.float64),
+                    "samples": np.array([gap[7] for gap in gaps], dtype=np.int64),
+                }
+            )
+        else:
+            gap_info["gap_details"] = [
+                {
+                    "trace_id": ".".join(gap[:4]),
+                    "start_time": str(gap[4]),
+                    "end_time": str(gap[5]),
+                    "duration": gap[6],
+                    "samples": gap[7],
+                }
+                for gap in gaps
+            ]
+
+        # Expected vs actual samples, accounted for all traces at once
+        expected = (summary.span * summary.sampling_rate).astype(np.int64)
+        total_expected_samples = int(expected.sum())
+        total_actual_samples = int(summary.npts.sum())
 
         # Calculate overall gap ratio
         if total_expected_samples > 0:
@@ -316,39 +709,38 @@ class DataValidator:
         if len(stream) == 0:
             return 0.0
 
-        scores = []
+        return self._data_quality_score(stream, _summarize_stream(stream))
 
-        for trace in stream:
-            trace_score = 100.0
+    def _data_quality_score(self, stream: Stream, summary: _StreamSummary) -> float:
+        """Quality score of a non-empty stream from its summary."""
+        n = len(summary.ids)
+        gap_counts = Counter(".".join(gap[:4]) for gap in summary.gaps)
+        n_gaps = np.fromiter(
+            (gap_counts[trace_id] for trace_id in summary.ids),
+            dtype=np.float64,
+            count=n,
+        )
+        npts = summary.npts
+        sr = summary.sampling_rate
+        valid = np.array(self._map_traces(self._is_valid, stream), dtype=bool)
+
+        scores = np.full(n, 100.0)
+        # 50% penalty for failed validation
+        scores[~valid] *= 0.5
+        # Gaps on the trace's channel, max 50% penalty
+        scores -= np.minimum(n_gaps * 10, 50)
+        # Sampling rate consistency, max 20% penalty
+        sr_diff = np.abs(sr - self.config.data.sampling_rate)
+        scores -= np.where(sr_diff > 0.1, np.minimum(sr_diff * 5, 20), 0.0)
+        # Duration shortfall, up to 30% penalty
+        min_duration = self.quality_thresholds.min_duration
+        with np.errstate(divide="ignore", invalid="ignore"):
+            duration = npts / sr
+        scores -= np.where(
+            duration < min_duration, (1 - duration / min_duration) * 30, 0.0
+        )
 
-            try:
-                # Check basic validation
-                self._validate_trace(trace)
-            except ValidationError:
-                trace_score *= 0.5  # 50% penalty for failed validation
-
-            # Check gaps
-            gaps = trace.get_gaps()
-            if gaps:
-                gap_penalty = min(len(gaps) * 10, 50)  # Max 50% penalty
-                trace_score -= gap_penalty
-
-            # Check sampling rate consistency
-            expected_sr = self.config.data.sampling_rate
-            sr_diff = abs(trace.stats.sampling_rate - expected_sr)
-            if sr_diff > 0.1:
-                trace_score -= min(sr_diff * 5, 20)  # Max 20% penalty
-
-            # Check duration
-            duration = trace.stats.npts / trace.stats.sampling_rate
-            min_duration = self.quality_thresholds["min_duration"]
-            if duration < min_duration:
-                duration_penalty = (1 - duration / min_duration) * 30
-                trace_score -= duration_penalty
-
-            scores.append(max(0, trace_score))
-
-        overall_score = np.mean(scores)
+        overall_score = np.maximum(scores, 0).mean()
         logger.info(f"Data quality score: {overall_score:.1f}/100")
 
         return overall_score
@@ -366,13 +758,18 @@ class DataValidator:
         Returns:
             Validation report dictionary
         """
+        # One pass over the traces and one gap scan serve every check below
+        summary = _summarize_stream(stream)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            durations = summary.npts / summary.sampling_rate
+
         report = {
             "timestamp": datetime.now().isoformat(),
             "stream_info": {
-                "num_traces": len(stream),
-                "trace_ids": [tr.id for tr in stream],
-                "sampling_rates": [tr.stats.sampling_rate for tr in stream],
-                "durations": [tr.stats.npts / tr.stats.sampling_rate for tr in stream],
+                "num_traces": len(summary.ids),
+                "trace_ids": summary.ids,
+                "sampling_rates": summary.sampling_rate.tolist(),
+                "durations": durations.tolist(),
             },
             "validation_results": {},
             "quality_metrics": {},
@@ -387,11 +784,11 @@ class DataValidator:
             report["validation_results"]["overall"] = "FAILED"
             report["validation_results"]["error"] = str(e)
 
-        # Calculate quality metrics
-        report["quality_metrics"]["quality_score"] = self.calculate_data_quality_score(
-            stream
+        # Calculate quality metrics from the same summary
+        report["quality_metrics"]["quality_score"] = (
+            self._data_quality_score(stream, summary) if len(stream) else 0.0
         )
-        report["quality_metrics"]["gap_info"] = self.check_data_gaps(stream)
+        report["quality_metrics"]["gap_info"] = self._check_data_gaps(summary)
 
         # Generate recommendations
         if report["quality_metrics"]["quality_score"] < 70:
@@ -406,8 +803,7 @@ class DataValidator:
         if output_path:
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "w") as f:
-                json.dump(report, f, indent=2, default=str)
+            _write_report(report, output_path)
             logger.info(f"Validation report saved to {output_path}")
 
         return report
@@ -453,6 +849,55 @@ def validate_earthquake_parameters(
     return True
 
 
+# Inclusive bounds of validate_earthquake_parameters, by DataFrame column
+_EARTHQUAKE_BOUNDS = {
+    "magnitude": (-2.0, 10.0),
+    "depth": (0.0, 800.0),
+    "latitude": (-90.0, 90.0),
+    "longitude": (-180.0, 180.0),
+}
+
+
+def validate_earthquake_parameters_batch(events: pd.DataFrame) -> bool:
+    """
+    Validate earthquake parameter ranges for a whole catalog at once.
+
+    Applies the bounds of :func:`validate_earthquake_parameters` to every
+    row with vectorized comparisons. Columns are named like that
+    function's arguments (USGS's ``mag`` is accepted for ``magnitude``);
+    absent columns and NaN values are treated as missing parameters.
+
+    Args:
+        events: Catalog with one earthquake per row
+
+    Returns:
+        True if all rows are valid
+
+    Raises:
+        ValidationError: For the first invalid row, naming its position
+    """
+    if "magnitude" not in events and "mag" in events:
+        events = events.rename(columns={"mag": "magnitude"})
+
+    columns = [name for name in _EARTHQUAKE_BOUNDS if name in events]
+    bad = np.zeros(len(events), dtype=bool)
+    for name in columns:
+        low, high = _EARTHQUAKE_BOUNDS[name]
+        values = events[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        # NaN compares False both ways, so missing values never flag a row
+        bad |= (values < low) | (values > high)
+
+    if bad.any():
+        row = int(bad.argmax())
+        params = {name: events[name].iloc[row] for name in columns}
+        try:
+            validate_earthquake_parameters(**params)
+        except ValidationError as e:
+            raise ValidationError(f"Row {row}: {e}") from None
+
+    return True
+
+
 def sanitize_station_code(code: str) -> str:
     """
     Sanitize and validate station codes.
@@ -476,8 +921,37 @@ def sanitize_station_code(code: str) -> str:
     if not (1 <= len(code) <= 10):
         raise ValidationError(f"Invalid station code length: {code}")
 
-    # Check for valid characters (alphanumeric and some symbols)
-    if not code.replace("*", "").replace("?", "").isalnum():
+    # Check for valid characters (alphanumeric and wildcards)
+    if not _STATION_CODE_RE.match(code):
         raise ValidationError(f"Invalid characters in station code: {code}")
 
     return code
+
+
+def sanitize_station_codes(codes: Iterable[str]) -> List[str]:
+    """
+    Sanitize and validate many station codes at once.
+
+    Applies the same rules as :func:`sanitize_station_code` using pandas'
+    vectorized string methods.
+
+    Args:
+        codes: Station codes to sanitize
+
+    Returns:
+        Cleaned station codes, in input order
+
+    Raises:
+        ValidationError: If any code is invalid; the message lists them all
+    """
+    raw = pd.Series(list(codes), dtype=object)
+    cleaned = raw.str.strip().str.upper()
+    valid = (
+        raw.map(lambda c: isinstance(c, str)).astype(bool)
+        & cleaned.str.len().between(1, 10)
+        & cleaned.str.match(_STATION_CODE_RE).fillna(False).astype(bool)
+    )
+    if not valid.all():
+        raise ValidationError(f"Invalid station codes: {raw[~valid].tolist()}")
+
+    return cleaned.tolist()
@@ -5,17 +5,34 @@ seismic waveform classification including time-domain, frequency-domain,
 and wavelet-based features.
 """
 
-from typing import Dict, Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import pywt
+from numpy.lib.stride_tricks import sliding_window_view
 from obspy import Stream, Trace
 from scipy import signal, stats
-from scipy.fft import fft, fftfreq
+from scipy.fft import irfft, next_fast_len, rfft, rfftfreq
+
+try:
+    import cupy
+except ImportError:  # pragma: no cover
+    cupy = None  # type: ignore
 
 from ..config.settings import Config
+from ..utils.arrival_kernels import (
+    decay_time,
+    envelope_times,
+    rise_time,
+    sta_lta,
+    sta_lta_scan,
+)
+from ..utils.autocorr_kernels import first_zero_crossing, normalize
 from ..utils.logger import get_logger
+from ..utils.moment_kernels import RowMoments, row_moments
 from .signal_processing import (
     calculate_spectral_features,
     calculate_time_domain_features,
@@ -24,22 +41,216 @@ from .signal_processing import (
 logger = get_logger(__name__)
 
 
+# Upper bound on samples stacked per batch, which bounds the intermediate arrays
+_BATCH_SAMPLES = 1 << 18
+
+# Below this many traces a thread pool costs more than it saves
+_PARALLEL_MIN_TRACES = 8
+
+# Smallest batch (in samples) worth a round trip to the GPU
+_GPU_MIN_SAMPLES = 1 << 16
+
+# Morlet scales analysed by the CWT features
+_CWT_SCALES = np.arange(1, 32)
+
+# Frequency bands (Hz) of the FFT power features
+_FFT_BANDS = {
+    "very_low": (0.1, 1.0),
+    "low": (1.0, 5.0),
+    "mid": (5.0, 15.0),
+    "high": (15.0, 50.0),
+}
+
+
+class _ShapePlan(NamedTuple):
+    """Constants shared by every batch of one length and sampling rate."""
+
+    sta_window: int
+    lta_window: int
+    positive: slice
+    band_edges: np.ndarray
+    spec_window: np.ndarray
+    cwt_nfft: int
+    cwt_spectra: np.ndarray
+
+
+def _per_row(
+    func: Callable[..., Dict[str, float]], data: np.ndarray, *args: Any
+) -> Dict[str, np.ndarray]:
+    """Apply a single-trace feature function to each row and stack the results."""
+    rows = [func(row, *args) for row in data]
+    return {
+        key: np.array([row[key] for row in rows], dtype=np.float64) for key in rows[0]
+    }
+
+
+def _histogram_entropy(
+    data: np.ndarray, bins: int = 50, moments: Optional[RowMoments] = None
+) -> np.ndarray:
+    """
+    Shannon entropy of each row's histogram density, as ``np.histogram``.
+
+    Rows are binned over their own range by :func:`row_moments`, whose
+    result can be passed in when it is already at hand. Constant or
+    non-finite rows go through ``np.histogram`` itself, which widens a zero
+    range and rejects NaN/inf.
+    """
+    if moments is None:
+        moments = row_moments(data, bins)
+    span = moments.span
+    regular = np.isfinite(span) & (span > 0)
+
+    bin_width = np.where(regular, span, 1.0) / bins
+    density = moments.counts / (data.shape[1] * bin_width)[:, None]
+    for row in np.flatnonzero(~regular):
+        density[row], _ = np.histogram(data[row], bins=bins, density=True)
+
+    terms = np.zeros_like(density)
+    np.multiply(density, np.log2(density, where=density > 0, out=terms), out=terms)
+    return -terms.sum(axis=1)
+
+
+def _envelope(data: np.ndarray) -> np.ndarray:
+    """
+    Magnitude of the analytic signal of each row, as ``signal.hilbert``.
+
+    The analytic signal's real part is the data itself, so only the Hilbert
+    transform is computed, as a real ``irfft`` of the rotated one-sided
+    spectrum, instead of the complex inverse FFT ``signal.hilbert`` uses.
+    """
+    npts = data.shape[-1]
+    spectrum = rfft(data, axis=-1)
+    # The Hilbert transform drops DC and, for even lengths, the Nyquist bin
+    spectrum[..., 0] = 0.0
+    if npts % 2 == 0:
+        spectrum[..., -1] = 0.0
+    spectrum *= -1j
+    envelope = irfft(spectrum, npts, axis=-1)
+    envelope *= envelope
+    envelope += np.square(data, dtype=np.float64)
+    return np.sqrt(envelope, out=envelope)
+
+
+def _spectrogram(data: np.ndarray, fs: float, window: np.ndarray) -> np.ndarray:
+    """
+    Power spectral density spectrogram of every row.
+
+    Matches ``signal.spectrogram(data, fs, window=window, nperseg=len(window))``
+    (constant detrend, one-sided density, 1/8 overlap) but transforms the
+    frames with a real FFT instead of going through the generic STFT.
+
+    Args:
+        data: Array of shape ``(n_traces, npts)``
+        fs: Sampling rate in Hz
+        window: Window of ``nperseg`` samples
+
+    Returns:
+        Array of shape ``(n_traces, nperseg // 2 + 1, n_frames)``
+
+    Raises:
+        ValueError: If the window is empty
+    """
+    nperseg = len(window)
+    if nperseg == 0:
+        raise ValueError("nperseg must be a positive integer")
+    hop = nperseg - nperseg // 8
+
+    frames = sliding_window_view(data, nperseg, axis=-1)[:, ::hop]
+    frames = frames - frames.mean(axis=-1, keepdims=True)
+    frames *= window
+    spectrum = rfft(frames, axis=-1)
+
+    power = np.abs(spectrum)
+    power *= power
+    power *= 1.0 / (fs * np.dot(window, window))
+    # One-sided density: fold in the negative frequencies, except at DC and,
+    # for even segments, Nyquist
+    power[..., 1 : (nperseg + 1) // 2] *= 2.0
+    return power.transpose(0, 2, 1)
+
+
+def _morlet_spectra(npts: int) -> Tuple[int, np.ndarray]:
+    """
+    Frequency responses of the Morlet CWT filters for traces of ``npts``.
+
+    Each filter reproduces one scale of ``pywt.cwt``: the integrated
+    wavelet resampled to the scale, differenced, weighted by
+    ``-sqrt(scale)`` and shifted so the centred output starts at sample
+    zero. The FFT length leaves room for the longest filter, so the
+    circular convolution equals the linear one over the trace.
+
+    Args:
+        npts: Number of samples per trace
+
+    Returns:
+        Tuple of the FFT length and the filter spectra, shape
+        ``(n_scales, nfft // 2 + 1)``
+    """
+    int_psi, x = pywt.integrate_wavelet("morl", precision=12)
+    step = x[1] - x[0]
+    kernels = []
+    for scale in _CWT_SCALES:
+        j = (np.arange(scale * (x[-1] - x[0]) + 1) / (scale * step)).astype(int)
+        int_psi_scale = int_psi[j[j < int_psi.size]][::-1]
+        kernel = -np.sqrt(scale) * np.diff(int_psi_scale, prepend=0, append=0)
+        # pywt drops floor(d) leading samples of the differenced convolution
+        offset = 1 + (int_psi_scale.size - 2) // 2
+        kernels.append((kernel, offset))
+
+    nfft = next_fast_len(npts + max(k.size for k, _ in kernels))
+    spectra = np.empty((len(kernels), nfft // 2 + 1), dtype=np.complex128)
+    for i, (kernel, offset) in enumerate(kernels):
+        padded = np.zeros(nfft)
+        padded[: kernel.size] = kernel
+        spectra[i] = rfft(np.roll(padded, -offset))
+
+    return nfft, spectra
+
+
 class FeatureExtractor:
     """
     Comprehensive feature extraction for seismic waveform classification.
 
     This class extracts time-domain, frequency-domain, and wavelet features
     from seismic waveforms for machine learning applications.
+
+    Traces of equal length and sampling rate are stacked into a 2-D
+    ``(n_traces, npts)`` array and processed together; the ``_extract_*``
+    methods all take such arrays and return one feature array per name.
     """
 
-    def __init__(self, config: Optional[Config] = None):
-        """Initialize feature extractor."""
+    def __init__(self, config: Optional[Config] = None, use_gpu: bool = False):
+        """
+        Initialize feature extractor.
+
+        Args:
+            config: Configuration, defaults to ``Config()``
+            use_gpu: Run the CWT filter bank of large batches on a CUDA GPU
+                through CuPy; falls back to the CPU when CuPy or a device is
+                unavailable
+        """
         self.config = config or Config()
         self.feature_names = []
+        # Per-shape constants by (npts, sampling rate), see _shape_plan
+        self._plan_cache: Dict[Tuple[int, float], _ShapePlan] = {}
+        # Parsed once; wavedec would otherwise look the name up on every call
+        self._dwt_wavelet = pywt.Wavelet("db4")
+
+        # Device copies of the Morlet spectra by trace length; None on the CPU
+        self._gpu_spectra: Optional[Dict[int, Any]] = None
+        if use_gpu:
+            if cupy is not None and cupy.cuda.is_available():
+                self._gpu_spectra = {}
+            else:
+                logger.warning("CuPy or a CUDA device is unavailable, using the CPU")
+
         logger.info("Feature extractor initialized")
 
     def extract_all_features(
-        self, stream: Stream, window_length: Optional[float] = None
+        self,
+        stream: Stream,
+        window_length: Optional[float] = None,
+        dtype: Any = np.float64,
     ) -> pd.DataFrame:
         """
         Extract comprehensive feature set from waveform stream.
@@ -47,15 +258,17 @@ class FeatureExtractor:
         Args:
             stream: Input ObsPy Stream
             window_length: Window length in seconds for analysis
+            dtype: Float dtype of the feature columns. Features are always
+                computed in double precision; ``np.float32`` halves the frame
+                for models that train in single precision anyway.
 
         Returns:
             DataFrame with extracted features
         """
-        features_list = []
+        windows = []
+        groups: Dict[Tuple[int, float], List[int]] = {}
 
         for i, trace in enumerate(stream):
-            logger.debug(f"Extracting features from trace {i+1}/{len(stream)}")
-
             # Get waveform data
             data = trace.data
             sampling_rate = trace.stats.sampling_rate
@@ -68,36 +281,37 @@ class FeatureExtractor:
                     start_idx = (len(data) - window_samples) // 2
                     data = data[start_idx : start_idx + window_samples]
 
-            # Extract different feature groups
-            trace_features = {}
+            windows.append(data)
+            groups.setdefault((len(data), sampling_rate), []).append(i)
 
-            # Basic metadata
-            trace_features.update(self._extract_metadata_features(trace))
-
-            # Time-domain features
-            trace_features.update(
-                self._extract_time_domain_features(data, sampling_rate)
+        batches = []
+        workers = self._worker_count(len(stream))
+        for (npts, sampling_rate), indices in groups.items():
+            # Split groups so every worker gets a share, within the size cap
+            rows_per_batch = max(
+                1,
+                min(_BATCH_SAMPLES // max(npts, 1), -(-len(indices) // workers)),
             )
+            for start in range(0, len(indices), rows_per_batch):
+                batches.append((indices[start : start + rows_per_batch], sampling_rate))
 
-            # Frequency-domain features
-            trace_features.update(
-                self._extract_frequency_domain_features(data, sampling_rate)
+        def extract(batch: List[int], sampling_rate: float) -> Dict[str, np.ndarray]:
+            return self._extract_batch(
+                [stream[i] for i in batch], [windows[i] for i in batch], sampling_rate
             )
 
-            # Wavelet features
-            trace_features.update(self._extract_wavelet_features(data, sampling_rate))
-
-            # Statistical features
-            trace_features.update(self._extract_statistical_features(data))
-
-            # Add trace identifier
-            trace_features["trace_id"] = trace.id
-            trace_features["trace_index"] = i
-
-            features_list.append(trace_features)
+        if workers <= 1 or len(batches) < 2:
+            results = [extract(batch, rate) for batch, rate in batches]
+        else:
+            # NumPy and scipy.fft release the GIL, so batches overlap on threads
+            with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+                results = list(pool.map(extract, *zip(*batches)))
+        blocks = [(batch, columns) for (batch, _), columns in zip(batches, results)]
 
-        # Convert to DataFrame
-        features_df = pd.DataFrame(features_list)
+        if blocks:
+            features_df = self._assemble_features(stream, blocks, dtype)
+        else:
+            features_df = pd.DataFrame()
 
         logger.info(
             f"Extracted {len(features_df.columns)} features from "
@@ -106,6 +320,90 @@ class FeatureExtractor:
 
         return features_df
 
+    def _worker_count(self, n_traces: int) -> int:
+        """Threads to extract with, following ``config.n_jobs`` (-1 for all cores)."""
+        if n_traces < _PARALLEL_MIN_TRACES:
+            return 1
+        n_jobs = self.config.n_jobs
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        return max(1, n_jobs)
+
+    def _extract_batch(
+        self, traces: List[Trace], windows: List[np.ndarray], sampling_rate: float
+    ) -> Dict[str, np.ndarray]:
+        """
+        Extract all feature columns of equally long windows of several traces.
+
+        Args:
+            traces: Traces the windows were taken from
+            windows: Analysis windows, all of the same length
+            sampling_rate: Common sampling rate in Hz
+
+        Returns:
+            Dictionary of feature name to one value per trace
+        """
+        logger.debug(
+            f"Extracting features from {len(windows)} traces of "
+            f"{len(windows[0])} samples at {sampling_rate} Hz"
+        )
+
+        data = np.stack(windows).astype(np.float64, copy=False)
+        columns = self._extract_metadata_columns(traces)
+
+        # Extract different feature groups
+        columns.update(self._extract_time_domain_features(data, sampling_rate))
+        columns.update(self._extract_frequency_domain_features(data, sampling_rate))
+        columns.update(self._extract_wavelet_features(data, sampling_rate))
+        columns.update(self._extract_statistical_features(data))
+
+        return columns
+
+    def _assemble_features(
+        self,
+        stream: Stream,
+        blocks: List[Tuple[List[int], Dict[str, np.ndarray]]],
+        dtype: Any = np.float64,
+    ) -> pd.DataFrame:
+        """
+        Write per-batch feature columns into one frame in stream order.
+
+        All features are floats, so each batch is written straight into its
+        traces' rows of one pre-sized array, rounding to ``dtype`` on the way;
+        features a batch lacks (such as the arrival features of short traces)
+        stay NaN.
+
+        Args:
+            stream: Stream the features were extracted from
+            blocks: Stream indices and feature columns of each batch
+            dtype: Float dtype of the feature columns
+
+        Returns:
+            DataFrame with one row per trace, followed by the trace id and index
+        """
+        names = list(dict.fromkeys(name for _, columns in blocks for name in columns))
+        position = {name: j for j, name in enumerate(names)}
+
+        values = np.full((len(stream), len(names)), np.nan, dtype=dtype)
+        for batch, columns in blocks:
+            rows = np.asarray(batch)
+            for name, column in columns.items():
+                values[rows, position[name]] = column
+
+        features_df = pd.DataFrame(values, columns=names)
+        features_df["trace_id"] = [trace.id for trace in stream]
+        features_df["trace_index"] = np.arange(len(stream))
+        return features_df
+
+    def _extract_metadata_columns(self, traces: List[Trace]) -> Dict[str, np.ndarray]:
+        """Collect metadata features of several traces, NaN where absent."""
+        rows = [self._extract_metadata_features(trace) for trace in traces]
+        names = dict.fromkeys(name for row in rows for name in row)
+        return {
+            name: np.array([row.get(name, np.nan) for row in rows], dtype=np.float64)
+            for name in names
+        }
+
     def _extract_metadata_features(self, trace: Trace) -> Dict[str, float]:
         """Extract metadata-based features."""
         features = {}
@@ -126,12 +424,12 @@ class FeatureExtractor:
 
     def _extract_time_domain_features(
         self, data: np.ndarray, sampling_rate: float
-    ) -> Dict[str, float]:
+    ) -> Dict[str, np.ndarray]:
         """Extract comprehensive time-domain features."""
         features = {}
 
         # Basic statistical features
-        basic_features = calculate_time_domain_features(data)
+        basic_features = _per_row(calculate_time_domain_features, data)
         features.update({f"td_{k}": v for k, v in basic_features.items()})
 
         # Arrival time features
@@ -150,12 +448,12 @@ class FeatureExtractor:
 
     def _extract_frequency_domain_features(
         self, data: np.ndarray, sampling_rate: float
-    ) -> Dict[str, float]:
+    ) -> Dict[str, np.ndarray]:
         """Extract frequency-domain features."""
         features = {}
 
         # Basic spectral features
-        spectral_features = calculate_spectral_features(data, sampling_rate)
+        spectral_features = _per_row(calculate_spectral_features, data, sampling_rate)
         features.update({f"fd_{k}": v for k, v in spectral_features.items()})
 
         # FFT-based features
@@ -170,7 +468,7 @@ class FeatureExtractor:
 
     def _extract_wavelet_features(
         self, data: np.ndarray, sampling_rate: float
-    ) -> Dict[str, float]:
+    ) -> Dict[str, np.ndarray]:
         """Extract wavelet-based features."""
         features = {}
 
@@ -184,273 +482,316 @@ class FeatureExtractor:
 
         return features
 
-    def _extract_statistical_features(self, data: np.ndarray) -> Dict[str, float]:
+    def _extract_statistical_features(self, data: np.ndarray) -> Dict[str, np.ndarray]:
         """Extract advanced statistical features."""
         features = {}
 
-        # Higher-order moments
-        features["stat_skewness"] = float(stats.skew(data))
-        features["stat_kurtosis"] = float(stats.kurtosis(data))
+        # Higher-order moments and the entropy histogram from one set of
+        # reductions; like scipy.stats, moments of constant rows are NaN
+        moments = row_moments(data, bins=50)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            constant = moments.m2 <= (np.finfo(float).eps * moments.mean) ** 2
+            skewness = moments.m3 / moments.m2**1.5
+            kurtosis = moments.m4 / moments.m2**2 - 3.0
+        features["stat_skewness"] = np.where(constant, np.nan, skewness)
+        features["stat_kurtosis"] = np.where(constant, np.nan, kurtosis)
 
         # Entropy measures
-        features["stat_entropy"] = self._calculate_entropy(data)
+        features["stat_entropy"] = _histogram_entropy(data, 50, moments)
 
         # Percentile features
         percentiles = [5, 10, 25, 50, 75, 90, 95]
-        for p in percentiles:
-            features[f"stat_percentile_{p}"] = float(np.percentile(data, p))
+        values = np.percentile(data, percentiles, axis=1)
+        for p, value in zip(percentiles, values):
+            features[f"stat_percentile_{p}"] = value
 
         # Distribution tests
-        features["stat_normality_pvalue"] = float(stats.normaltest(data)[1])
+        features["stat_normality_pvalue"] = stats.normaltest(data, axis=1)[1]
 
         return features
 
     def _extract_arrival_features(
         self, data: np.ndarray, sampling_rate: float
-    ) -> Dict[str, float]:
+    ) -> Dict[str, np.ndarray]:
         """Extract P-wave and S-wave arrival features."""
         features = {}
 
         # STA/LTA ratio for arrival detection
-        sta_window = int(1.0 * sampling_rate)  # 1 second
-        lta_window = int(10.0 * sampling_rate)  # 10 seconds
-
-        if len(data) > lta_window:
-            sta_lta = self._calculate_sta_lta(data, sta_window, lta_window)
+        plan = self._shape_plan(data.shape[1], sampling_rate)
+        sta_window, lta_window = plan.sta_window, plan.lta_window
 
+        if data.shape[1] > lta_window:
             # Find potential arrivals
             threshold = 3.0
-            arrival_indices = np.where(sta_lta > threshold)[0]
+            first, peak, count = sta_lta_scan(data, sta_window, lta_window, threshold)
 
-            if len(arrival_indices) > 0:
-                features["arrival_time"] = float(arrival_indices[0] / sampling_rate)
-                features["max_sta_lta"] = float(np.max(sta_lta))
-                features["num_arrivals"] = float(len(arrival_indices))
-            else:
-                features["arrival_time"] = 0.0
-                features["max_sta_lta"] = float(np.max(sta_lta))
-                features["num_arrivals"] = 0.0
+            features["arrival_time"] = np.where(first >= 0, first / sampling_rate, 0.0)
+            features["max_sta_lta"] = peak
+            features["num_arrivals"] = count.astype(np.float64)
 
         return features
 
-    def _extract_envelope_features(self, data: np.ndarray) -> Dict[str, float]:
+    def _extract_envelope_features(self, data: np.ndarray) -> Dict[str, np.ndarray]:
         """Extract envelope-based features."""
         features = {}
 
         # Calculate envelope using Hilbert transform
-        analytic_signal = signal.hilbert(data)
-        envelope = np.abs(analytic_signal)
+        envelope = _envelope(data)
 
         # Envelope statistics
-        features["env_mean"] = float(np.mean(envelope))
-        features["env_std"] = float(np.std(envelope))
-        features["env_max"] = float(np.max(envelope))
-        features["env_skewness"] = float(stats.skew(envelope))
+        env_max = envelope.max(axis=1)
+        features["env_mean"] = envelope.mean(axis=1)
+        features["env_std"] = envelope.std(axis=1)
+        features["env_max"] = env_max
+        features["env_skewness"] = stats.skew(envelope, axis=1)
 
         # Envelope shape features
-        envelope_norm = envelope / np.max(envelope)
-        features["env_rise_time"] = self._calculate_rise_time(envelope_norm)
-        features["env_decay_time"] = self._calculate_decay_time(envelope_norm)
+        envelope_norm = envelope / env_max[:, None]
+        rise, decay = envelope_times(envelope_norm)
+        features["env_rise_time"] = rise
+        features["env_decay_time"] = decay
 
         return features
 
-    def _extract_autocorrelation_features(self, data: np.ndarray) -> Dict[str, float]:
-        """Extract autocorrelation-based features."""
-        features = {}
+    def _shape_plan(self, npts: int, sampling_rate: float) -> _ShapePlan:
+        """
+        Constants the extractors need for traces of one length and rate.
 
-        # Calculate autocorrelation
-        autocorr = np.correlate(data, data, mode="full")
-        autocorr = autocorr[autocorr.size // 2 :]
-        autocorr = autocorr / autocorr[0]  # Normalize
+        Batches of the same shape recur for every window of a stream, so the
+        detector windows, frequency grid, band masks, spectrogram window and
+        Morlet filters are derived once and reused. scipy.fft keeps its own
+        cache of transform plans for repeated lengths.
 
-        # Find first zero crossing
-        zero_crossings = np.where(np.diff(np.sign(autocorr)))[0]
-        if len(zero_crossings) > 0:
-            features["autocorr_first_zero"] = float(zero_crossings[0])
-        else:
-            features["autocorr_first_zero"] = float(len(autocorr))
+        Args:
+            npts: Number of samples per trace
+            sampling_rate: Sampling rate in Hz
+
+        Returns:
+            Cached :class:`_ShapePlan`
+        """
+        key = (npts, sampling_rate)
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            return plan
+
+        # STA/LTA windows of 1 and 10 seconds
+        sta_window = int(1.0 * sampling_rate)
+        lta_window = int(10.0 * sampling_rate)
+
+        # Strictly positive frequencies, i.e. drop DC and, for even lengths,
+        # the Nyquist bin a full FFT files as negative
+        positive = slice(1, (npts + 1) // 2)
+        freqs = rfftfreq(npts, 1 / sampling_rate)[positive]
+        # Bands are closed intervals, so neighbours share a bin that falls on
+        # their common edge; as (start, stop) pairs each is summed on its own
+        f_min, f_max = np.array(list(_FFT_BANDS.values())).T
+        band_edges = np.column_stack(
+            (
+                np.searchsorted(freqs, f_min, side="left"),
+                np.searchsorted(freqs, f_max, side="right"),
+            )
+        )
+
+        # signal.spectrogram's default window, built here instead of per call;
+        # traces too short for one segment are left for _spectrogram to reject
+        nperseg = min(256, npts // 4)
+        spec_window = (
+            signal.get_window(("tukey", 0.25), nperseg) if nperseg else np.empty(0)
+        )
 
-        # Autocorrelation decay rate
-        if len(autocorr) > 10:
-            features["autocorr_decay"] = float(np.mean(autocorr[1:11]))
+        cwt_nfft, cwt_spectra = _morlet_spectra(npts)
+
+        plan = _ShapePlan(
+            sta_window,
+            lta_window,
+            positive,
+            band_edges,
+            spec_window,
+            cwt_nfft,
+            cwt_spectra,
+        )
+        self._plan_cache[key] = plan
+        return plan
+
+    def _extract_autocorrelation_features(
+        self, data: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Extract autocorrelation-based features."""
+        npts = data.shape[1]
+
+        # Autocorrelation at lags 0..npts-1 via Wiener-Khinchin; padding to
+        # at least 2 * npts - 1 keeps it linear rather than circular
+        nfft = next_fast_len(2 * npts - 1, real=True)
+        spectrum = rfft(data, n=nfft, axis=-1)
+        autocorr = irfft(spectrum.real**2 + spectrum.imag**2, n=nfft, axis=-1)
+        autocorr = autocorr[:, :npts]
+
+        # Find first zero crossing, scanning each row only up to it
+        features = {
+            "autocorr_first_zero": first_zero_crossing(autocorr).astype(np.float64)
+        }
+
+        # Autocorrelation decay rate; only the first lags need normalising
+        if npts > 10:
+            features["autocorr_decay"] = np.mean(normalize(autocorr, 11)[:, 1:], axis=1)
 
         return features
 
     def _extract_fft_features(
         self, data: np.ndarray, sampling_rate: float
-    ) -> Dict[str, float]:
+    ) -> Dict[str, np.ndarray]:
         """Extract FFT-based features."""
         features = {}
 
-        # Calculate FFT
-        fft_vals = fft(data)
-        freqs = fftfreq(len(data), 1 / sampling_rate)
-
-        # Use only positive frequencies
-        positive_freq_idx = freqs > 0
-        freqs = freqs[positive_freq_idx]
-        fft_magnitude = np.abs(fft_vals[positive_freq_idx])
-
-        # Frequency band power
-        bands = {
-            "very_low": (0.1, 1.0),
-            "low": (1.0, 5.0),
-            "mid": (5.0, 15.0),
-            "high": (15.0, 50.0),
-        }
-
-        for band_name, (f_min, f_max) in bands.items():
-            band_mask = (freqs >= f_min) & (freqs <= f_max)
-            if np.any(band_mask):
-                band_power = np.sum(fft_magnitude[band_mask] ** 2)
-                features[f"fft_power_{band_name}"] = float(band_power)
-            else:
-                features[f"fft_power_{band_name}"] = 0.0
-
-        # Frequency ratios
-        total_power = np.sum(fft_magnitude**2)
-        if total_power > 0:
-            for band_name in bands.keys():
-                power_key = f"fft_power_{band_name}"
-                if power_key in features:
-                    ratio_key = f"fft_ratio_{band_name}"
-                    features[ratio_key] = features[power_key] / total_power
+        # Power at the strictly positive frequencies of a real-input FFT,
+        # plus a zero column so every band stop is a valid reduceat index
+        plan = self._shape_plan(data.shape[1], sampling_rate)
+        spectrum = rfft(data, axis=-1)[:, plan.positive]
+        power = np.empty((len(data), spectrum.shape[1] + 1))
+        power[:, -1] = 0.0
+        magnitude = np.abs(spectrum, out=power[:, :-1])
+        magnitude *= magnitude
+
+        # Frequency band power; reduceat sums [start, stop) of every edge
+        # pair, and bands without bins sum to zero
+        starts, stops = plan.band_edges.T
+        band_power = np.add.reduceat(power, plan.band_edges.ravel(), axis=1)[:, ::2]
+        band_power[:, starts >= stops] = 0.0
+
+        # Frequency ratios of all bands in one division, undefined (NaN) for
+        # traces without power
+        total_power = np.sum(power, axis=1, keepdims=True)
+        ratios = np.full(band_power.shape, np.nan)
+        np.divide(band_power, total_power, out=ratios, where=total_power > 0)
+
+        for band_name, column in zip(_FFT_BANDS, band_power.T):
+            features[f"fft_power_{band_name}"] = column
+        for band_name, column in zip(_FFT_BANDS, ratios.T):
+            features[f"fft_ratio_{band_name}"] = column
 
         return features
 
     def _extract_spectrogram_features(
         self, data: np.ndarray, sampling_rate: float
-    ) -> Dict[str, float]:
+    ) -> Dict[str, np.ndarray]:
         """Extract spectrogram-based features."""
         features = {}
 
-        # Calculate spectrogram
-        nperseg = min(256, len(data) // 4)
-        freqs, times, Sxx = signal.spectrogram(data, sampling_rate, nperseg=nperseg)
+        # Calculate spectrogram; Sxx is (trace, frequency, time)
+        window = self._shape_plan(data.shape[1], sampling_rate).spec_window
+        Sxx = _spectrogram(data, sampling_rate, window)
 
-        # Time-frequency features
-        features["spec_bandwidth_mean"] = float(np.mean(np.std(Sxx, axis=0)))
-        features["spec_centroid_std"] = float(np.std(np.mean(Sxx, axis=0)))
-        features["spec_rolloff_mean"] = float(np.mean(np.max(Sxx, axis=0)))
+        # Time-frequency features; the spread across frequency reuses the
+        # per-frame mean that also gives the centroid feature
+        frame_mean = np.mean(Sxx, axis=1)
+        deviation = Sxx - frame_mean[:, None, :]
+        frame_spread = np.sqrt(np.mean(deviation * deviation, axis=1))
+        features["spec_bandwidth_mean"] = frame_spread.mean(axis=1)
+        features["spec_centroid_std"] = frame_mean.std(axis=1)
+        features["spec_rolloff_mean"] = np.max(Sxx, axis=1).mean(axis=1)
 
         # Spectral flux (measure of spectral change)
-        if Sxx.shape[1] > 1:
-            spectral_flux = np.mean(np.diff(Sxx, axis=1) ** 2)
-            features["spec_flux"] = float(spectral_flux)
+        if Sxx.shape[2] > 1:
+            spectral_flux = np.mean(np.diff(Sxx, axis=2) ** 2, axis=(1, 2))
+            features["spec_flux"] = spectral_flux
 
         return features
 
     def _extract_cwt_features(
         self, data: np.ndarray, sampling_rate: float
-    ) -> Dict[str, float]:
+    ) -> Dict[str, np.ndarray]:
         """Extract Continuous Wavelet Transform features."""
         features = {}
 
-        # Define scales for analysis
-        scales = np.arange(1, 32)
+        scales = _CWT_SCALES
+        npts = data.shape[1]
+        plan = self._shape_plan(npts, sampling_rate)
+        nfft, spectra = plan.cwt_nfft, plan.cwt_spectra
 
-        # Perform CWT with Morlet wavelet
-        coefficients, freqs = pywt.cwt(data, scales, "morl")
-
-        # Energy at different scales
-        energy_per_scale = np.mean(np.abs(coefficients) ** 2, axis=1)
+        # Same coefficients as pywt.cwt(data, scales, "morl"): transform the
+        # traces once and filter them with each scale's Morlet spectrum
+        if self._gpu_spectra is not None and data.size >= _GPU_MIN_SAMPLES:
+            energy_per_scale = self._cwt_energy_gpu(data, nfft, spectra)
+        else:
+            spectrum = rfft(data, nfft, axis=-1)
+            energy_per_scale = np.empty((len(scales), data.shape[0]))
+            for i, wavelet_spectrum in enumerate(spectra):
+                coefficients = irfft(spectrum * wavelet_spectrum, nfft, axis=-1)
+                energy_per_scale[i] = np.mean(coefficients[:, :npts] ** 2, axis=-1)
 
-        features["cwt_energy_low"] = float(np.mean(energy_per_scale[:8]))
-        features["cwt_energy_mid"] = float(np.mean(energy_per_scale[8:16]))
-        features["cwt_energy_high"] = float(np.mean(energy_per_scale[16:]))
+        features["cwt_energy_low"] = np.mean(energy_per_scale[:8], axis=0)
+        features["cwt_energy_mid"] = np.mean(energy_per_scale[8:16], axis=0)
+        features["cwt_energy_high"] = np.mean(energy_per_scale[16:], axis=0)
 
         # Dominant scale
-        dominant_scale_idx = np.argmax(energy_per_scale)
-        features["cwt_dominant_scale"] = float(scales[dominant_scale_idx])
+        dominant_scale_idx = np.argmax(energy_per_scale, axis=0)
+        features["cwt_dominant_scale"] = scales[dominant_scale_idx].astype(np.float64)
 
         return features
 
-    def _extract_dwt_features(self, data: np.ndarray) -> Dict[str, float]:
+    def _cwt_energy_gpu(
+        self, data: np.ndarray, nfft: int, spectra: np.ndarray
+    ) -> np.ndarray:
+        """
+        Mean squared CWT coefficient per scale and trace, computed with CuPy.
+
+        The batch is copied to the device once and only the
+        ``(n_scales, n_traces)`` energies come back; the filter spectra stay
+        on the device for later batches of the same length.
+        """
+        npts = data.shape[1]
+        device_spectra = self._gpu_spectra.get(npts)
+        if device_spectra is None:
+            device_spectra = cupy.asarray(spectra)
+            self._gpu_spectra[npts] = device_spectra
+
+        spectrum = cupy.fft.rfft(cupy.asarray(data), nfft, axis=-1)
+        energy = cupy.empty((len(device_spectra), data.shape[0]))
+        for i in range(len(device_spectra)):
+            coefficients = cupy.fft.irfft(spectrum * device_spectra[i], nfft, axis=-1)
+            energy[i] = cupy.mean(coefficients[:, :npts] ** 2, axis=-1)
+        return cupy.asnumpy(energy)
+
+    def _extract_dwt_features(self, data: np.ndarray) -> Dict[str, np.ndarray]:
         """Extract Discrete Wavelet Transform features."""
         features = {}
 
         # Perform multi-level DWT
-        wavelet = "db4"
-        max_level = min(5, pywt.dwt_max_level(len(data), wavelet))
+        wavelet = self._dwt_wavelet
+        max_level = min(5, pywt.dwt_max_level(data.shape[1], wavelet.dec_len))
 
-        coeffs = pywt.wavedec(data, wavelet, level=max_level)
+        coeffs = pywt.wavedec(data, wavelet, level=max_level, axis=-1)
 
         # Energy and statistics for each level
         for i, coeff in enumerate(coeffs):
             level_name = "approx" if i == 0 else f"detail_{i}"
 
-            features[f"dwt_{level_name}_energy"] = float(np.sum(coeff**2))
-            features[f"dwt_{level_name}_std"] = float(np.std(coeff))
-            features[f"dwt_{level_name}_mean"] = float(np.mean(coeff))
+            features[f"dwt_{level_name}_energy"] = np.einsum("ij,ij->i", coeff, coeff)
+            features[f"dwt_{level_name}_std"] = np.std(coeff, axis=1)
+            features[f"dwt_{level_name}_mean"] = np.mean(coeff, axis=1)
 
-            if len(coeff) > 0:
-                features[f"dwt_{level_name}_max"] = float(np.max(np.abs(coeff)))
+            if coeff.shape[1] > 0:
+                features[f"dwt_{level_name}_max"] = np.max(np.abs(coeff), axis=1)
 
         return features
 
     def _calculate_sta_lta(
         self, data: np.ndarray, sta_window: int, lta_window: int
     ) -> np.ndarray:
-        """Calculate STA/LTA ratio for arrival detection."""
-        sta_lta = np.zeros(len(data))
-
-        for i in range(lta_window, len(data)):
-            # Short-term average
-            sta = np.mean(data[i - sta_window : i] ** 2)
-
-            # Long-term average
-            lta = np.mean(data[i - lta_window : i] ** 2)
-
-            if lta > 0:
-                sta_lta[i] = sta / lta
-
-        return sta_lta
+        """Calculate STA/LTA ratio for arrival detection along the last axis."""
+        return sta_lta(data, sta_window, lta_window)
 
     def _calculate_rise_time(self, envelope: np.ndarray) -> float:
         """Calculate envelope rise time."""
-        max_idx = np.argmax(envelope)
-
-        # Find 10% and 90% of maximum
-        threshold_10 = 0.1
-        threshold_90 = 0.9
-
-        idx_10 = np.where(envelope[:max_idx] >= threshold_10)[0]
-        idx_90 = np.where(envelope[:max_idx] >= threshold_90)[0]
-
-        if len(idx_10) > 0 and len(idx_90) > 0:
-            return float(idx_90[0] - idx_10[0])
-        else:
-            return 0.0
+        return rise_time(envelope)
 
     def _calculate_decay_time(self, envelope: np.ndarray) -> float:
         """Calculate envelope decay time."""
-        max_idx = np.argmax(envelope)
-
-        if max_idx >= len(envelope) - 1:
-            return 0.0
-
-        # Find 90% and 10% of maximum after peak
-        threshold_90 = 0.9
-        threshold_10 = 0.1
-
-        post_peak = envelope[max_idx:]
-        idx_90 = np.where(post_peak <= threshold_90)[0]
-        idx_10 = np.where(post_peak <= threshold_10)[0]
-
-        if len(idx_90) > 0 and len(idx_10) > 0:
-            return float(idx_10[0] - idx_90[0])
-        else:
-            return float(len(post_peak))
+        return decay_time(envelope)
 
     def _calculate_entropy(self, data: np.ndarray) -> float:
         """Calculate Shannon entropy of the signal."""
-        # Bin the data
-        hist, _ = np.histogram(data, bins=50, density=True)
-        hist = hist[hist > 0]  # Remove zero bins
-
-        # Calculate entropy
-        entropy = -np.sum(hist * np.log2(hist))
-        return float(entropy)
+        return float(_histogram_entropy(data[None, :])[0])
 
 
 def extract_features_from_stream(
@@ -4,18 +4,86 @@ This module provides comprehensive signal processing capabilities for
 seismic waveform data including filtering, detrending, and preprocessing.
 """
 
+from functools import lru_cache
 from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
-from obspy import Stream
+from obspy import Stream, Trace
 from scipy import signal
+from scipy.signal import windows
 
 from ..config.settings import Config
 from ..utils.logger import get_logger
+from ..utils.preprocess_kernels import BATCH_DETREND_TYPES, preprocess_batched
+from ..utils.quality_kernels import trace_stats
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=128)
+def _bandpass_sos(
+    filter_type: str, corners: int, low: float, high: float
+) -> np.ndarray:
+    """
+    Design a bandpass filter as second-order sections.
+
+    Designs are cached because the same filter is applied to every trace;
+    callers must not modify the returned array.
+
+    Args:
+        filter_type: Filter type ('butter', 'bessel', 'ellip')
+        corners: Filter order
+        low: Lower corner as a fraction of the Nyquist frequency
+        high: Upper corner as a fraction of the Nyquist frequency
+
+    Returns:
+        Array of shape ``(n_sections, 6)``
+    """
+    if filter_type == "butter":
+        return signal.butter(corners, [low, high], btype="band", output="sos")
+    elif filter_type == "bessel":
+        return signal.bessel(corners, [low, high], btype="band", output="sos")
+    elif filter_type == "ellip":
+        return signal.ellip(corners, 1, 40, [low, high], btype="band", output="sos")
+    else:
+        raise ValueError(f"Unknown filter type: {filter_type}")
+
+
+@lru_cache(maxsize=64)
+def _taper_window(taper_type: str, npts: int, taper_percentage: float) -> np.ndarray:
+    """
+    Build the window :meth:`SignalProcessor.apply_taper` multiplies by.
+
+    Hann and Hamming windows cover both tapered edges (``2 * taper_samples``
+    long); the Tukey window spans the whole trace. Windows are cached per
+    trace length and returned read-only.
+
+    Args:
+        taper_type: Taper type ('hann', 'hamming', 'tukey')
+        npts: Number of samples in the trace
+        taper_percentage: Fraction of the trace tapered on each side
+
+    Returns:
+        Read-only window array
+
+    Raises:
+        ValueError: If the taper type is unknown
+    """
+    taper_samples = int(npts * taper_percentage)
+
+    if taper_type == "hann":
+        window = windows.hann(2 * taper_samples)
+    elif taper_type == "hamming":
+        window = windows.hamming(2 * taper_samples)
+    elif taper_type == "tukey":
+        window = windows.tukey(npts, alpha=2 * taper_percentage)
+    else:
+        raise ValueError(f"Unknown taper type: {taper_type}")
+
+    window.setflags(write=False)
+    return window
+
+
 class SignalProcessor:
     """
     Comprehensive signal processing for seismic waveforms.
@@ -69,16 +137,10 @@ class SignalProcessor:
             low = freqmin / nyquist
             high = freqmax / nyquist
 
-            if filter_type == "butter":
-                b, a = signal.butter(corners, [low, high], btype="band")
-            elif filter_type == "bessel":
-                b, a = signal.bessel(corners, [low, high], btype="band")
-            elif filter_type == "ellip":
-                b, a = signal.ellip(corners, 1, 40, [low, high], btype="band")
-            else:
-                raise ValueError(f"Unknown filter type: {filter_type}")
-
-            filtered_data = signal.filtfilt(b, a, data)
+            # Second-order sections stay stable at orders where the expanded
+            # (b, a) polynomial of a narrow band loses precision
+            sos = _bandpass_sos(filter_type, corners, low, high)
+            filtered_data = signal.sosfiltfilt(sos, data)
             logger.info(f"Applied {filter_type} bandpass filter to array")
             return filtered_data
 
@@ -150,20 +212,13 @@ class SignalProcessor:
             return tapered_stream
 
         elif isinstance(data, np.ndarray):
-            taper_samples = int(len(data) * taper_percentage)
-
-            if taper_type == "hann":
-                window = signal.hann(2 * taper_samples)
-            elif taper_type == "hamming":
-                window = signal.hamming(2 * taper_samples)
-            elif taper_type == "tukey":
-                window = signal.tukey(len(data), alpha=2 * taper_percentage)
+            window = _taper_window(taper_type, len(data), taper_percentage)
+            if taper_type == "tukey":
                 tapered_data = data * window
                 logger.info(f"Applied {taper_type} taper to array")
                 return tapered_data
-            else:
-                raise ValueError(f"Unknown taper type: {taper_type}")
 
+            taper_samples = len(window) // 2
             tapered_data = data.copy()
             # Apply taper to beginning and end
             tapered_data[:taper_samples] *= window[:taper_samples]
@@ -229,33 +284,31 @@ class SignalProcessor:
         Returns:
             Preprocessed Stream
         """
-        processed_stream = stream.copy()
+        processing = self.config.processing
+        batched = (
+            not apply_detrend or processing.detrend_type in BATCH_DETREND_TYPES
+        ) and (not apply_filter or processing.filter_type == "bandpass")
+
+        if batched:
+            # New traces with their own stats; the batches are stacked into
+            # fresh arrays, so the samples need not be copied first
+            processed_stream = Stream(
+                [Trace(data=trace.data, header=trace.stats.copy()) for trace in stream]
+            )
+        else:
+            processed_stream = stream.copy()
 
         logger.info(f"Starting preprocessing of {len(processed_stream)} traces")
 
-        for trace in processed_stream:
-            # Remove mean
-            trace.detrend(type="constant")
-
-            # Apply detrending
-            if apply_detrend:
-                trace.detrend(type=self.config.processing.detrend_type)
-
-            # Apply taper
-            if apply_taper:
-                trace.taper(
-                    max_percentage=self.config.processing.taper_percentage, type="hann"
-                )
-
-            # Apply filter
-            if apply_filter:
-                trace.filter(
-                    self.config.processing.filter_type,
-                    freqmin=self.config.processing.filter_freqmin,
-                    freqmax=self.config.processing.filter_freqmax,
-                    corners=self.config.processing.filter_corners,
-                )
+        if batched:
+            self._preprocess_batched(
+                processed_stream, apply_filter, apply_detrend, apply_taper
+            )
+        else:
+            for trace in processed_stream:
+                self._preprocess_trace(trace, apply_filter, apply_detrend, apply_taper)
 
+        for trace in processed_stream:
             # Resample if requested
             if resample_rate and abs(trace.stats.sampling_rate - resample_rate) > 0.1:
                 trace.resample(resample_rate)
@@ -264,6 +317,67 @@ class SignalProcessor:
         logger.info("Preprocessing completed")
         return processed_stream
 
+    def _preprocess_trace(
+        self,
+        trace: Trace,
+        apply_filter: bool,
+        apply_detrend: bool,
+        apply_taper: bool,
+    ) -> None:
+        """Demean, detrend, taper and filter one trace in place with ObsPy."""
+        processing = self.config.processing
+
+        # Remove mean
+        trace.detrend(type="constant")
+
+        # Apply detrending
+        if apply_detrend:
+            trace.detrend(type=processing.detrend_type)
+
+        # Apply taper
+        if apply_taper:
+            trace.taper(max_percentage=processing.taper_percentage, type="hann")
+
+        # Apply filter
+        if apply_filter:
+            trace.filter(
+                processing.filter_type,
+                freqmin=processing.filter_freqmin,
+                freqmax=processing.filter_freqmax,
+                corners=processing.filter_corners,
+            )
+
+    def _preprocess_batched(
+        self,
+        stream: Stream,
+        apply_filter: bool,
+        apply_detrend: bool,
+        apply_taper: bool,
+    ) -> None:
+        """
+        Preprocess a stream in place, one 2-D batch per trace shape.
+
+        Traces sharing a length, sampling rate and dtype are stacked, detrended
+        and tapered in one pass and bandpass filtered with a single filter
+        design. Results match :meth:`_preprocess_trace`, including its output
+        dtype: float64 after filtering, otherwise the input float dtype.
+        Traces with NaN or infinite samples go through
+        :meth:`_preprocess_trace` instead, so ObsPy rejects or propagates them
+        as before.
+        """
+        processing = self.config.processing
+        unbatched = preprocess_batched(
+            stream,
+            processing.taper_percentage if apply_taper else 0.0,
+            linear=apply_detrend and processing.detrend_type == "linear",
+            filter_type="bandpass" if apply_filter else None,
+            freqmin=processing.filter_freqmin,
+            freqmax=processing.filter_freqmax,
+            corners=processing.filter_corners,
+        )
+        for trace in unbatched:
+            self._preprocess_trace(trace, apply_filter, apply_detrend, apply_taper)
+
 
 def calculate_spectral_features(
     data: np.ndarray, sampling_rate: float, nperseg: Optional[int] = None
@@ -292,26 +406,24 @@ def calculate_spectral_features(
     dominant_freq_idx = np.argmax(psd)
     features["dominant_frequency"] = freqs[dominant_freq_idx]
 
-    # Mean frequency
-    features["mean_frequency"] = np.sum(freqs * psd) / np.sum(psd)
+    # Running energy; its last entry is the total power
+    cumulative_energy = np.cumsum(psd)
+    total_power = cumulative_energy[-1]
 
-    # Spectral centroid
-    features["spectral_centroid"] = np.sum(freqs * psd) / np.sum(psd)
+    # Mean frequency and spectral centroid are the same first moment; the
+    # bandwidth follows from the second as sqrt(E[f^2] - E[f]^2)
+    weighted = freqs * psd
+    centroid = np.sum(weighted) / total_power
+    second_moment = np.dot(weighted, freqs) / total_power
+    features["mean_frequency"] = centroid
+    features["spectral_centroid"] = centroid
 
     # Spectral bandwidth
-    centroid = features["spectral_centroid"]
-    features["spectral_bandwidth"] = np.sqrt(
-        np.sum(((freqs - centroid) ** 2) * psd) / np.sum(psd)
-    )
+    features["spectral_bandwidth"] = np.sqrt(max(second_moment - centroid**2, 0.0))
 
-    # Spectral rolloff (95% of energy)
-    cumulative_energy = np.cumsum(psd)
-    total_energy = cumulative_energy[-1]
-    rolloff_idx = np.where(cumulative_energy >= 0.95 * total_energy)[0]
-    if len(rolloff_idx) > 0:
-        features["spectral_rolloff"] = freqs[rolloff_idx[0]]
-    else:
-        features["spectral_rolloff"] = freqs[-1]
+    # Spectral rolloff (95% of energy); the running energy is non-decreasing
+    rolloff_idx = np.searchsorted(cumulative_energy, 0.95 * total_power)
+    features["spectral_rolloff"] = freqs[min(rolloff_idx, len(freqs) - 1)]
 
     # Zero crossing rate (approximate from frequency domain)
     features["zero_crossing_rate"] = np.sum(np.diff(np.signbit(data))) / len(data)
@@ -330,24 +442,40 @@ def calculate_time_domain_features(data: np.ndarray) -> Dict[str, float]:
     Returns:
         Dictionary of time-domain features
     """
+    data = np.asarray(data)
     features = {}
 
-    # Basic statistics
-    features["mean"] = np.mean(data)
-    features["std"] = np.std(data)
-    features["var"] = np.var(data)
-    features["min"] = np.min(data)
-    features["max"] = np.max(data)
-    features["range"] = features["max"] - features["min"]
-
-    # Peak-to-peak amplitude
-    features["peak_to_peak"] = np.ptp(data)
-
-    # RMS (Root Mean Square)
-    features["rms"] = np.sqrt(np.mean(data**2))
-
-    # Energy
-    features["energy"] = np.sum(data**2)
+    # Basic statistics, from the same single pass trace validation uses
+    finite = False
+    if data.ndim == 1 and len(data) > 0:
+        finite, dmin, dmax, mean, var, _ = trace_stats(data, head_fraction=0.0)
+
+    if finite:
+        features["mean"] = mean
+        features["std"] = np.sqrt(var)
+        features["var"] = var
+        features["min"] = dmin
+        features["max"] = dmax
+        features["range"] = dmax - dmin
+
+        # Peak-to-peak amplitude
+        features["peak_to_peak"] = dmax - dmin
+
+        # RMS and energy follow from the moments: mean(x**2) = var + mean**2
+        mean_square = var + mean**2
+        features["rms"] = np.sqrt(mean_square)
+        features["energy"] = mean_square * len(data)
+    else:
+        # Non-finite or empty data keeps NumPy's propagation and errors
+        features["mean"] = np.mean(data)
+        features["std"] = np.std(data)
+        features["var"] = np.var(data)
+        features["min"] = np.min(data)
+        features["max"] = np.max(data)
+        features["range"] = features["max"] - features["min"]
+        features["peak_to_peak"] = np.ptp(data)
+        features["rms"] = np.sqrt(np.mean(data**2))
+        features["energy"] = np.sum(data**2)
 
     # Higher order moments
     if features["std"] > 0:
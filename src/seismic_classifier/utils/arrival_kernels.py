@@ -0,0 +1,225 @@
+"""STA/LTA and envelope timing kernels for arrival features.
+
+The detector features only need a few scalars per trace: the first sample
+where the STA/LTA ratio crosses the trigger threshold, the peak ratio and the
+number of samples above it. Numba computes them in one pass with running
+window sums, without materialising the ratio; otherwise the ratio is built
+from a cumulative sum with NumPy and reduced afterwards. Envelope rise and
+decay times are scanned the same way.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None  # type: ignore
+
+# Rise and decay times are measured between these fractions of the peak
+_LOW_LEVEL = 0.1
+_HIGH_LEVEL = 0.9
+
+
+def sta_lta(data: np.ndarray, sta_window: int, lta_window: int) -> np.ndarray:
+    """
+    Calculate the STA/LTA ratio along the last axis.
+
+    Both averages cover the samples just before ``i``, so ``sta_lta[i]``
+    uses ``data[i - window : i]``; the first ``lta_window`` entries are
+    zero. Window sums come from one cumulative sum of the squared data.
+
+    Args:
+        data: Array of traces, samples on the last axis
+        sta_window: Short-term window in samples
+        lta_window: Long-term window in samples
+
+    Returns:
+        Float array of the same shape as ``data``
+    """
+    n = data.shape[-1]
+    ratio = np.zeros(data.shape)
+    if n <= lta_window:
+        return ratio
+
+    csum = np.zeros(data.shape[:-1] + (n + 1,))
+    np.cumsum(np.square(data, dtype=np.float64), axis=-1, out=csum[..., 1:])
+
+    # Window sums ending (exclusively) at i = lta_window .. n - 1
+    end = csum[..., lta_window:n]
+    sta = (end - csum[..., lta_window - sta_window : n - sta_window]) / sta_window
+    lta = (end - csum[..., : n - lta_window]) / lta_window
+
+    # Differences of a running sum can dip just below zero in quiet stretches
+    np.maximum(sta, 0.0, out=sta)
+    np.divide(sta, lta, out=ratio[..., lta_window:], where=lta > 0)
+
+    return ratio
+
+
+def _sta_lta_scan_numpy(
+    data: np.ndarray, sta_window: int, lta_window: int, threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """NumPy fallback for :func:`sta_lta_scan`."""
+    ratio = sta_lta(data, sta_window, lta_window)
+    above = ratio > threshold
+    first = np.where(above.any(axis=1), np.argmax(above, axis=1), -1)
+    return first, ratio.max(axis=1), above.sum(axis=1)
+
+
+def rise_time(envelope: np.ndarray) -> float:
+    """Samples between the first 10% and 90% crossings before the peak."""
+    max_idx = np.argmax(envelope)
+
+    idx_10 = np.where(envelope[:max_idx] >= _LOW_LEVEL)[0]
+    idx_90 = np.where(envelope[:max_idx] >= _HIGH_LEVEL)[0]
+
+    if len(idx_10) > 0 and len(idx_90) > 0:
+        return float(idx_90[0] - idx_10[0])
+    else:
+        return 0.0
+
+
+def decay_time(envelope: np.ndarray) -> float:
+    """Samples between the first 90% and 10% levels after the peak."""
+    max_idx = np.argmax(envelope)
+
+    if max_idx >= len(envelope) - 1:
+        return 0.0
+
+    post_peak = envelope[max_idx:]
+    idx_90 = np.where(post_peak <= _HIGH_LEVEL)[0]
+    idx_10 = np.where(post_peak <= _LOW_LEVEL)[0]
+
+    if len(idx_90) > 0 and len(idx_10) > 0:
+        return float(idx_10[0] - idx_90[0])
+    else:
+        return float(len(post_peak))
+
+
+def _envelope_times_numpy(envelope: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """NumPy fallback for :func:`envelope_times`."""
+    rise = np.array([rise_time(row) for row in envelope])
+    decay = np.array([decay_time(row) for row in envelope])
+    return rise, decay
+
+
+if njit is not None:
+
+    # fastmath stays off so NaN samples behave as in the NumPy path. The
+    # extractor runs batches on threads, so the kernels release the GIL
+    # rather than starting their own parallel loops.
+    @njit(nogil=True, cache=True)
+    def _sta_lta_scan_numba(
+        data, sta_window, lta_window, threshold
+    ):  # pragma: no cover
+        n_traces, npts = data.shape
+        first = np.full(n_traces, -1, dtype=np.int64)
+        peak = np.zeros(n_traces)
+        count = np.zeros(n_traces, dtype=np.int64)
+        for r in range(n_traces):
+            row = data[r]
+            sta_sum = 0.0
+            lta_sum = 0.0
+            for j in range(lta_window):
+                x = float(row[j])
+                lta_sum += x * x
+                if j >= lta_window - sta_window:
+                    sta_sum += x * x
+            for i in range(lta_window, npts):
+                sta = max(sta_sum / sta_window, 0.0)
+                lta = lta_sum / lta_window
+                ratio = sta / lta if lta > 0 else 0.0
+                if ratio > peak[r]:
+                    peak[r] = ratio
+                if ratio > threshold:
+                    count[r] += 1
+                    if first[r] < 0:
+                        first[r] = i
+                # Slide both windows one sample forward
+                x = float(row[i])
+                old_sta = float(row[i - sta_window])
+                old_lta = float(row[i - lta_window])
+                sta_sum += x * x - old_sta * old_sta
+                lta_sum += x * x - old_lta * old_lta
+        return first, peak, count
+
+    @njit(nogil=True, cache=True)
+    def _envelope_times_numba(envelope):  # pragma: no cover
+        n_traces, npts = envelope.shape
+        rise = np.zeros(n_traces)
+        decay = np.zeros(n_traces)
+        for r in range(n_traces):
+            row = envelope[r]
+            # First maximum, or the first NaN as np.argmax reports it
+            max_idx = 0
+            for i in range(npts):
+                if np.isnan(row[i]):
+                    max_idx = i
+                    break
+                if row[i] > row[max_idx]:
+                    max_idx = i
+
+            idx_10 = -1
+            idx_90 = -1
+            for i in range(max_idx):
+                if idx_10 < 0 and row[i] >= _LOW_LEVEL:
+                    idx_10 = i
+                if row[i] >= _HIGH_LEVEL:
+                    idx_90 = i
+                    break
+            if idx_10 >= 0 and idx_90 >= 0:
+                rise[r] = idx_90 - idx_10
+
+            if max_idx >= npts - 1:
+                continue
+            idx_90 = -1
+            idx_10 = -1
+            for i in range(max_idx, npts):
+                if idx_90 < 0 and row[i] <= _HIGH_LEVEL:
+                    idx_90 = i
+                if row[i] <= _LOW_LEVEL:
+                    idx_10 = i
+                    break
+            if idx_90 >= 0 and idx_10 >= 0:
+                decay[r] = idx_10 - idx_90
+            else:
+                decay[r] = npts - max_idx
+        return rise, decay
+
+
+def sta_lta_scan(
+    data: np.ndarray, sta_window: int, lta_window: int, threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reduce the STA/LTA ratio of every row to its trigger statistics.
+
+    Args:
+        data: Array of shape ``(n_traces, npts)`` with ``npts > lta_window``
+        sta_window: Short-term window in samples
+        lta_window: Long-term window in samples
+        threshold: Trigger level for the ratio
+
+    Returns:
+        Tuple of the first sample above ``threshold`` (-1 if none), the peak
+        ratio and the number of samples above ``threshold``, one per row
+    """
+    if njit is not None and sta_window > 0:
+        return _sta_lta_scan_numba(data, sta_window, lta_window, threshold)
+    return _sta_lta_scan_numpy(data, sta_window, lta_window, threshold)
+
+
+def envelope_times(envelope: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rise and decay times of every row of a peak-normalised envelope.
+
+    Args:
+        envelope: Array of shape ``(n_traces, npts)`` scaled to a peak of 1
+
+    Returns:
+        Tuple of rise and decay times in samples, one per row
+    """
+    if njit is not None:
+        return _envelope_times_numba(envelope)
+    return _envelope_times_numpy(envelope)
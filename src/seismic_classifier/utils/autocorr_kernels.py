@@ -0,0 +1,90 @@
+"""First zero crossing of batched autocorrelations.
+
+The autocorrelation feature only needs the lag where the sign first changes,
+which is usually a handful of lags in. Numba scans each row and stops there,
+flushing FFT round-off and normalising sample by sample; otherwise NumPy
+normalises every lag and compares the signs of whole rows.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None  # type: ignore
+
+
+def normalize(autocorr: np.ndarray, n_lags: Optional[int] = None) -> np.ndarray:
+    """
+    Flush round-off and scale each row by its zero-lag value.
+
+    FFT round-off turns exact zeros of the direct sum into tiny values of
+    either sign; they are set to zero so signs match the direct correlation.
+
+    Args:
+        autocorr: Array of shape ``(n_traces, npts)``, starting at lag 0
+        n_lags: Normalise only this many leading lags, default all
+
+    Returns:
+        Normalised copy of the leading lags; rows with a zero lag-0 value
+        are NaN
+    """
+    zero_lag = autocorr[:, :1]
+    tolerance = autocorr.shape[1] * np.finfo(float).eps * zero_lag
+    lags = autocorr[:, :n_lags]
+    flushed = np.where(np.abs(lags) <= tolerance, 0.0, lags)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return flushed / zero_lag
+
+
+def _first_zero_crossing_numpy(autocorr: np.ndarray) -> np.ndarray:
+    """NumPy fallback for :func:`first_zero_crossing`."""
+    signs = np.sign(normalize(autocorr))
+    crossings = signs[:, 1:] != signs[:, :-1]
+    first = np.argmax(crossings, axis=1)
+    return np.where(crossings.any(axis=1), first, autocorr.shape[1])
+
+
+if njit is not None:
+
+    # error_model="numpy" gives NaN/inf for a zero lag-0 value, as NumPy does
+    @njit(nogil=True, cache=True, error_model="numpy")
+    def _first_zero_crossing_numba(autocorr):  # pragma: no cover
+        n_traces, n_lags = autocorr.shape
+        first = np.full(n_traces, n_lags, dtype=np.int64)
+        eps = np.finfo(np.float64).eps
+        for r in range(n_traces):
+            row = autocorr[r]
+            zero_lag = row[0]
+            tolerance = n_lags * eps * zero_lag
+            previous = np.sign(row[0] / zero_lag)
+            for i in range(1, n_lags):
+                x = row[i]
+                if abs(x) <= tolerance:
+                    x = 0.0
+                current = np.sign(x / zero_lag)
+                # NaN never equals itself, so NaN signs count as a change
+                if current != previous:
+                    first[r] = i - 1
+                    break
+                previous = current
+        return first
+
+
+def first_zero_crossing(autocorr: np.ndarray) -> np.ndarray:
+    """
+    Index of the first sign change of every autocorrelation row.
+
+    Args:
+        autocorr: Unnormalised array of shape ``(n_traces, n_lags)`` starting
+            at lag 0
+
+    Returns:
+        Integer array with the lag ``i`` where the sign of lag ``i + 1`` first
+        differs, or ``n_lags`` for rows without a sign change
+    """
+    if njit is not None:
+        return _first_zero_crossing_numba(autocorr)
+    return _first_zero_crossing_numpy(autocorr)
@@ -0,0 +1,122 @@
+"""Fused moment and histogram kernels for statistical features.
+
+Skewness, kurtosis and histogram entropy all reduce the same samples. Numba
+gathers the range and mean in one pass over each trace and the central
+moments and histogram counts in a second; otherwise NumPy computes the
+moments from one set of deviations and bins every row with a single
+``np.bincount``.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None  # type: ignore
+
+
+class RowMoments(NamedTuple):
+    """Per-row mean, central moments and equal-width histogram counts."""
+
+    mean: np.ndarray
+    m2: np.ndarray
+    m3: np.ndarray
+    m4: np.ndarray
+    span: np.ndarray
+    counts: np.ndarray
+
+
+def _row_moments_numpy(data: np.ndarray, bins: int) -> RowMoments:
+    """NumPy fallback for :func:`row_moments`."""
+    n_rows = data.shape[0]
+    mean = data.mean(axis=1)
+    deviation = data - mean[:, None]
+    squared = deviation * deviation
+    m2 = squared.mean(axis=1)
+    m3 = np.einsum("ij,ij->i", squared, deviation) / data.shape[1]
+    m4 = np.einsum("ij,ij->i", squared, squared) / data.shape[1]
+
+    dmin = data.min(axis=1)
+    span = data.max(axis=1) - dmin
+    regular = np.isfinite(span) & (span > 0)
+    safe_span = np.where(regular, span, 1.0)
+    scaled = (data - np.where(regular, dmin, 0.0)[:, None]) / safe_span[:, None]
+    with np.errstate(invalid="ignore"):
+        idx = (scaled * bins).astype(np.intp)
+    # The maximum lands on index ``bins``; like np.histogram, count it in the last
+    np.clip(idx, 0, bins - 1, out=idx)
+    idx += bins * np.arange(n_rows)[:, None]
+    counts = np.bincount(idx.ravel(), minlength=n_rows * bins).reshape(n_rows, bins)
+    counts[~regular] = 0
+
+    return RowMoments(mean, m2, m3, m4, span, counts)
+
+
+if njit is not None:
+
+    # fastmath stays off: bin edges must round exactly as in the NumPy path
+    @njit(nogil=True, cache=True)
+    def _row_moments_numba(data, bins):  # pragma: no cover
+        n_rows, npts = data.shape
+        mean = np.empty(n_rows)
+        m2 = np.empty(n_rows)
+        m3 = np.empty(n_rows)
+        m4 = np.empty(n_rows)
+        span = np.empty(n_rows)
+        counts = np.zeros((n_rows, bins), dtype=np.int64)
+        for r in range(n_rows):
+            row = data[r]
+            lo = np.inf
+            hi = -np.inf
+            total = 0.0
+            for i in range(npts):
+                x = row[i]
+                total += x
+                if x < lo:
+                    lo = x
+                if x > hi:
+                    hi = x
+            # NaN never wins a comparison, but it does poison the sum
+            width = hi - lo if np.isfinite(total) else np.nan
+            mu = total / npts
+            regular = np.isfinite(width) and width > 0
+
+            s2 = 0.0
+            s3 = 0.0
+            s4 = 0.0
+            for i in range(npts):
+                x = row[i]
+                d = x - mu
+                d2 = d * d
+                s2 += d2
+                s3 += d2 * d
+                s4 += d2 * d2
+                if regular:
+                    k = int((x - lo) / width * bins)
+                    counts[r, min(max(k, 0), bins - 1)] += 1
+
+            mean[r] = mu
+            m2[r] = s2 / npts
+            m3[r] = s3 / npts
+            m4[r] = s4 / npts
+            span[r] = width
+        return mean, m2, m3, m4, span, counts
+
+
+def row_moments(data: np.ndarray, bins: int = 50) -> RowMoments:
+    """
+    Compute moments and histogram counts of every row.
+
+    Args:
+        data: Float array of shape ``(n_traces, npts)``
+        bins: Number of equal-width bins spanning each row's range
+
+    Returns:
+        :class:`RowMoments` with one entry per row. Counts are zero for rows
+        whose range is zero or not finite.
+    """
+    if njit is not None:
+        return RowMoments(*_row_moments_numba(data, bins))
+    return _row_moments_numpy(data, bins)
@@ -0,0 +1,93 @@
+"""Single-pass trace statistics for waveform quality checks.
+
+Trace validation needs the extremes, a finiteness flag and the variance of
+the whole trace and of its leading noise window. Numba computes all of them
+in one pass over the samples when installed; otherwise NumPy reductions are
+used.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None  # type: ignore
+
+TraceStats = Tuple[bool, float, float, float, float, float]
+
+
+def _trace_stats_numpy(data: np.ndarray, n_head: int) -> TraceStats:
+    """NumPy fallback for :func:`trace_stats`."""
+    dmin = float(data.min())
+    dmax = float(data.max())
+    # min/max propagate NaN and surface infinities, so they double as the check
+    if not (np.isfinite(dmin) and np.isfinite(dmax)):
+        return False, dmin, dmax, np.nan, np.nan, np.nan
+    # Read samples in their native dtype but accumulate in double precision;
+    # float32 accumulators lose the variance of small signals on large offsets
+    mean = float(data.mean(dtype=np.float64))
+    var = float(data.var(dtype=np.float64))
+    head_var = float(data[:n_head].var(dtype=np.float64)) if n_head > 0 else np.nan
+    return True, dmin, dmax, mean, var, head_var
+
+
+if njit is not None:
+
+    # fastmath is deliberately off: it lets LLVM assume away NaN and inf.
+    # nogil lets the validator check traces on several threads at once.
+    @njit(nogil=True, cache=True)
+    def _trace_stats_numba(data, n_head):  # pragma: no cover
+        dmin = np.inf
+        dmax = -np.inf
+        mean = 0.0
+        m2 = 0.0
+        head_mean = 0.0
+        head_m2 = 0.0
+        for i in range(data.shape[0]):
+            # Cast first: integer samples cannot be tested with isnan/isinf
+            x = float(data[i])
+            if not np.isfinite(x):
+                # The trace is rejected outright, so stop at the first bad sample
+                return False, x, x, np.nan, np.nan, np.nan
+            if x < dmin:
+                dmin = x
+            if x > dmax:
+                dmax = x
+            delta = x - mean
+            mean += delta / (i + 1)
+            m2 += delta * (x - mean)
+            if i < n_head:
+                delta = x - head_mean
+                head_mean += delta / (i + 1)
+                head_m2 += delta * (x - head_mean)
+        var = m2 / data.shape[0]
+        head_var = head_m2 / n_head if n_head > 0 else np.nan
+        return True, dmin, dmax, mean, var, head_var
+
+
+def trace_stats(data: np.ndarray, head_fraction: float = 0.1) -> TraceStats:
+    """
+    Compute the statistics trace validation needs.
+
+    Args:
+        data: Non-empty 1-D sample array
+        head_fraction: Fraction of leading samples used as the noise window
+
+    Returns:
+        Tuple of (all samples finite, min, max, mean, variance, variance of
+        the leading ``head_fraction`` of samples or NaN if that is empty).
+        The statistics are unspecified when the finiteness flag is False.
+    """
+    n_head = int(head_fraction * len(data))
+    if njit is not None and data.ndim == 1:
+        return _trace_stats_numba(data, n_head)
+    return _trace_stats_numpy(data, n_head)
+
+
+def warm_up() -> None:
+    """Compile the Numba kernel ahead of the first real trace."""
+    if njit is not None:
+        for dtype in (np.int32, np.float32, np.float64):
+            trace_stats(np.zeros(16, dtype=dtype))
@@ -0,0 +1,238 @@
+"""Tests for error handling and resilience utilities."""
+
+import threading
+
+import pytest
+
+from seismic_classifier.data_pipeline.error_handling import (
+    Bulkhead,
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    ErrorHandler,
+    HealthChecker,
+    LRUCounter,
+    RetryPolicy,
+    ttl_cache,
+)
+
+
+@pytest.fixture
+def health_checker():
+    """Create a HealthChecker instance."""
+    return HealthChecker()
+
+
+class TestTTLCache:
+    """Test cases for the ttl_cache decorator."""
+
+    def test_returns_cached_value_within_ttl(self):
+        """Test repeated calls inside the TTL reuse the first result."""
+        calls = []
+
+        @ttl_cache(seconds=60.0)
+        def probe():
+            calls.append(1)
+            return len(calls)
+
+        assert probe() == 1
+        assert probe() == 1
+        assert len(calls) == 1
+
+    def test_recomputes_after_expiry(self):
+        """Test a zero TTL always re-evaluates the function."""
+        calls = []
+
+        @ttl_cache(seconds=0.0)
+        def probe():
+            calls.append(1)
+            return len(calls)
+
+        assert probe() == 1
+        assert probe() == 2
+
+    def test_cache_clear(self):
+        """Test clearing the cache forces re-evaluation."""
+        calls = []
+
+        @ttl_cache(seconds=60.0)
+        def probe():
+            calls.append(1)
+            return len(calls)
+
+        probe()
+        probe.cache_clear()
+        assert probe() == 2
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy."""
+
+    def test_full_jitter_within_bounds(self):
+        """Test full jitter draws delays from [0, capped delay]."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+        delays = [policy.calculate_delay(5) for _ in range(200)]
+
+        assert all(0.0 <= d <= 4.0 for d in delays)
+        assert min(delays) < 2.0
+
+    def test_equal_jitter_within_bounds(self):
+        """Test equal jitter keeps delays in the upper half of the range."""
+        policy = RetryPolicy(base_delay=1.0, jitter_mode="equal")
+        delays = [policy.calculate_delay(2) for _ in range(200)]
+
+        assert all(2.0 <= d <= 4.0 for d in delays)
+
+    def test_no_jitter(self):
+        """Test disabling jitter yields the exact exponential delay."""
+        assert RetryPolicy(base_delay=1.0, jitter=False).calculate_delay(3) == 8.0
+        assert RetryPolicy(base_delay=1.0, jitter_mode="none").calculate_delay(3) == 8.0
+
+    def test_retryable_exceptions_extendable(self):
+        """Test exception types added to the public list are retried."""
+        policy = RetryPolicy()
+        assert not policy.should_retry(KeyError("k"), 0)
+
+        policy.retryable_exceptions = policy.retryable_exceptions + [KeyError]
+
+        assert policy.should_retry(KeyError("k"), 0)
+        assert KeyError not in RetryPolicy().retryable_exceptions
+
+    def test_invalid_jitter_mode(self):
+        """Test unknown jitter modes are rejected."""
+        with pytest.raises(ValueError):
+            RetryPolicy(jitter_mode="bogus")
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker and Bulkhead."""
+
+    def test_bulkhead_capacity(self):
+        """Test a bulkhead refuses acquisitions beyond its capacity."""
+        bulkhead = Bulkhead(1)
+
+        assert bulkhead.acquire()
+        assert not bulkhead.acquire()
+        bulkhead.release()
+        assert bulkhead.acquire()
+
+    def test_bulkhead_fails_fast_when_full(self):
+        """Test concurrent calls beyond max_concurrent are rejected."""
+        breaker = CircuitBreaker(max_concurrent=1)
+        entered = threading.Event()
+        release = threading.Event()
+
+        @breaker
+        def slow_call():
+            entered.set()
+            release.wait(5)
+            return "done"
+
+        worker = threading.Thread(target=slow_call)
+        worker.start()
+        entered.wait(5)
+
+        with pytest.raises(CircuitBreakerOpenError):
+            slow_call()
+
+        release.set()
+        worker.join()
+        assert slow_call() == "done"
+
+    def test_half_open_allows_single_probe(self):
+        """Test only one probe reaches the backend while HALF_OPEN."""
+        breaker = CircuitBreaker(failure_threshold=1, timeout=0.0)
+        entered = threading.Event()
+        release = threading.Event()
+
+        @breaker
+        def flaky(fail=False):
+            if fail:
+                raise ConnectionError("down")
+            entered.set()
+            release.wait(5)
+            return "ok"
+
+        with pytest.raises(ConnectionError):
+            flaky(fail=True)
+
+        worker = threading.Thread(target=flaky)
+        worker.start()
+        entered.wait(5)
+
+        with pytest.raises(CircuitBreakerOpenError):
+            flaky()
+
+        release.set()
+        worker.join()
+        assert flaky() == "ok"
+
+
+class TestErrorHandler:
+    """Test cases for ErrorHandler and its bounded counters."""
+
+    def test_lru_counter_evicts_least_recent(self):
+        """Test the counter drops the least recently updated key at capacity."""
+        counter = LRUCounter(maxsize=2)
+        counter.increment("a")
+        counter.increment("b")
+        counter.increment("a")
+        counter.increment("c")
+
+        assert dict(counter) == {"a": 2, "c": 1}
+
+    def test_error_summary_counts(self):
+        """Test handled errors are counted by type and severity."""
+        handler = ErrorHandler()
+        handler.handle_error(ValueError("bad"))
+        handler.handle_error(ValueError("worse"))
+
+        summary = handler.get_error_summary()
+        assert summary["error_counts_by_type"] == {"ValueError:medium": 2}
+        assert summary["total_errors"] == 2
+        assert summary["recent_errors_1h"] == 2
+
+    def test_recent_errors_window(self):
+        """Test errors older than an hour drop out of the recent count."""
+        handler = ErrorHandler()
+        handler.handle_error(ValueError("old"))
+        handler.handle_error(ValueError("new"))
+        handler._error_ts[0] -= 7200.0
+
+        assert handler.get_error_summary()["recent_errors_1h"] == 1
+
+    def test_history_trimmed(self):
+        """Test timestamps are trimmed along with the error history."""
+        handler = ErrorHandler()
+        handler.max_history = 2
+        for i in range(3):
+            handler.handle_error(ValueError(str(i)))
+
+        assert [e["message"] for e in handler.error_history] == ["1", "2"]
+        assert len(handler._error_ts) == 2
+        assert handler.get_error_summary()["recent_errors_1h"] == 2
+
+
+class TestHealthChecker:
+    """Test cases for HealthChecker."""
+
+    def test_run_checks_does_not_mutate_cached_results(self, health_checker):
+        """Test timestamps are stamped on copies of cached check results."""
+        results = health_checker.run_checks()
+
+        assert "disk_space" in results
+        cached = health_checker.checks["disk_space"]()
+        assert "timestamp" not in cached
+
+    def test_overall_health_uses_tallied_counts(self, health_checker):
+        """Test overall health reflects the statuses from the last run."""
+        health_checker.checks = {
+            "ok": lambda: {"status": "healthy"},
+            "broken": lambda: {"status": "error"},
+        }
+        health_checker.run_checks()
+
+        health = health_checker.get_overall_health()
+        assert health["healthy_checks"] == 1
+        assert health["error_checks"] == 1
+        assert health["status"] == "unhealthy"
+        assert health["total_checks"] == 2
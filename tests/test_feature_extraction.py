@@ -0,0 +1,378 @@
+"""Tests for waveform feature extraction."""
+
+import numpy as np
+import pandas as pd
+import pytest
+import pywt
+from obspy import Stream, Trace
+from scipy import signal, stats
+
+from seismic_classifier.config.settings import Config
+from seismic_classifier.feature_engineering.feature_extraction import (
+    FeatureExtractor,
+    _envelope,
+    _histogram_entropy,
+)
+from seismic_classifier.utils import arrival_kernels, autocorr_kernels, moment_kernels
+
+
+def reference_sta_lta(data, sta_window, lta_window):
+    """Per-sample STA/LTA as originally defined."""
+    sta_lta = np.zeros(len(data))
+    for i in range(lta_window, len(data)):
+        sta = np.mean(data[i - sta_window : i] ** 2)
+        lta = np.mean(data[i - lta_window : i] ** 2)
+        if lta > 0:
+            sta_lta[i] = sta / lta
+    return sta_lta
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    """Create a FeatureExtractor instance."""
+    return FeatureExtractor(Config(cache_dir=tmp_path))
+
+
+@pytest.fixture
+def waveform():
+    """Noise with an impulsive arrival one third of the way in."""
+    rng = np.random.default_rng(0)
+    data = rng.normal(0.0, 1.0, 3000)
+    data[1000:1200] += 20.0 * np.sin(np.linspace(0, 40 * np.pi, 200))
+    return data
+
+
+class TestStaLta:
+    """Test cases for the STA/LTA detector."""
+
+    def test_matches_reference(self, extractor, waveform):
+        """Test the vectorized ratio equals the per-sample definition."""
+        result = extractor._calculate_sta_lta(waveform, 100, 1000)
+
+        np.testing.assert_allclose(
+            result, reference_sta_lta(waveform, 100, 1000), rtol=1e-9, atol=1e-12
+        )
+
+    def test_silent_and_short_traces(self, extractor, waveform):
+        """Test zero-energy windows and too-short traces give zeros."""
+        data = np.zeros(3000, dtype=np.int32)
+        data[2500:] = 5
+
+        result = extractor._calculate_sta_lta(data, 100, 1000)
+
+        np.testing.assert_allclose(result, reference_sta_lta(data, 100, 1000))
+        assert not extractor._calculate_sta_lta(waveform[:500], 100, 1000).any()
+
+    def test_scan_matches_ratio(self, waveform):
+        """Test the trigger statistics agree with the full ratio."""
+        quiet = np.zeros(3000)
+        quiet[2000:] = 1.0
+        data = np.stack([waveform, waveform[::-1], quiet])
+
+        first, peak, count = arrival_kernels.sta_lta_scan(data, 100, 1000, 3.0)
+        expected = arrival_kernels._sta_lta_scan_numpy(data, 100, 1000, 3.0)
+
+        np.testing.assert_array_equal(first, expected[0])
+        np.testing.assert_allclose(peak, expected[1], rtol=1e-9)
+        np.testing.assert_array_equal(count, expected[2])
+        assert first[0] > 1000
+
+
+class TestEnvelope:
+    """Test cases for the signal envelope."""
+
+    @pytest.mark.parametrize("n", [3000, 3001])
+    def test_matches_hilbert(self, waveform, n):
+        """Test the envelope equals the magnitude of scipy's analytic signal."""
+        data = np.stack([np.resize(waveform, n), np.resize(waveform[::-1], n)])
+
+        np.testing.assert_allclose(
+            _envelope(data),
+            np.abs(signal.hilbert(data, axis=-1)),
+            rtol=1e-9,
+            atol=1e-12,
+        )
+
+
+class TestEnvelopeTimes:
+    """Test cases for envelope rise and decay times."""
+
+    def test_matches_per_row_scan(self):
+        """Test batched times equal the single-envelope definitions."""
+        t = np.linspace(0.0, 1.0, 500)
+        envelope = np.stack(
+            [
+                np.exp(-(((t - 0.3) / 0.05) ** 2)),
+                np.minimum(t * 4, 1.0),
+                np.linspace(1.0, 0.5, 500),
+                np.full(500, np.nan),
+            ]
+        )
+
+        rise, decay = arrival_kernels.envelope_times(envelope)
+
+        for row, env in enumerate(envelope):
+            assert rise[row] == arrival_kernels.rise_time(env)
+            assert decay[row] == arrival_kernels.decay_time(env)
+        assert rise[0] > 0 and decay[0] > 0
+
+
+class TestAutocorrelation:
+    """Test cases for autocorrelation features."""
+
+    def test_matches_direct_correlation(self, extractor, waveform):
+        """Test the FFT autocorrelation agrees with np.correlate."""
+        step = np.zeros(3000)
+        step[2500:] = 5.0
+        data = np.stack([waveform, step, np.sin(np.arange(3000) / 7.0)])
+
+        features = extractor._extract_autocorrelation_features(data)
+
+        for i, row in enumerate(data):
+            autocorr = np.correlate(row, row, mode="full")[len(row) - 1 :]
+            autocorr = autocorr / autocorr[0]
+            crossings = np.where(np.diff(np.sign(autocorr)))[0]
+            first_zero = crossings[0] if len(crossings) else len(autocorr)
+            assert features["autocorr_first_zero"][i] == first_zero
+            assert features["autocorr_decay"][i] == pytest.approx(
+                np.mean(autocorr[1:11])
+            )
+
+    def test_first_zero_crossing_matches_sign_diff(self):
+        """Test the crossing scan matches diffing signs of whole rows."""
+        rng = np.random.default_rng(3)
+        autocorr = rng.normal(size=(5, 200)).cumsum(axis=1)
+        autocorr[:, 0] = 50.0
+        autocorr[1] = np.linspace(50.0, 1.0, 200)  # never crosses
+        autocorr[2] = 0.0  # silent trace
+        autocorr[3, 7] = np.nan
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            signs = np.sign(autocorr / autocorr[:, :1])
+        crossings = np.diff(signs, axis=1) != 0
+        expected = np.where(crossings.any(axis=1), np.argmax(crossings, axis=1), 200)
+
+        np.testing.assert_array_equal(
+            autocorr_kernels.first_zero_crossing(autocorr), expected
+        )
+        np.testing.assert_array_equal(
+            autocorr_kernels._first_zero_crossing_numpy(autocorr), expected
+        )
+
+
+class TestFFTFeatures:
+    """Test cases for FFT band features."""
+
+    @pytest.mark.parametrize("n", [3000, 3001])
+    def test_matches_full_fft(self, extractor, waveform, n):
+        """Test band powers equal those of the full complex FFT."""
+        data = np.resize(waveform, n)
+        spectrum = np.fft.fft(data)
+        freqs = np.fft.fftfreq(n, 1 / 100.0)
+        power = np.abs(spectrum[freqs > 0]) ** 2
+        freqs = freqs[freqs > 0]
+
+        features = extractor._extract_fft_features(np.stack([data, 2 * data]), 100.0)
+
+        bands = {
+            "very_low": (0.1, 1.0),
+            "low": (1.0, 5.0),
+            "mid": (5.0, 15.0),
+            "high": (15.0, 50.0),
+        }
+        for band, (f_min, f_max) in bands.items():
+            expected = power[(freqs >= f_min) & (freqs <= f_max)].sum()
+            np.testing.assert_allclose(
+                features[f"fft_power_{band}"], [expected, 4 * expected]
+            )
+            np.testing.assert_allclose(
+                features[f"fft_ratio_{band}"], expected / power.sum()
+            )
+
+
+class TestBatchExtraction:
+    """Test cases for extracting features from stacked traces."""
+
+    def test_batch_matches_single_traces(self, extractor, waveform):
+        """Test stacking traces does not change their features."""
+        traces = []
+        for i, n in enumerate([3000, 2500, 3000, 3000]):
+            trace = Trace(
+                np.roll(waveform, 50 * i)[:n], header={"sampling_rate": 100.0}
+            )
+            trace.stats.station = f"S{i}"
+            traces.append(trace)
+        traces[2].stats.distance = 12.5
+
+        batched = extractor.extract_all_features(Stream(traces))
+        single = pd.concat(
+            [extractor.extract_all_features(Stream([tr])) for tr in traces],
+            ignore_index=True,
+        )
+        single["trace_index"] = range(len(traces))
+
+        assert batched["trace_id"].tolist() == [tr.id for tr in traces]
+        pd.testing.assert_frame_equal(
+            batched[sorted(batched.columns)],
+            single[sorted(single.columns)],
+            check_exact=False,
+            rtol=1e-9,
+        )
+
+    def test_empty_stream(self, extractor):
+        """Test an empty stream gives an empty frame."""
+        assert extractor.extract_all_features(Stream()).empty
+
+    def test_single_precision_output(self, extractor, waveform):
+        """Test float32 output rounds the double-precision features."""
+        stream = Stream([Trace(waveform, header={"sampling_rate": 100.0})])
+
+        double = extractor.extract_all_features(stream)
+        single = extractor.extract_all_features(stream, dtype=np.float32)
+
+        features = double.columns.drop(["trace_id", "trace_index"])
+        assert (single[features].dtypes == np.float32).all()
+        pd.testing.assert_frame_equal(
+            single, double.astype({name: np.float32 for name in features})
+        )
+
+    def test_threaded_matches_serial(self, tmp_path, waveform):
+        """Test extracting batches on worker threads gives the same frame."""
+        stream = Stream(
+            [
+                Trace(np.roll(waveform, 25 * i), header={"sampling_rate": 100.0})
+                for i in range(12)
+            ]
+        )
+
+        serial = FeatureExtractor(Config(cache_dir=tmp_path, n_jobs=1))
+        threaded = FeatureExtractor(Config(cache_dir=tmp_path, n_jobs=4))
+
+        pd.testing.assert_frame_equal(
+            threaded.extract_all_features(stream),
+            serial.extract_all_features(stream),
+            check_exact=False,
+            rtol=1e-9,
+        )
+
+
+class TestCWTFeatures:
+    """Test cases for Morlet CWT features."""
+
+    @pytest.mark.parametrize("n", [3000, 3001, 40])
+    def test_matches_pywt(self, extractor, waveform, n):
+        """Test FFT-domain filtering reproduces pywt.cwt energies."""
+        data = np.stack([np.resize(waveform, n), np.resize(waveform[::-1], n)])
+        scales = np.arange(1, 32)
+        coefficients, _ = pywt.cwt(data, scales, "morl", axis=-1)
+        energy = np.mean(coefficients**2, axis=-1)
+
+        features = extractor._extract_cwt_features(data, 100.0)
+
+        np.testing.assert_allclose(
+            features["cwt_energy_low"], energy[:8].mean(axis=0), rtol=1e-9
+        )
+        np.testing.assert_allclose(
+            features["cwt_energy_high"], energy[16:].mean(axis=0), rtol=1e-9
+        )
+        np.testing.assert_array_equal(
+            features["cwt_dominant_scale"], scales[energy.argmax(axis=0)]
+        )
+
+    def test_gpu_request_matches_cpu(self, extractor, waveform):
+        """Test use_gpu gives the CPU results, with or without a device."""
+        data = np.stack([waveform] * 32)
+        gpu_extractor = FeatureExtractor(extractor.config, use_gpu=True)
+
+        expected = extractor._extract_cwt_features(data, 100.0)
+        features = gpu_extractor._extract_cwt_features(data, 100.0)
+
+        for name, values in expected.items():
+            np.testing.assert_allclose(features[name], values, rtol=1e-9)
+
+
+class TestDWTFeatures:
+    """Test cases for discrete wavelet features."""
+
+    def test_matches_per_trace_wavedec(self, extractor, waveform):
+        """Test batched decomposition matches decomposing each trace."""
+        data = np.stack([waveform, waveform[::-1]])
+
+        features = extractor._extract_dwt_features(data)
+
+        for row, trace in enumerate(data):
+            coeffs = pywt.wavedec(trace, "db4", level=5)
+            for i, coeff in enumerate(coeffs):
+                name = "approx" if i == 0 else f"detail_{i}"
+                assert features[f"dwt_{name}_energy"][row] == pytest.approx(
+                    np.sum(coeff**2)
+                )
+                assert features[f"dwt_{name}_std"][row] == pytest.approx(
+                    np.std(coeff)
+                )
+
+
+class TestEntropy:
+    """Test cases for histogram entropy."""
+
+    def test_matches_numpy_histogram(self, waveform):
+        """Test batched entropy equals the np.histogram density definition."""
+        data = np.stack([waveform, waveform**2, np.full(3000, 4.0)])
+
+        entropy = _histogram_entropy(data)
+
+        for row, values in enumerate(data):
+            hist, _ = np.histogram(values, bins=50, density=True)
+            hist = hist[hist > 0]
+            assert entropy[row] == pytest.approx(
+                -np.sum(hist * np.log2(hist)), rel=1e-12
+            )
+
+
+class TestStatisticalFeatures:
+    """Test cases for moment-based statistical features."""
+
+    def test_moments_match_scipy(self, extractor, waveform):
+        """Test fused moments reproduce scipy's skewness and kurtosis."""
+        data = np.stack([waveform, waveform**2, np.abs(waveform)])
+
+        features = extractor._extract_statistical_features(data)
+
+        np.testing.assert_allclose(
+            features["stat_skewness"], stats.skew(data, axis=1), rtol=1e-9
+        )
+        np.testing.assert_allclose(
+            features["stat_kurtosis"], stats.kurtosis(data, axis=1), rtol=1e-9
+        )
+
+    def test_kernel_matches_numpy(self, waveform):
+        """Test the moment kernel agrees with its NumPy fallback."""
+        data = np.stack([waveform, np.full(3000, 2.0), np.cumsum(waveform)])
+
+        result = moment_kernels.row_moments(data, bins=50)
+        expected = moment_kernels._row_moments_numpy(data, bins=50)
+
+        for got, want in zip(result, expected):
+            np.testing.assert_allclose(got, want, rtol=1e-9, atol=1e-12)
+
+
+class TestSpectrogramFeatures:
+    """Test cases for spectrogram features."""
+
+    @pytest.mark.parametrize("n", [3000, 600, 60])
+    def test_matches_default_spectrogram(self, extractor, waveform, n):
+        """Test the real-FFT spectrogram reproduces signal.spectrogram."""
+        data = np.stack([waveform[:n], waveform[::-1][:n]])
+        _, _, Sxx = signal.spectrogram(data, 100.0, nperseg=min(256, n // 4))
+
+        features = extractor._extract_spectrogram_features(data, 100.0)
+
+        np.testing.assert_allclose(
+            features["spec_bandwidth_mean"], Sxx.std(axis=1).mean(axis=1), rtol=1e-9
+        )
+        np.testing.assert_allclose(
+            features["spec_centroid_std"], Sxx.mean(axis=1).std(axis=1), rtol=1e-9
+        )
+        np.testing.assert_allclose(
+            features["spec_flux"], np.mean(np.diff(Sxx, axis=2) ** 2, axis=(1, 2))
+        )
@@ -0,0 +1,656 @@
+"""Tests for the IRIS client using an offline FDSN stand-in."""
+
+import io
+import os
+import subprocess
+import sys
+import threading
+from datetime import datetime
+
+import aiohttp
+import numpy as np
+import obspy.clients.fdsn
+import pytest
+from obspy import Inventory, Stream, Trace, UTCDateTime
+from obspy.core.event import Event, Origin
+from obspy.clients.fdsn.header import (
+    FDSNBadRequestException,
+    FDSNNoDataException,
+    FDSNServiceUnavailableException,
+)
+from obspy.core.inventory import Channel, Network, Response, Station
+
+from seismic_classifier.config.settings import Config
+from seismic_classifier.data_pipeline import iris_client
+from seismic_classifier.data_pipeline.iris_client import (
+    IRISClient,
+    IRISClientError,
+    IRISDataError,
+    IRISNetworkError,
+    preprocess_waveform,
+)
+
+
+def make_trace(network="IU", station="ANMO", channel="BHZ", npts=4000):
+    """Create a synthetic trace with the given identifiers."""
+    trace = Trace(data=np.random.randn(npts))
+    trace.stats.network = network
+    trace.stats.station = station
+    trace.stats.channel = channel
+    trace.stats.sampling_rate = 100.0
+    trace.stats.starttime = UTCDateTime(2024, 1, 1)
+    return trace
+
+
+class FakeFDSNClient:
+    """Minimal stand-in for obspy's FDSN client."""
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+        self.fail_bulk = False
+        self.inventory = Inventory(
+            networks=[
+                Network(
+                    "IU",
+                    stations=[
+                        Station("ANMO", latitude=34.9, longitude=-106.5, elevation=0),
+                        Station("COLA", latitude=35.5, longitude=-106.0, elevation=0),
+                    ],
+                )
+            ]
+        )
+
+    def get_stations(self, **kwargs):
+        self.calls.append(("get_stations", kwargs))
+        return self.inventory
+
+    def get_waveforms(self, network, station, channel="*", **kwargs):
+        self.calls.append(
+            ("get_waveforms", dict(kwargs, station=station, channel=channel))
+        )
+        channels = ["BHZ"] if channel == "*" else channel.split(",")
+        return Stream([make_trace(network, station, cha) for cha in channels])
+
+    def get_waveforms_bulk(self, bulk, **kwargs):
+        self.calls.append(("get_waveforms_bulk", bulk))
+        if self.fail_bulk:
+            raise RuntimeError("bulk unavailable")
+        return Stream([make_trace(net, sta, cha) for net, sta, _, cha, *_ in bulk])
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response."""
+
+    def __init__(self, body, status=200, headers=None):
+        self.body = body
+        self.status = status
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def read(self):
+        return self.body
+
+
+class FakeSession:
+    """Minimal stand-in for aiohttp.ClientSession serving MiniSEED."""
+
+    requests = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get(self, url, params=None):
+        FakeSession.requests.append(params)
+        buffer = io.BytesIO()
+        Stream([make_trace(params["net"], params["sta"])]).write(
+            buffer, format="MSEED"
+        )
+        return FakeResponse(buffer.getvalue())
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """Create an IRISClient backed by the fake FDSN client."""
+    monkeypatch.setattr(obspy.clients.fdsn, "Client", FakeFDSNClient)
+    monkeypatch.setattr(iris_client.time, "sleep", lambda _: None)
+    iris = IRISClient(Config(cache_dir=tmp_path))
+    iris.rate_limit = 0.0
+    return iris
+
+
+@pytest.fixture
+def event():
+    """Create an event near the fake stations."""
+    origin = Origin(time=UTCDateTime(2024, 1, 1), latitude=35.0, longitude=-106.3)
+    return Event(origins=[origin])
+
+
+class TestWaveformsForEvent:
+    """Test cases for event-scoped waveform retrieval."""
+
+    def test_uses_single_bulk_request(self, client, event):
+        """Test all stations are fetched with one bulk request."""
+        stream = client.get_waveforms_for_event(event)
+
+        fdsn = client.waveform_client
+        bulk_calls = [c for c in fdsn.calls if c[0] == "get_waveforms_bulk"]
+        assert len(bulk_calls) == 1
+        assert {t.stats.station for t in stream} == {"ANMO", "COLA"}
+        assert {t.stats.channel for t in stream} == {"BHZ", "HHZ"}
+
+    def test_bulk_stations_helper(self, client):
+        """Test the bulk helper expands stations by channel."""
+        stream = client.get_waveforms_bulk_stations(
+            [("IU", "ANMO"), ("IU", "COLA")], ["BHZ", "HHZ"], "2024-01-01", "2024-01-02"
+        )
+
+        calls = client.waveform_client.calls
+        bulk = next(b for name, b in calls if name == "get_waveforms_bulk")
+        assert [line[:4] for line in bulk] == [
+            ("IU", "ANMO", "*", "BHZ"),
+            ("IU", "ANMO", "*", "HHZ"),
+            ("IU", "COLA", "*", "BHZ"),
+            ("IU", "COLA", "*", "HHZ"),
+        ]
+        assert len(stream) == 4
+
+    @pytest.mark.parametrize("fail_bulk", [False, True])
+    def test_iterates_one_station_at_a_time(self, client, event, fail_bulk):
+        """Test the generator yields a Stream per station in order."""
+        client.waveform_client.fail_bulk = fail_bulk
+
+        streams = list(client.iter_waveforms_for_event(event, max_workers=1))
+
+        assert [{t.stats.station for t in st} for st in streams] == [
+            {"ANMO"},
+            {"COLA"},
+        ]
+
+    def test_falls_back_to_per_station(self, client, event):
+        """Test a failing bulk request falls back to per-station requests."""
+        client.waveform_client.fail_bulk = True
+
+        stream = client.get_waveforms_for_event(event)
+
+        fdsn = client.waveform_client
+        per_station = [kw for name, kw in fdsn.calls if name == "get_waveforms"]
+        assert len(per_station) == 2
+        assert all(kw["channel"] == "BHZ,HHZ" for kw in per_station)
+        assert all(kw["location"] == "*" for kw in per_station)
+        assert len(stream) == 4
+
+    def test_fallback_runs_stations_concurrently(self, client, event):
+        """Test fallback requests overlap on the thread pool."""
+        fdsn = client.waveform_client
+        fdsn.fail_bulk = True
+        both_started = threading.Barrier(2, timeout=5)
+        fetch = fdsn.get_waveforms
+
+        def blocking_fetch(*args, **kwargs):
+            both_started.wait()
+            return fetch(*args, **kwargs)
+
+        fdsn.get_waveforms = blocking_fetch
+
+        stream = client.get_waveforms_for_event(event, max_workers=2)
+
+        assert [t.stats.station for t in stream] == ["ANMO", "ANMO", "COLA", "COLA"]
+
+    def test_concurrent_fetch(self, client, event, monkeypatch):
+        """Test the asyncio path issues one request per station."""
+        monkeypatch.setattr(aiohttp, "ClientSession", FakeSession)
+        FakeSession.requests = []
+
+        stream = client.get_waveforms_for_event_concurrent(event)
+
+        assert len(FakeSession.requests) == 2
+        assert {t.stats.station for t in stream} == {"ANMO", "COLA"}
+
+    def test_station_lookup_uses_light_metadata(self, client, event):
+        """Test the station lookup skips instrument responses."""
+        client.get_waveforms_for_event(event)
+
+        calls = client.station_client.calls
+        query = next(kw for name, kw in calls if name == "get_stations")
+        assert query["level"] == "station"
+        assert query["format"] == "text"
+
+    def test_filters_stations_by_distance(self, client, event):
+        """Test stations inside the bounding box but out of range are dropped."""
+        fdsn = client.station_client
+        fdsn.inventory[0].stations.append(
+            Station("FAR", latitude=39.0, longitude=-106.3, elevation=0)
+        )
+
+        stream = client.get_waveforms_for_event(event, max_distance_km=200.0)
+
+        query = next(kw for name, kw in fdsn.calls if name == "get_stations")
+        assert query["maxlatitude"] == pytest.approx(35.0 + 200.0 / 111.19)
+        assert {t.stats.station for t in stream} == {"ANMO", "COLA"}
+
+
+class TestStationsForEvents:
+    """Test cases for campaign-level station lookups."""
+
+    def test_single_metadata_request_for_many_events(self, client, event):
+        """Test several events share one station query filtered per event."""
+        far_origin = Origin(
+            time=UTCDateTime(2024, 1, 2), latitude=35.5, longitude=-104.0
+        )
+        far_event = Event(origins=[far_origin])
+
+        stations = client.get_stations_for_events(
+            [event, far_event], max_distance_km=100.0
+        )
+
+        calls = [c for c in client.station_client.calls if c[0] == "get_stations"]
+        assert len(calls) == 1
+        assert stations[str(event.resource_id)] == [("IU", "ANMO"), ("IU", "COLA")]
+        assert stations[str(far_event.resource_id)] == []
+
+    def test_precomputed_stations_skip_lookup(self, client, event):
+        """Test passing stations avoids a metadata request."""
+        stream = client.get_waveforms_for_event(event, stations=[("IU", "ANMO")])
+
+        assert not [c for c in client.station_client.calls if c[0] == "get_stations"]
+        assert {t.stats.station for t in stream} == {"ANMO"}
+
+
+class TestClientSetup:
+    """Test cases for FDSN client construction."""
+
+    def test_client_created_lazily_once(self, monkeypatch, tmp_path):
+        """Test the FDSN client is built on first use, once across threads."""
+        created = []
+
+        def factory(*args, **kwargs):
+            created.append(1)
+            return FakeFDSNClient()
+
+        monkeypatch.setattr(obspy.clients.fdsn, "Client", factory)
+        iris = IRISClient(Config(cache_dir=tmp_path))
+        assert not created
+
+        threads = [
+            threading.Thread(target=lambda: iris.waveform_client) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(created) == 1
+
+    def test_services_share_one_client(self, client):
+        """Test waveform, event and station lookups share a single client."""
+        assert client.waveform_client is client.station_client
+        assert client.waveform_client is client.event_client
+
+    def test_service_clients_assignable(self, client):
+        """Test a single service client can be replaced, e.g. by a mock."""
+        replacement = object()
+
+        client.waveform_client = replacement
+
+        assert client.waveform_client is replacement
+        assert client.station_client is client.fdsn_client
+
+
+class TestResponseCache:
+    """Test cases for the per-channel instrument response cache."""
+
+    @pytest.fixture
+    def station_inventory(self, client):
+        """Serve an inventory with a response for IU.ANMO..BHZ."""
+        channel = Channel(
+            "BHZ",
+            "",
+            latitude=34.9,
+            longitude=-106.5,
+            elevation=0,
+            depth=0,
+            start_date=UTCDateTime(2000, 1, 1),
+            response=Response(),
+        )
+        station = Station(
+            "ANMO", latitude=34.9, longitude=-106.5, elevation=0, channels=[channel]
+        )
+        client.station_client.inventory = Inventory(
+            networks=[Network("IU", stations=[station])]
+        )
+        return channel
+
+    def test_response_fetched_once_per_channel(self, client, station_inventory):
+        """Test later requests reuse the cached response object."""
+        first = client.get_waveforms("IU", "ANMO", "2024-01-01", "2024-01-02")
+        second = client.get_waveforms("IU", "ANMO", "2024-01-03", "2024-01-04")
+
+        calls = [c for c in client.station_client.calls if c[0] == "get_stations"]
+        assert len(calls) == 1
+        assert first[0].stats.response is station_inventory.response
+        assert second[0].stats.response is station_inventory.response
+
+    def test_epoch_outside_cache_is_refetched(self, client, station_inventory):
+        """Test a trace before the cached epoch triggers a new lookup."""
+        client.get_waveforms("IU", "ANMO", "2024-01-01", "2024-01-02")
+        station_inventory.start_date = UTCDateTime(1990, 1, 1)
+        client._response_cache.clear()
+        client._response_cache["IU.ANMO..BHZ"] = [
+            (UTCDateTime(2025, 1, 1), None, Response())
+        ]
+
+        client.get_waveforms("IU", "ANMO", "2024-01-03", "2024-01-04")
+
+        calls = [c for c in client.station_client.calls if c[0] == "get_stations"]
+        assert len(calls) == 2
+
+
+class TestTimeConversion:
+    """Test cases for request time conversion."""
+
+    def test_string_parses_are_cached(self):
+        """Test repeated strings reuse a single parsed UTCDateTime."""
+        first = iris_client._to_utc("2024-01-01T00:00:00")
+
+        assert iris_client._to_utc("2024-01-01T00:00:00") is first
+        assert first == UTCDateTime(2024, 1, 1)
+
+    def test_datetime_and_utc_inputs(self):
+        """Test datetime inputs convert and UTCDateTime passes through."""
+        utc = UTCDateTime(2024, 1, 1)
+
+        assert iris_client._to_utc(utc) is utc
+        assert iris_client._to_utc(datetime(2024, 1, 1)) == utc
+
+
+class TestWaveformCache:
+    """Test cases for the on-disk waveform cache."""
+
+    def test_repeated_request_hits_cache(self, client):
+        """Test an identical request is served from disk."""
+        args = ("IU", "ANMO", "2024-01-01", "2024-01-01T00:01:00")
+        first = client.get_waveforms(*args, attach_response=False)
+        second = client.get_waveforms(*args, attach_response=False)
+
+        fetches = [c for c in client.waveform_client.calls if c[0] == "get_waveforms"]
+        assert len(fetches) == 1
+        assert len(list(client.cache_dir.glob("*.mseed"))) == 1
+        np.testing.assert_allclose(second[0].data, first[0].data)
+
+    def test_different_window_misses_cache(self, client):
+        """Test a different time window triggers a new fetch."""
+        client.get_waveforms("IU", "ANMO", "2024-01-01", "2024-01-02")
+        client.get_waveforms("IU", "ANMO", "2024-01-01", "2024-01-03")
+
+        fetches = [c for c in client.waveform_client.calls if c[0] == "get_waveforms"]
+        assert len(fetches) == 2
+
+    def test_evicts_least_recently_used(self, client):
+        """Test the cache is trimmed to its byte budget oldest-first."""
+        client.cache_check_interval = 1
+        client.get_waveforms("IU", "ANMO", "2024-01-01", "2024-01-02")
+        entry_size = next(client.cache_dir.glob("*.mseed")).stat().st_size
+        client.cache_max_bytes = entry_size
+
+        client.get_waveforms("IU", "ANMO", "2024-01-01", "2024-01-03")
+
+        assert len(list(client.cache_dir.glob("*.mseed"))) == 1
+
+
+class TestValidation:
+    """Test cases for waveform quality validation."""
+
+    def test_flags_only_offending_traces(self, client, caplog):
+        """Test sampling-rate and length warnings name the bad traces only."""
+        client.config.data.sampling_rate = 100.0
+        client.config.data.window_length = 30.0
+        slow = make_trace(station="SLOW")
+        slow.stats.sampling_rate = 40.0
+        stream = Stream([make_trace(), make_trace(station="SHRT", npts=100), slow])
+
+        with caplog.at_level("WARNING"):
+            assert client._validate_waveform_data(stream)
+
+        messages = [r.getMessage() for r in caplog.records]
+        assert any("Sampling rate mismatch" in m and "SLOW" in m for m in messages)
+        assert any("too short" in m and "SHRT" in m for m in messages)
+        assert not any("ANMO" in m for m in messages)
+
+    def test_empty_stream_fails(self, client):
+        """Test an empty stream fails validation."""
+        assert not client._validate_waveform_data(Stream())
+
+
+class TestRetries:
+    """Test cases for retry classification."""
+
+    @pytest.fixture
+    def attempts(self):
+        """Collect request attempts."""
+        return []
+
+    def failing(self, attempts, error):
+        """Create a request function that always raises ``error``."""
+
+        def request():
+            attempts.append(1)
+            raise error
+
+        return request
+
+    def test_bad_request_fails_fast(self, client, attempts):
+        """Test client errors are not retried."""
+        request = self.failing(attempts, FDSNBadRequestException("bad"))
+
+        with pytest.raises(IRISClientError) as exc_info:
+            client._request_with_retries(request)
+
+        assert not isinstance(exc_info.value, IRISNetworkError)
+        assert len(attempts) == 1
+
+    def test_no_data_raises_data_error(self, client, attempts):
+        """Test an empty result is reported without retrying."""
+        request = self.failing(attempts, FDSNNoDataException("none"))
+
+        with pytest.raises(IRISDataError):
+            client._request_with_retries(request)
+
+        assert len(attempts) == 1
+
+    def test_server_errors_are_retried(self, client, attempts):
+        """Test transient server errors exhaust all retries."""
+        request = self.failing(attempts, FDSNServiceUnavailableException("busy"))
+
+        with pytest.raises(IRISNetworkError):
+            client._request_with_retries(request)
+
+        assert len(attempts) == client.max_retries + 1
+
+    def test_async_honors_retry_after(self, client, event, monkeypatch):
+        """Test a 429 waits for the server's Retry-After before retrying."""
+        sleeps = []
+        responses = [FakeResponse(b"", status=429, headers={"Retry-After": "7"})]
+
+        class RateLimitedSession(FakeSession):
+            def get(self, url, params=None):
+                if responses:
+                    return responses.pop()
+                return super().get(url, params)
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr(aiohttp, "ClientSession", RateLimitedSession)
+        monkeypatch.setattr(iris_client.asyncio, "sleep", fake_sleep)
+
+        stream = client.get_waveforms_for_event_concurrent(
+            event, stations=[("IU", "ANMO")]
+        )
+
+        assert sleeps == [7.0]
+        assert len(stream) == 1
+
+
+class TestRateLimit:
+    """Test cases for the token-bucket rate limiter."""
+
+    def test_burst_then_sleep(self, client, monkeypatch):
+        """Test a burst is served immediately and the next call waits."""
+        sleeps = []
+        monkeypatch.setattr(iris_client.time, "sleep", sleeps.append)
+        client.rate_limit = 0.5
+        client.burst = 2
+        client._tokens = 2.0
+
+        for _ in range(3):
+            client._enforce_rate_limit()
+
+        assert len(sleeps) == 1
+        assert 0.0 < sleeps[0] <= 0.5
+
+
+class TestSaveWaveforms:
+    """Test cases for MiniSEED persistence."""
+
+    @pytest.mark.parametrize(
+        "dtype,encoding",
+        [(np.int32, "STEIM2"), (np.float32, "FLOAT32"), (np.float64, "FLOAT64")],
+    )
+    def test_round_trip_with_matching_encoding(self, client, tmp_path, dtype, encoding):
+        """Test each dtype is written losslessly with a suitable encoding."""
+        trace = make_trace()
+        trace.data = (trace.data * 1000).astype(dtype)
+        path = tmp_path / "out.mseed"
+
+        client.save_waveforms(Stream([trace]), path)
+        loaded = client.load_waveforms(path, format_type="MSEED")
+
+        assert loaded[0].stats.mseed.encoding == encoding
+        assert loaded[0].stats.mseed.record_length == 4096
+        np.testing.assert_array_equal(loaded[0].data, trace.data)
+
+
+class TestPreprocessWaveform:
+    """Test cases for batched waveform preprocessing."""
+
+    def test_import_defers_scipy_signal(self):
+        """Test importing the client does not load SciPy's signal package."""
+        script = (
+            "import sys; import seismic_classifier.data_pipeline.iris_client;"
+            "print('scipy.signal' in sys.modules)"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        loaded = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout.strip()
+
+        assert loaded == "False"
+
+    @pytest.mark.parametrize(
+        "detrend_type,filter_type", [("linear", "bandpass"), ("demean", "lowpass")]
+    )
+    def test_matches_per_trace_obspy(self, detrend_type, filter_type):
+        """Test batched processing matches ObsPy's per-trace pipeline."""
+        stream = Stream([make_trace(station=f"S{i}") for i in range(4)])
+        stream += make_trace(station="ODD", npts=1500)
+        for trace in stream:
+            trace.data += np.linspace(0.0, 5.0, trace.stats.npts)
+
+        expected = stream.copy()
+        expected.detrend(type=detrend_type)
+        expected.taper(max_percentage=0.05)
+        if filter_type == "bandpass":
+            expected.filter("bandpass", freqmin=0.5, freqmax=20.0)
+        else:
+            expected.filter("lowpass", freq=20.0)
+
+        processed = preprocess_waveform(
+            stream,
+            filter_type=filter_type,
+            freqmin=0.5,
+            freqmax=20.0,
+            detrend_type=detrend_type,
+            dtype=np.float64,
+        )
+
+        for trace, reference in zip(processed, expected):
+            np.testing.assert_allclose(trace.data, reference.data, atol=1e-9)
+
+    def test_non_finite_trace_goes_through_obspy(self):
+        """Test a NaN sample is rejected as by ObsPy, not smeared across a batch."""
+        stream = Stream([make_trace(station=f"S{i}") for i in range(3)])
+        stream[1].data[100] = np.nan
+
+        with pytest.raises(IRISDataError):
+            preprocess_waveform(stream, freqmax=20.0)
+        assert np.isnan(stream[1].data[100])
+
+    @pytest.mark.filterwarnings("ignore::RuntimeWarning")
+    def test_non_finite_trace_demean_matches_obspy(self):
+        """Test non-finite traces get ObsPy's result while the rest are batched."""
+        stream = Stream([make_trace(station=f"S{i}") for i in range(3)])
+        stream[1].data[100] = np.inf
+        expected = stream.copy()
+        expected.detrend(type="demean")
+        expected.taper(max_percentage=0.05)
+        expected.filter("bandpass", freqmin=0.1, freqmax=20.0)
+
+        processed = preprocess_waveform(
+            stream, freqmax=20.0, detrend_type="demean", dtype=np.float64
+        )
+
+        for trace, reference in zip(processed, expected):
+            np.testing.assert_allclose(trace.data, reference.data, atol=1e-9)
+
+    @pytest.mark.parametrize("detrend_type", ["linear", "simple"])
+    def test_single_precision_by_default(self, detrend_type):
+        """Test output is float32 and close to the float64 result."""
+        stream = Stream([make_trace(), make_trace(station="COLA")])
+        reference = preprocess_waveform(
+            stream, freqmax=20.0, detrend_type=detrend_type, dtype=np.float64
+        )
+
+        processed = preprocess_waveform(stream, freqmax=20.0, detrend_type=detrend_type)
+
+        for trace, expected in zip(processed, reference):
+            assert trace.data.dtype == np.float32
+            np.testing.assert_allclose(trace.data, expected.data, atol=1e-5)
+
+    @pytest.mark.parametrize("detrend_type", ["linear", "simple"])
+    def test_input_untouched_by_default(self, detrend_type):
+        """Test the input stream is left unmodified unless inplace is set."""
+        stream = Stream([make_trace()])
+        original = stream[0].data.copy()
+
+        preprocess_waveform(stream, freqmax=20.0, detrend_type=detrend_type)
+
+        np.testing.assert_array_equal(stream[0].data, original)
+        assert "processing" not in stream[0].stats
+
+    def test_inplace_modifies_input(self):
+        """Test inplace processing returns and modifies the given stream."""
+        stream = Stream([make_trace()])
+        original = stream[0].data.copy()
+
+        processed = preprocess_waveform(stream, freqmax=20.0, inplace=True)
+
+        assert processed is stream
+        assert not np.array_equal(stream[0].data, original)
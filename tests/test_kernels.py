@@ -0,0 +1,120 @@
+"""Tests comparing the Numba waveform kernels with their NumPy fallbacks."""
+
+import numpy as np
+import pytest
+
+from seismic_classifier.utils import (
+    arrival_kernels,
+    autocorr_kernels,
+    moment_kernels,
+    preprocess_kernels,
+    quality_kernels,
+)
+
+# The compiled kernels only exist when Numba is installed
+pytest.importorskip("numba")
+
+
+@pytest.fixture
+def rows():
+    """Noisy traces with a burst, a constant row and a ramp."""
+    rng = np.random.default_rng(7)
+    data = rng.normal(size=(4, 3000))
+    data[0, 1500:1800] *= 20.0
+    data[1] = 2.0
+    data[2] = np.linspace(-1.0, 5.0, 3000)
+    return data
+
+
+class TestArrivalKernels:
+    """Test cases for the STA/LTA and envelope kernels."""
+
+    def test_sta_lta_scan(self, rows):
+        """Test the trigger scan matches NumPy."""
+        first, peak, count = arrival_kernels._sta_lta_scan_numba(rows, 100, 1000, 3.0)
+        expected = arrival_kernels._sta_lta_scan_numpy(rows, 100, 1000, 3.0)
+
+        np.testing.assert_array_equal(first, expected[0])
+        np.testing.assert_allclose(peak, expected[1], rtol=1e-9)
+        np.testing.assert_array_equal(count, expected[2])
+
+    def test_envelope_times(self, rows):
+        """Test rise and decay times match NumPy, including NaN rows."""
+        envelope = np.abs(rows) / np.abs(rows).max(axis=1, keepdims=True)
+        envelope[3, 10] = np.nan
+
+        rise, decay = arrival_kernels._envelope_times_numba(envelope)
+        expected = arrival_kernels._envelope_times_numpy(envelope)
+
+        np.testing.assert_array_equal(rise, expected[0])
+        np.testing.assert_array_equal(decay, expected[1])
+
+
+class TestAutocorrKernels:
+    """Test cases for the autocorrelation zero-crossing kernel."""
+
+    def test_first_zero_crossing(self):
+        """Test the crossing scan matches NumPy on silent and NaN rows."""
+        rng = np.random.default_rng(3)
+        autocorr = rng.normal(size=(4, 200)).cumsum(axis=1)
+        autocorr[:, 0] = 50.0
+        autocorr[1] = 0.0
+        autocorr[2, 7] = np.nan
+
+        np.testing.assert_array_equal(
+            autocorr_kernels._first_zero_crossing_numba(autocorr),
+            autocorr_kernels._first_zero_crossing_numpy(autocorr),
+        )
+
+
+class TestMomentKernels:
+    """Test cases for the fused moment kernel."""
+
+    def test_row_moments(self, rows):
+        """Test moments and histogram counts match NumPy."""
+        result = moment_kernels._row_moments_numba(rows, 50)
+        expected = moment_kernels._row_moments_numpy(rows, 50)
+
+        for got, want in zip(result, expected):
+            np.testing.assert_allclose(got, want, rtol=1e-9, atol=1e-12)
+
+
+class TestQualityKernels:
+    """Test cases for the trace statistics kernel."""
+
+    @pytest.mark.parametrize("dtype", [np.int32, np.float32, np.float64])
+    def test_trace_stats(self, rows, dtype):
+        """Test single-pass statistics match NumPy."""
+        data = (rows[0] * 100).astype(dtype)
+
+        np.testing.assert_allclose(
+            quality_kernels._trace_stats_numba(data, 300),
+            quality_kernels._trace_stats_numpy(data, 300),
+            rtol=1e-6,
+        )
+
+    def test_non_finite(self, rows):
+        """Test both paths reject a trace with a NaN sample."""
+        data = rows[0].copy()
+        data[5] = np.nan
+
+        assert not quality_kernels._trace_stats_numba(data, 300)[0]
+        assert not quality_kernels._trace_stats_numpy(data, 300)[0]
+
+
+class TestPreprocessKernels:
+    """Test cases for the batched detrend/taper kernel."""
+
+    @pytest.mark.parametrize("linear", [True, False])
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_detrend_taper(self, rows, linear, dtype):
+        """Test in-place detrending and tapering match NumPy."""
+        taper = preprocess_kernels.hann_taper(rows.shape[1], 0.05).astype(dtype)
+        result = rows.astype(dtype)
+        expected = rows.astype(dtype)
+
+        preprocess_kernels._detrend_taper_numba(result, taper, linear)
+        preprocess_kernels._detrend_taper_numpy(expected, taper, linear)
+
+        tolerance = 1e-5 if dtype == np.float32 else 1e-12
+        np.testing.assert_allclose(result, expected, rtol=tolerance, atol=tolerance)
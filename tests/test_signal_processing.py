@@ -0,0 +1,220 @@
+"""Tests for waveform signal processing and feature helpers."""
+
+import numpy as np
+import pytest
+from obspy import Stream, Trace
+from scipy import signal
+
+from seismic_classifier.config.settings import Config
+from seismic_classifier.feature_engineering.signal_processing import (
+    SignalProcessor,
+    _bandpass_sos,
+    _taper_window,
+    calculate_spectral_features,
+    calculate_time_domain_features,
+)
+
+
+@pytest.fixture
+def processor(tmp_path):
+    """Create a SignalProcessor instance."""
+    return SignalProcessor(Config(cache_dir=tmp_path))
+
+
+class TestBandpassFilter:
+    """Test cases for array bandpass filtering."""
+
+    @pytest.mark.parametrize(
+        "filter_type, design",
+        [
+            ("butter", lambda wn: signal.butter(2, wn, btype="band")),
+            ("bessel", lambda wn: signal.bessel(2, wn, btype="band")),
+            ("ellip", lambda wn: signal.ellip(2, 1, 40, wn, btype="band")),
+        ],
+    )
+    def test_matches_transfer_function_filter(self, processor, filter_type, design):
+        """Test second-order sections agree with filtfilt away from the edges."""
+        data = np.random.default_rng(0).normal(size=5000)
+        b, a = design([0.04, 0.4])
+
+        filtered = processor.apply_bandpass_filter(
+            data, 2.0, 20.0, sampling_rate=100.0, corners=2, filter_type=filter_type
+        )
+
+        np.testing.assert_allclose(
+            filtered[500:-500], signal.filtfilt(b, a, data)[500:-500], atol=1e-6
+        )
+
+    def test_design_is_cached(self, processor):
+        """Test repeated calls reuse one filter design."""
+        data = np.random.default_rng(1).normal(size=1000)
+        _bandpass_sos.cache_clear()
+
+        for _ in range(3):
+            processor.apply_bandpass_filter(data, 1.0, 10.0, sampling_rate=100.0)
+
+        assert _bandpass_sos.cache_info().misses == 1
+
+    def test_unknown_filter_type(self, processor):
+        """Test an unsupported design is rejected."""
+        with pytest.raises(ValueError, match="Unknown filter type"):
+            processor.apply_bandpass_filter(
+                np.zeros(100), 1.0, 10.0, sampling_rate=100.0, filter_type="cheby"
+            )
+
+
+class TestSpectralFeatures:
+    """Test cases for spectral feature calculation."""
+
+    def test_moments_match_definitions(self):
+        """Test the fused reductions agree with the direct formulas."""
+        t = np.arange(4000) / 100.0
+        data = np.sin(2 * np.pi * 5 * t) + np.random.default_rng(5).normal(size=4000)
+        freqs, psd = signal.welch(data, 100.0, nperseg=256)
+        centroid = np.sum(freqs * psd) / np.sum(psd)
+        cumulative = np.cumsum(psd)
+
+        features = calculate_spectral_features(data, 100.0)
+
+        assert features["mean_frequency"] == pytest.approx(centroid)
+        assert features["spectral_centroid"] == pytest.approx(centroid)
+        assert features["spectral_bandwidth"] == pytest.approx(
+            np.sqrt(np.sum((freqs - centroid) ** 2 * psd) / np.sum(psd))
+        )
+        assert features["spectral_rolloff"] == freqs[
+            np.where(cumulative >= 0.95 * cumulative[-1])[0][0]
+        ]
+
+
+class TestTimeDomainFeatures:
+    """Test cases for time-domain feature calculation."""
+
+    @pytest.mark.parametrize("dtype", [np.int32, np.float32, np.float64])
+    def test_moments_match_numpy(self, dtype):
+        """Test the fused statistics agree with separate NumPy reductions."""
+        data = np.random.default_rng(0).normal(3, 50, 10_000).astype(dtype)
+        wide = data.astype(np.float64)
+
+        features = calculate_time_domain_features(data)
+
+        assert features["mean"] == pytest.approx(wide.mean())
+        assert features["var"] == pytest.approx(wide.var())
+        assert features["std"] == pytest.approx(wide.std())
+        assert (features["min"], features["max"]) == (wide.min(), wide.max())
+        assert features["peak_to_peak"] == features["range"] == np.ptp(wide)
+        assert features["rms"] == pytest.approx(np.sqrt(np.mean(wide**2)))
+        assert features["energy"] == pytest.approx(np.sum(wide**2))
+
+    def test_accepts_lists(self):
+        """Test array-like input is converted like the NumPy reductions do."""
+        features = calculate_time_domain_features([1.0, 2.0, 3.0, 6.0])
+
+        assert features["mean"] == pytest.approx(3.0)
+        assert features["max"] == 6.0
+
+    def test_non_finite_data_propagates(self):
+        """Test NaN samples still propagate into the statistics."""
+        features = calculate_time_domain_features(np.array([1.0, np.nan, 2.0]))
+
+        assert np.isnan(features["mean"])
+        assert np.isnan(features["rms"])
+
+
+class TestTaper:
+    """Test cases for array tapering."""
+
+    @pytest.mark.parametrize("taper_type", ["hann", "hamming"])
+    def test_edges_tapered(self, processor, taper_type):
+        """Test both edges are scaled by halves of the window."""
+        data = np.ones(1000)
+        window = getattr(signal.windows, taper_type)(100)
+
+        tapered = processor.apply_taper(data, 0.05, taper_type)
+
+        np.testing.assert_array_equal(tapered[:50], window[:50])
+        np.testing.assert_array_equal(tapered[-50:], window[50:])
+        assert (tapered[50:-50] == 1.0).all()
+
+    def test_tukey_spans_trace(self, processor):
+        """Test the Tukey taper covers the whole trace."""
+        data = np.random.default_rng(4).normal(size=1000)
+
+        tapered = processor.apply_taper(data, 0.1, "tukey")
+
+        np.testing.assert_array_equal(tapered, data * signal.windows.tukey(1000, 0.2))
+
+    def test_window_cached_read_only(self, processor):
+        """Test windows are built once per shape and cannot be modified."""
+        _taper_window.cache_clear()
+
+        for _ in range(3):
+            processor.apply_taper(np.ones(1000), 0.05)
+
+        assert _taper_window.cache_info().misses == 1
+        assert not _taper_window("hann", 1000, 0.05).flags.writeable
+
+    def test_unknown_taper_type(self, processor):
+        """Test an unsupported taper is rejected."""
+        with pytest.raises(ValueError, match="Unknown taper type"):
+            processor.apply_taper(np.ones(100), 0.05, "blackman")
+
+
+class TestPreprocessWaveform:
+    """Test cases for stream preprocessing."""
+
+    @pytest.mark.parametrize("dtype", [np.int32, np.float32, np.float64])
+    @pytest.mark.parametrize("detrend_type", ["linear", "demean"])
+    def test_batched_matches_per_trace(self, processor, dtype, detrend_type):
+        """Test batched preprocessing matches ObsPy's per-trace pipeline."""
+        processor.config.processing.detrend_type = detrend_type
+        processor.config.processing.filter_freqmax = 20.0
+        rng = np.random.default_rng(2)
+        stream = Stream(
+            [
+                Trace(
+                    (rng.normal(size=n) * 100 + np.linspace(0, 50, n)).astype(dtype),
+                    header={"sampling_rate": 100.0, "station": f"S{i}"},
+                )
+                for i, n in enumerate([3000, 3000, 1500])
+            ]
+        )
+        expected = stream.copy()
+        for trace in expected:
+            processor._preprocess_trace(trace, True, True, True)
+
+        processed = processor.preprocess_waveform(stream)
+
+        for trace, reference in zip(processed, expected):
+            assert trace.data.dtype == reference.data.dtype
+            # float32 input is detrended in double precision before filtering
+            np.testing.assert_allclose(
+                trace.data, reference.data, rtol=1e-5, atol=1e-4
+            )
+        assert stream[0].data.dtype == dtype
+
+    def test_non_finite_trace_uses_obspy(self, processor):
+        """Test a NaN sample fails in ObsPy's detrend instead of spreading."""
+        processor.config.processing.filter_freqmax = 20.0
+        rng = np.random.default_rng(6)
+        stream = Stream(
+            [
+                Trace(rng.normal(size=2000), header={"sampling_rate": 100.0})
+                for _ in range(2)
+            ]
+        )
+        stream[1].data[10] = np.nan
+
+        with pytest.raises(ValueError):
+            processor.preprocess_waveform(stream)
+        assert np.isnan(stream[1].data[10])
+
+    def test_unbatched_filter_type_uses_obspy(self, processor):
+        """Test filters the batch path does not cover still run per trace."""
+        processor.config.processing.filter_type = "bandstop"
+        processor.config.processing.filter_freqmax = 20.0
+        data = np.random.default_rng(3).normal(size=2000)
+        stream = Stream([Trace(data, header={"sampling_rate": 100.0})])
+
+        processed = processor.preprocess_waveform(stream, apply_taper=False)
+
+        assert "processing" in processed[0].stats
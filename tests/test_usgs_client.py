@@ -0,0 +1,469 @@
+"""Tests for the USGS client against a local HTTP server."""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from asyncio_throttle import Throttler
+
+from seismic_classifier.config.settings import Config
+from seismic_classifier.data_pipeline import usgs_client
+from seismic_classifier.data_pipeline.usgs_client import (
+    AsyncUSGSClient,
+    USGSAPIError,
+    USGSClient,
+    USGSDataError,
+    USGSRateLimitError,
+)
+
+FEATURE_COLLECTION = {
+    "type": "FeatureCollection",
+    "metadata": {"count": 1},
+    "features": [
+        {
+            "type": "Feature",
+            "id": "us1000abcd",
+            "properties": {"mag": 4.2, "time": 1704067200000},
+            "geometry": {"type": "Point", "coordinates": [-106.3, 35.0, 10.0]},
+        }
+    ],
+}
+
+
+class FakeUSGSHandler(BaseHTTPRequestHandler):
+    """Serve queued (status, body, headers) responses, then the last one."""
+
+    responses = []
+    requests = []
+    request_headers = []
+
+    def do_GET(self):
+        FakeUSGSHandler.requests.append(self.path)
+        FakeUSGSHandler.request_headers.append(dict(self.headers))
+        if len(FakeUSGSHandler.responses) > 1:
+            status, body, headers = FakeUSGSHandler.responses.pop(0)
+        else:
+            status, body, headers = FakeUSGSHandler.responses[0]
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Run a local HTTP server standing in for the USGS API."""
+    FakeUSGSHandler.responses = [
+        (
+            200,
+            json.dumps(FEATURE_COLLECTION).encode(),
+            {"Content-Type": "application/json"},
+        )
+    ]
+    FakeUSGSHandler.requests = []
+    FakeUSGSHandler.request_headers = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeUSGSHandler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(server, tmp_path, monkeypatch):
+    """Create a USGSClient pointed at the local server without rate limiting."""
+    monkeypatch.setattr(usgs_client.time, "sleep", lambda _: None)
+    config = Config(cache_dir=tmp_path)
+    config.api.usgs_base_url = f"http://127.0.0.1:{server.server_port}/fdsnws/event/1"
+    usgs = USGSClient(config)
+    usgs.rate_limit = 0.0
+    yield usgs
+    usgs.close()
+
+
+@pytest.fixture
+def async_client(server, tmp_path):
+    """Create an AsyncUSGSClient pointed at the local server, barely throttled."""
+    config = Config(cache_dir=tmp_path)
+    config.api.usgs_base_url = f"http://127.0.0.1:{server.server_port}/fdsnws/event/1"
+    usgs = AsyncUSGSClient(config)
+    usgs.throttler = Throttler(rate_limit=100, period=1.0)
+    return usgs
+
+
+class TestMakeRequest:
+    """Test cases for request handling and error translation."""
+
+    def test_fetches_and_caches_events(self, client):
+        """Test a successful query is returned and served from cache after."""
+        first = client.get_events(min_magnitude=4.0)
+        second = client.get_events(min_magnitude=4.0)
+
+        assert first == FEATURE_COLLECTION
+        assert second == FEATURE_COLLECTION
+        assert len(FakeUSGSHandler.requests) == 1
+
+    def test_transient_errors_retried_by_adapter(self, client):
+        """Test 503 responses are retried inside the connection pool."""
+        FakeUSGSHandler.responses.insert(0, (503, b"", {"Retry-After": "0"}))
+
+        assert client.get_events() == FEATURE_COLLECTION
+        assert len(FakeUSGSHandler.requests) == 2
+
+    def test_persistent_rate_limit(self, client):
+        """Test a 429 that outlasts the retries raises USGSRateLimitError."""
+        FakeUSGSHandler.responses = [(429, b"", {"Retry-After": "0"})]
+
+        with pytest.raises(USGSRateLimitError):
+            client.get_events()
+        assert len(FakeUSGSHandler.requests) == client.max_retries + 1
+
+    def test_client_error_not_retried(self, client):
+        """Test a 400 fails immediately with USGSAPIError."""
+        FakeUSGSHandler.responses = [(400, b"bad request", {})]
+
+        with pytest.raises(USGSAPIError):
+            client.get_events()
+        assert len(FakeUSGSHandler.requests) == 1
+
+    def test_tabular_events(self, client):
+        """Test tabular mode requests CSV and returns a DataFrame."""
+        body = (
+            b"time,latitude,longitude,depth,mag\n"
+            b"2024-01-01T00:00:00Z,35,-106.3,10,4.2\n"
+        )
+        FakeUSGSHandler.responses = [(200, body, {"Content-Type": "text/csv"})]
+
+        table = client.get_events(min_magnitude=4.0, tabular=True)
+
+        assert list(table.columns) == ["time", "latitude", "longitude", "depth", "mag"]
+        assert table["mag"].tolist() == [4.2]
+        assert "format=csv" in FakeUSGSHandler.requests[0]
+        assert client.get_events(min_magnitude=4.0, tabular=True).equals(table)
+        assert len(FakeUSGSHandler.requests) == 1
+
+    def test_recent_events_window(self, client, monkeypatch):
+        """Test recent events are queried with second-resolution UTC bounds."""
+        monkeypatch.setattr(usgs_client.time, "time", lambda: 1704067200.0)
+
+        client.get_recent_events(hours=2)
+
+        query = FakeUSGSHandler.requests[0]
+        assert "starttime=2023-12-31T22%3A00%3A00" in query
+        assert "endtime=2024-01-01T00%3A00%3A00" in query
+
+    def test_concurrent_identical_requests_coalesced(self, client, monkeypatch):
+        """Test threads asking for the same query share one HTTP request."""
+        gate = threading.Event()
+        send = client._send
+
+        def slow_send(*args, **kwargs):
+            gate.wait(5)
+            return send(*args, **kwargs)
+
+        monkeypatch.setattr(client, "_send", slow_send)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.get_events()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        while not client._inflight:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == [FEATURE_COLLECTION] * 4
+        assert len(FakeUSGSHandler.requests) == 1
+
+    @pytest.mark.parametrize("streaming", [True, False])
+    def test_iter_events(self, client, monkeypatch, streaming):
+        """Test features are yielded with or without the streaming parser."""
+        if not streaming:
+            monkeypatch.setattr(usgs_client, "ijson", None)
+        elif usgs_client.ijson is None:
+            pytest.skip("ijson is not installed")
+
+        features = list(client.iter_events(min_magnitude=4.0))
+
+        assert features == FEATURE_COLLECTION["features"]
+        assert "minmagnitude=4.0" in FakeUSGSHandler.requests[0]
+
+    def test_invalid_json(self, client):
+        """Test a malformed body raises USGSDataError."""
+        FakeUSGSHandler.responses = [(200, b"not json", {})]
+
+        with pytest.raises(USGSDataError):
+            client.get_events()
+
+
+class TestAsyncClient:
+    """Test cases for the aiohttp-based client."""
+
+    def test_pooled_session(self, async_client):
+        """Test the aiohttp session uses the tuned connector and fetches events."""
+        async_client.http2 = False
+
+        async def run():
+            async with async_client:
+                connector = async_client.session.connector
+                assert connector.limit == async_client.max_connections
+                assert connector.limit_per_host == 64
+                return await async_client.get_events_async(min_magnitude=4.0)
+
+        assert asyncio.run(run()) == FEATURE_COLLECTION
+        assert len(FakeUSGSHandler.requests) == 1
+
+    def test_body_parsed_with_module_json_loader(self, async_client, monkeypatch):
+        """Test async bodies go through _json_loads, whatever the Content-Type."""
+        body = json.dumps(FEATURE_COLLECTION).encode()
+        FakeUSGSHandler.responses = [(200, body, {"Content-Type": "text/plain"})]
+        async_client.http2 = False
+        parsed = []
+        loads = usgs_client._json_loads
+        monkeypatch.setattr(
+            usgs_client, "_json_loads", lambda raw: parsed.append(raw) or loads(raw)
+        )
+
+        async def run():
+            async with async_client:
+                return await async_client.get_events_async()
+
+        assert asyncio.run(run()) == FEATURE_COLLECTION
+        assert len(parsed) == 1
+
+    def test_http2_transport(self, async_client):
+        """Test the httpx transport fetches events when HTTP/2 is available."""
+        pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+        async_client.http2 = True
+
+        async def run():
+            async with async_client:
+                return await async_client.get_events_async(min_magnitude=4.0)
+
+        assert asyncio.run(run()) == FEATURE_COLLECTION
+        assert "minmagnitude=4.0" in FakeUSGSHandler.requests[0]
+
+    def test_many_collapses_duplicates(self, async_client):
+        """Test a batch runs concurrently and duplicate queries share a request."""
+        param_list = [{"min_magnitude": 4.0}, {"min_magnitude": 5.0}] * 2
+
+        async def run():
+            async with async_client:
+                return await async_client.get_events_many_async(param_list)
+
+        assert asyncio.run(run()) == [FEATURE_COLLECTION] * 4
+        assert len(FakeUSGSHandler.requests) == 2
+
+    def test_shares_disk_cache_with_sync_client(self, client, async_client):
+        """Test a query cached by the sync client is not re-fetched async."""
+        client.get_events(min_magnitude=4.0)
+        client.flush_cache()
+
+        async def run():
+            async with async_client:
+                return await async_client.get_events_async(min_magnitude=4.0)
+
+        assert asyncio.run(run()) == FEATURE_COLLECTION
+        assert len(FakeUSGSHandler.requests) == 1
+        assert "minmagnitude=4.0" in FakeUSGSHandler.requests[0]
+
+
+class TestRateLimit:
+    """Test cases for the token-bucket rate limiter."""
+
+    def test_burst_then_sleep(self, client, monkeypatch):
+        """Test a full bucket allows a burst before the next call waits."""
+        sleeps = []
+        monkeypatch.setattr(usgs_client.time, "sleep", sleeps.append)
+        client.rate_limit = 1.0
+        client._bucket.tokens = float(client.burst)
+
+        for _ in range(client.burst + 1):
+            client._enforce_rate_limit()
+
+        assert len(sleeps) == 1
+        assert 0.0 < sleeps[0] <= 1.0
+
+    def test_retry_after_drains_bucket(self, client, monkeypatch):
+        """Test a Retry-After header makes the next request wait it out."""
+        sleeps = []
+        monkeypatch.setattr(usgs_client.time, "sleep", sleeps.append)
+        client.rate_limit = 1.0
+
+        client._update_rate_limit({"Retry-After": "7"})
+        client._enforce_rate_limit()
+
+        assert sleeps == [pytest.approx(7.0, abs=0.01)]
+
+    def test_ratelimit_headers_slow_refill(self, client, monkeypatch):
+        """Test RateLimit-* headers spread the remaining quota over the window."""
+        sleeps = []
+        monkeypatch.setattr(usgs_client.time, "sleep", sleeps.append)
+        client.rate_limit = 1.0
+
+        client._update_rate_limit(
+            {"RateLimit-Remaining": "2", "RateLimit-Reset": "10"}
+        )
+        for _ in range(3):
+            client._enforce_rate_limit()
+
+        assert sleeps == [pytest.approx(5.0, abs=0.01)]
+
+        client._update_rate_limit(
+            {"RateLimit-Remaining": "600", "RateLimit-Reset": "60"}
+        )
+        assert client._bucket.server_rate_limit < client.rate_limit
+
+    def test_header_seconds_accepts_http_date(self):
+        """Test Retry-After may be given as an HTTP date."""
+        when = formatdate(time.time() + 30, usegmt=True)
+
+        delay = usgs_client._header_seconds({"Retry-After": when}, "Retry-After")
+
+        assert 28.0 <= delay <= 30.0
+        assert usgs_client._header_seconds({}, "Retry-After") is None
+
+
+    def test_limits_shared_between_clients(self, client, tmp_path):
+        """Test a second client of the same host draws from the same bucket."""
+        config = Config(cache_dir=tmp_path)
+        config.api.usgs_base_url = client.base_url
+        other = USGSClient(config)
+
+        assert other._bucket is client._bucket
+        assert AsyncUSGSClient(config).throttler is AsyncUSGSClient(config).throttler
+        other.close()
+
+
+class TestCache:
+    """Test cases for the on-disk response cache."""
+
+    @pytest.mark.parametrize(
+        "missing,filename",
+        [
+            ((), "key.body.zst"),
+            (("zstandard",), "key.body"),
+            (("zstandard", "orjson"), "key.body"),
+        ],
+    )
+    def test_round_trip(self, tmp_path, monkeypatch, missing, filename):
+        """Test cache entries round-trip with whichever codecs are installed."""
+        for module in ("orjson", "zstandard"):
+            if module in missing:
+                monkeypatch.setattr(usgs_client, module, None)
+            elif getattr(usgs_client, module) is None:
+                pytest.skip(f"{module} is not installed")
+        client = USGSClient(Config(cache_dir=tmp_path))
+
+        client._save_to_cache("key", json.dumps(FEATURE_COLLECTION).encode())
+        client.flush_cache()
+
+        assert client._load_from_cache("key") == FEATURE_COLLECTION
+        assert [p.name for p in client.cache_dir.rglob("*.*")] == [filename]
+
+    def test_background_writer_exits_when_idle(self, client):
+        """Test queued writes land on disk and the writer thread then stops."""
+        client._writer_idle_timeout = 0.01
+        client._save_to_cache("key", b"{}")
+        writer = client._writer
+        client.flush_cache()
+
+        assert client._get_cache_path("key").exists()
+        writer.join(timeout=5)
+        assert not writer.is_alive()
+        assert client._writer is None
+
+    def test_stale_entry_revalidated_with_etag(self, client):
+        """Test an expired entry is refreshed by a 304 instead of re-downloaded."""
+        body = json.dumps(FEATURE_COLLECTION).encode()
+        FakeUSGSHandler.responses = [
+            (200, body, {"ETag": '"v1"'}),
+            (304, b"", {}),
+        ]
+        client.get_events()
+        client.flush_cache()
+
+        # Expire both cache layers
+        client._mem_cache.clear()
+        (path,) = client.cache_dir.rglob("*.body*")
+        os.utime(path, (0, 0))
+
+        assert client.get_events() == FEATURE_COLLECTION
+        assert FakeUSGSHandler.request_headers[1]["If-None-Match"] == '"v1"'
+        assert client._is_cache_valid(path)
+
+    def test_entries_sharded_and_old_files_collected(self, tmp_path):
+        """Test entries land in per-key shards and stale files are removed."""
+        client = USGSClient(Config(cache_dir=tmp_path))
+        path = client._get_cache_path("query_0123ab")
+        path.write_bytes(b"{}")
+        os.utime(path, (0, 0))
+
+        assert path.parent == client.cache_dir / "ab"
+        # Sweeps are rate-limited by the marker left by the last one
+        USGSClient(Config(cache_dir=tmp_path))
+        assert path.exists()
+
+        os.utime(client.cache_dir / "last_gc", (0, 0))
+        USGSClient(Config(cache_dir=tmp_path))
+        assert not path.exists()
+
+    def test_cache_key_stable_across_processes(self):
+        """Test cache keys do not depend on the per-process hash seed."""
+        params = {"format": "geojson", "minmagnitude": 4.0, "limit": 100}
+        script = (
+            "from seismic_classifier.data_pipeline.usgs_client import _cache_key;"
+            f"print(_cache_key('query', {params!r}))"
+        )
+        env = dict(
+            os.environ, PYTHONHASHSEED="123", PYTHONPATH=os.pathsep.join(sys.path)
+        )
+        other = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout.strip()
+
+        assert usgs_client._cache_key("query", params) == other
+        assert usgs_client._cache_key("query", dict(reversed(params.items()))) == other
+
+    def test_memory_cache_skips_disk(self, client, monkeypatch):
+        """Test repeat queries are served from memory without reading disk."""
+        client.get_events(min_magnitude=4.0)
+        monkeypatch.setattr(
+            client, "_load_from_cache", lambda *args: pytest.fail("disk read")
+        )
+
+        assert client.get_events(min_magnitude=4.0) == FEATURE_COLLECTION
+        assert len(FakeUSGSHandler.requests) == 1
+
+    def test_memory_cache_evicts_least_recent(self, client):
+        """Test the in-memory LRU is bounded by max_mem_entries."""
+        client.max_mem_entries = 2
+        for key in ("a", "b", "a", "c"):
+            client._store_in_memory(key, FEATURE_COLLECTION)
+
+        assert list(client._mem_cache) == ["a", "c"]
+        assert client._get_from_memory("b") is None
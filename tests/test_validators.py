@@ -0,0 +1,489 @@
+"""Tests for data validation and quality control."""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from obspy import Stream, Trace
+
+from seismic_classifier.config.settings import Config
+from seismic_classifier.data_pipeline import validators
+from seismic_classifier.data_pipeline.validators import (
+    DataFormatError,
+    DataQualityError,
+    DataValidator,
+    ValidationError,
+)
+from seismic_classifier.utils import quality_kernels
+
+
+def make_feature(lon=-106.3, lat=35.0, depth=10.0, mag=4.2, event_time=None):
+    """Build a GeoJSON feature shaped like a USGS event."""
+    if event_time is None:
+        event_time = 1704067200000
+    return {
+        "type": "Feature",
+        "properties": {"mag": mag, "time": event_time},
+        "geometry": {"type": "Point", "coordinates": [lon, lat, depth]},
+    }
+
+
+def make_trace(data=None, sampling_rate=100.0):
+    """Build a 60 s trace: quiet leading noise followed by a larger signal."""
+    if data is None:
+        rng = np.random.default_rng(0)
+        data = rng.normal(0.0, 1.0, 6000)
+        data[1000:] *= 10.0
+    return Trace(data=data, header={"sampling_rate": sampling_rate})
+
+
+@pytest.fixture
+def validator(tmp_path):
+    """Create a DataValidator instance."""
+    return DataValidator(Config(cache_dir=tmp_path))
+
+
+class TestUSGSValidation:
+    """Test cases for USGS response validation."""
+
+    def test_vectorized_mask_matches_scalar_checks(self, validator):
+        """Test the bulk mask flags exactly the events the scalar check rejects."""
+        features = [
+            make_feature(),
+            make_feature(lon=181.0),
+            make_feature(lat=-91.0),
+            make_feature(depth=1200.0),
+            make_feature(mag=11.0),
+            make_feature(mag=None),
+            make_feature(event_time=(time.time() + 3600) * 1000),
+        ]
+
+        mask = validators._usgs_invalid_mask(features + [make_feature(lon=np.nan)])
+
+        assert mask[-1]
+        mask = mask[:-1]
+        expected = []
+        for feature in features:
+            try:
+                validator._validate_usgs_event(feature)
+                expected.append(False)
+            except DataQualityError:
+                expected.append(True)
+        assert mask.tolist() == expected
+
+    def test_event_time_checks(self):
+        """Test future and malformed event times against the cutoff."""
+        cutoff = 1704067200000
+        verdict = validators._usgs_event_verdict
+
+        assert verdict(make_feature(event_time=cutoff), cutoff) is None
+        assert verdict(make_feature(event_time=cutoff + 1), cutoff) == (
+            DataQualityError,
+            "Event time in the future",
+        )
+        for bad in ("2024-01-01", float("inf"), float("nan")):
+            assert verdict(make_feature(event_time=bad), cutoff)[0] is DataFormatError
+
+        # A little clock skew is tolerated
+        assert verdict(make_feature(event_time=time.time() * 1000 + 1000)) is None
+
+    def test_quality_threshold(self, validator):
+        """Test a response with too many bad events is rejected."""
+        good = {"type": "FeatureCollection", "features": [make_feature()] * 9}
+        good["features"].append(make_feature(lat=100.0))
+        bad = {"type": "FeatureCollection", "features": [make_feature(lat=100.0)] * 3}
+
+        assert validator.validate_usgs_response(good)
+        with pytest.raises(DataQualityError):
+            validator.validate_usgs_response(bad)
+
+    def test_small_responses_skip_the_bulk_mask(self, validator, monkeypatch):
+        """Test only responses with many new events build the bulk mask."""
+        batches = []
+        mask = validators._usgs_invalid_mask
+
+        def spy(features, *args):
+            batches.append(len(features))
+            return mask(features, *args)
+
+        monkeypatch.setattr(validators, "_usgs_invalid_mask", spy)
+        small = [make_feature()] * 4 + [make_feature(mag=12.0)]
+        large = [make_feature()] * 40
+
+        for features in (small, large):
+            assert validator.validate_usgs_response(
+                {"type": "FeatureCollection", "features": features}
+            )
+        assert batches == [40]
+        with pytest.raises(DataQualityError, match="66.7%"):
+            validator.validate_usgs_response(
+                {"type": "FeatureCollection", "features": small[2:]}
+            )
+
+    def test_irregular_features_fall_back_to_scalar_checks(self, validator):
+        """Test malformed features are validated one by one."""
+        broken = make_feature()
+        broken["geometry"] = None
+        features = [make_feature()] * 9 + [broken]
+
+        assert validators._usgs_invalid_mask(features) is None
+        assert validator.validate_usgs_response(
+            {"type": "FeatureCollection", "features": features}
+        )
+
+
+class TestTraceValidation:
+    """Test cases for single-trace quality checks."""
+
+    @pytest.mark.parametrize("dtype", [np.int32, np.float32, np.float64])
+    def test_trace_stats_match_numpy(self, dtype):
+        """Test the single-pass statistics agree with separate reductions."""
+        data = (np.random.default_rng(1).normal(0, 100, 5000)).astype(dtype)
+
+        finite, dmin, dmax, mean, var, head_var = quality_kernels.trace_stats(data)
+
+        assert finite
+        assert (dmin, dmax) == (data.min(), data.max())
+        assert mean == pytest.approx(data.astype(np.float64).mean())
+        assert var == pytest.approx(data.astype(np.float64).var(), rel=1e-6)
+        assert head_var == pytest.approx(data[:500].astype(np.float64).var(), rel=1e-6)
+
+    def test_float32_accumulates_in_double(self):
+        """Test float32 traces keep double-precision statistics."""
+        rng = np.random.default_rng(4)
+        data = (1e4 + rng.normal(0, 0.01, 200_000)).astype(np.float32)
+        reference = data.astype(np.float64)
+
+        for stats in (
+            quality_kernels.trace_stats(data),
+            quality_kernels._trace_stats_numpy(data, 20_000),
+        ):
+            assert stats[3] == pytest.approx(reference.mean(), rel=1e-12)
+            assert stats[4] == pytest.approx(reference.var(), rel=1e-6)
+            assert stats[5] == pytest.approx(reference[:20_000].var(), rel=1e-6)
+
+    @pytest.mark.parametrize("bad", [np.nan, np.inf, -np.inf])
+    def test_trace_stats_flag_nonfinite(self, bad):
+        """Test a single non-finite sample anywhere clears the finite flag."""
+        for position in (0, 2500, 4999):
+            data = np.random.default_rng(3).normal(0, 1, 5000)
+            data[position] = bad
+
+            assert not quality_kernels.trace_stats(data)[0]
+
+    def test_valid_trace(self, validator):
+        """Test a trace with a clear signal passes."""
+        assert validator._validate_trace(make_trace())
+
+    @pytest.mark.parametrize(
+        "data,message",
+        [
+            (np.r_[np.ones(5999), np.nan], "NaN or infinite"),
+            (np.r_[np.ones(5999), np.inf], "NaN or infinite"),
+            (np.ones(6000, dtype=np.int32), "constant"),
+            (np.random.default_rng(2).normal(0, 1, 6000), "Low SNR"),
+        ],
+    )
+    def test_rejects_bad_traces(self, validator, data, message):
+        """Test non-finite, flat and noise-only traces are rejected."""
+        with pytest.raises(DataQualityError, match=message):
+            validator._validate_trace(make_trace(data))
+
+    def test_gap_report(self, validator):
+        """Test gaps between traces of one channel are reported once each."""
+        first = make_trace()
+        first.stats.station = "ANMO"
+        second = first.copy()
+        second.stats.starttime = first.stats.endtime + 5.0
+        other = make_trace()
+        other.stats.station = "CCM"
+
+        gap_info = validator.check_data_gaps(Stream([first, second, other]))
+
+        assert gap_info["total_gaps"] == 1
+        (detail,) = gap_info["gap_details"]
+        assert detail["trace_id"] == first.id
+        assert detail["duration"] == pytest.approx(5.0 - first.stats.delta)
+        assert validator.check_data_gaps(Stream())["total_gaps"] == 0
+
+        frame = validator.check_data_gaps(
+            Stream([first, second, other]), as_frame=True
+        )["gap_details"]
+        assert frame.to_dict("list")["trace_id"] == [first.id]
+        assert frame["duration"].iloc[0] == pytest.approx(detail["duration"])
+        assert frame["start_time"].iloc[0] == pd.Timestamp(
+            first.stats.endtime.datetime, tz="UTC"
+        )
+        empty = validator.check_data_gaps(Stream(), as_frame=True)["gap_details"]
+        assert list(empty.columns) == list(detail)
+
+    def test_report_scans_gaps_once(self, validator, monkeypatch, tmp_path):
+        """Test a report shares one gap scan between its checks."""
+        first = make_trace()
+        second = first.copy()
+        second.stats.starttime = first.stats.endtime + 5.0
+        stream = Stream([first, second])
+        calls = []
+        get_gaps = stream.get_gaps
+        monkeypatch.setattr(stream, "get_gaps", lambda: calls.append(1) or get_gaps())
+
+        report = validator.generate_validation_report(stream, tmp_path / "r.json")
+
+        assert len(calls) == 1
+        assert report["quality_metrics"]["gap_info"]["total_gaps"] == 1
+        assert report["quality_metrics"]["quality_score"] == pytest.approx(90.0)
+        assert report["stream_info"] == {
+            "num_traces": 2,
+            "trace_ids": [first.id, first.id],
+            "sampling_rates": [100.0, 100.0],
+            "durations": [60.0, 60.0],
+        }
+
+    def test_concurrent_reports_on_one_stream(self, validator):
+        """Test reports on the same stream can run on several threads."""
+        stream = Stream([make_trace(), make_trace()])
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [
+                pool.submit(validator.generate_validation_report, stream)
+                for _ in range(8)
+            ]
+            reports = [future.result() for future in futures]
+
+        assert len({r["quality_metrics"]["quality_score"] for r in reports}) == 1
+
+    def test_quality_score_penalties(self, validator):
+        """Test each per-trace penalty is applied and scores floor at zero."""
+        good = make_trace()
+        flat = make_trace(np.ones(6000))
+        flat.stats.station = "FLAT"
+        off_rate = make_trace(sampling_rate=102.0)
+        off_rate.stats.station = "RATE"
+        short = make_trace(np.random.default_rng(5).normal(0, 1, 500))
+        short.stats.station = "SHRT"
+
+        expected = [100.0, 50.0, 100.0 - 10.0, 50.0 - 0.5 * 30]
+        for trace, score in zip((good, flat, off_rate, short), expected):
+            assert validator.calculate_data_quality_score(
+                Stream([trace])
+            ) == pytest.approx(score)
+        assert validator.calculate_data_quality_score(
+            Stream([good, flat, off_rate, short])
+        ) == pytest.approx(np.mean(expected))
+
+    def test_report_file_round_trips(self, validator, tmp_path, monkeypatch):
+        """Test orjson and stdlib json write the same report."""
+        first = make_trace()
+        second = first.copy()
+        second.stats.starttime = first.stats.endtime + 5.0
+        stream = Stream([first, second])
+
+        fast = validator.generate_validation_report(stream, tmp_path / "fast.json")
+        monkeypatch.setattr(validators, "orjson", None)
+        validator.generate_validation_report(stream, tmp_path / "slow.json")
+
+        written = [
+            json.loads((tmp_path / name).read_text())
+            for name in ("fast.json", "slow.json")
+        ]
+        assert written[0]["quality_metrics"] == written[1]["quality_metrics"]
+        assert written[0]["stream_info"] == written[1]["stream_info"]
+        assert written[0]["quality_metrics"]["quality_score"] == pytest.approx(
+            fast["quality_metrics"]["quality_score"]
+        )
+
+
+class TestVerdictCache:
+    """Test cases for the per-trace and per-event verdict cache."""
+
+    def test_trace_checked_once(self, validator, monkeypatch):
+        """Test repeated validation of one trace reuses its verdict."""
+        calls = []
+        check = validator._check_trace
+        monkeypatch.setattr(
+            validator, "_check_trace", lambda tr: calls.append(tr) or check(tr)
+        )
+        trace = make_trace()
+
+        for _ in range(3):
+            assert validator._validate_trace(trace)
+        assert len(calls) == 1
+
+        trace.data[0] += 1.0
+        assert validator._validate_trace(trace)
+        assert len(calls) == 2
+
+    def test_failures_are_replayed(self, validator):
+        """Test a cached failure raises the same error type and message."""
+        trace = make_trace(np.ones(6000, dtype=np.int32))
+
+        errors = []
+        for _ in range(2):
+            with pytest.raises(DataQualityError) as info:
+                validator._validate_trace(trace)
+            errors.append(str(info.value))
+        assert errors[0] == errors[1] == "Trace has constant values"
+
+    def test_threshold_change_invalidates(self, validator):
+        """Test verdicts are not reused after the thresholds change."""
+        trace = make_trace()
+        assert validator._validate_trace(trace)
+
+        validator.quality_thresholds = validator.quality_thresholds._replace(
+            min_duration=120.0
+        )
+        with pytest.raises(DataQualityError, match="too short"):
+            validator._validate_trace(trace)
+
+    def test_event_signature(self):
+        """Test events are keyed on id and update time, or not at all."""
+        event = make_feature()
+        event["id"] = "us7000abcd"
+        event["properties"]["updated"] = 1704067300000
+
+        assert validators._event_signature(event) == (
+            "event",
+            "us7000abcd",
+            1704067300000,
+        )
+        assert validators._event_signature(make_feature()) is None
+        future = make_feature(event_time=(time.time() + 3600) * 1000)
+        future["id"] = "us7000abcd"
+        future["properties"]["updated"] = 1704067300000
+        assert validators._event_signature(future) is None
+
+    def test_repeated_events_skip_validation(self, validator, monkeypatch):
+        """Test events seen in an earlier response are not checked again."""
+        features = []
+        for i in range(10):
+            feature = make_feature(lat=100.0 if i == 0 else 35.0)
+            feature["id"] = f"us{i:08d}"
+            feature["properties"]["updated"] = 1704067300000
+            features.append(feature)
+        response = {"type": "FeatureCollection", "features": features}
+        assert validator.validate_usgs_response(response)
+
+        checked = []
+        check = validators._usgs_event_verdict
+        monkeypatch.setattr(
+            validators,
+            "_usgs_event_verdict",
+            lambda event, *args: checked.append(event) or check(event, *args),
+        )
+        updated = dict(features[1], properties=dict(features[1]["properties"]))
+        updated["properties"]["updated"] += 1
+        response["features"] = features + [updated]
+        assert validator.validate_usgs_response(response)
+        assert checked == [updated]
+
+        # Cached failures still count against the response
+        response["features"] = [features[0]] * 3
+        with pytest.raises(DataQualityError, match="0.0%"):
+            validator.validate_usgs_response(response)
+        assert checked == [updated]
+
+    def test_lru_eviction(self, validator):
+        """Test the cache stays within its size limit."""
+        validator.max_cached_verdicts = 2
+        for shift in range(3):
+            validator._validate_trace(make_trace(np.roll(make_trace().data, shift)))
+
+        assert len(validator._verdicts) == 2
+
+    def test_cache_size_argument(self):
+        """Test the cache size can be set at construction."""
+        assert DataValidator().max_cached_verdicts == 512
+        assert DataValidator(max_cached_verdicts=8).max_cached_verdicts == 8
+
+
+class TestParallelValidation:
+    """Test cases for validating traces on worker threads."""
+
+    def test_parallel_matches_serial(self, tmp_path):
+        """Test threaded validation and scoring agree with the serial path."""
+        traces = [make_trace() for _ in range(12)]
+        traces += [make_trace(np.ones(6000)) for _ in range(4)]
+        for i, trace in enumerate(traces):
+            trace.stats.station = f"S{i:02d}"
+            trace.data = trace.data + i  # distinct cache signatures
+        stream = Stream(traces)
+
+        serial = DataValidator(Config(cache_dir=tmp_path))
+        serial.max_workers = 1
+        parallel = DataValidator(Config(cache_dir=tmp_path))
+        parallel.max_workers = 4
+
+        assert parallel.calculate_data_quality_score(stream) == pytest.approx(
+            serial.calculate_data_quality_score(stream)
+        )
+        assert parallel.validate_waveform_stream(stream)
+        with pytest.raises(DataQualityError, match="66.7%"):
+            parallel.validate_waveform_stream(stream[4:])
+
+
+class TestEarthquakeParameters:
+    """Test cases for earthquake parameter range checks."""
+
+    def test_batch_accepts_valid_catalog(self):
+        """Test a valid catalog with missing values passes."""
+        events = pd.DataFrame(
+            {
+                "mag": [4.2, None, -1.0],
+                "depth": [10.0, 650.0, np.nan],
+                "latitude": [35.0, -60.0, 89.9],
+                "longitude": [-106.3, 170.0, 0.0],
+            }
+        )
+
+        assert validators.validate_earthquake_parameters_batch(events)
+        assert validators.validate_earthquake_parameters_batch(events[["depth"]])
+
+    def test_batch_reports_first_bad_row(self):
+        """Test the first invalid row is reported with the scalar message."""
+        events = pd.DataFrame(
+            {
+                "magnitude": [4.2, 4.0, 11.0],
+                "depth": [10.0, 900.0, 10.0],
+                "latitude": [35.0, 35.0, 35.0],
+                "longitude": [-106.3, -106.3, -106.3],
+            }
+        )
+
+        with pytest.raises(ValidationError, match=r"^Row 1: Invalid depth: 900.0 km$"):
+            validators.validate_earthquake_parameters_batch(events)
+
+
+class TestStationCodes:
+    """Test cases for station code sanitizing."""
+
+    @pytest.mark.parametrize(
+        "code,expected",
+        [(" anmo ", "ANMO"), ("ccm", "CCM"), ("A*", "A*"), ("?1", "?1")],
+    )
+    def test_valid_codes(self, code, expected):
+        """Test codes are trimmed and upper-cased."""
+        assert validators.sanitize_station_code(code) == expected
+
+    @pytest.mark.parametrize(
+        "code", ["", "   ", "ABCDEFGHIJK", "AN-MO", "*", "**?", "ÅNMO", 42]
+    )
+    def test_invalid_codes(self, code):
+        """Test malformed codes are rejected."""
+        with pytest.raises(ValidationError):
+            validators.sanitize_station_code(code)
+
+    def test_batch_matches_scalar(self):
+        """Test the batch form agrees with the scalar form."""
+        codes = [" anmo ", "ccm", "A*", "?1", "kone"]
+
+        assert validators.sanitize_station_codes(codes) == [
+            validators.sanitize_station_code(code) for code in codes
+        ]
+
+    def test_batch_reports_all_invalid(self):
+        """Test the batch error lists every invalid code."""
+        with pytest.raises(ValidationError, match=r"\['AN-MO', '\*', None\]"):
+            validators.sanitize_station_codes(["ANMO", "AN-MO", "*", None])